@@ -28,13 +28,17 @@ export default function CalendarPage() {
     const fetchBookings = async () => {
         setLoading(true);
         try {
-            // Fetch generous limit of bookings to cover the month.
-            // Ideally backend should support date range filtering.
-            // Using existing list endpoint for now.
+            // Only the stays touching the visible month (filtered server-side)
+            const year = currentDate.getFullYear();
+            const month = currentDate.getMonth();
+            const toIso = (d: Date) =>
+                `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
             const res = await api.get("/admin/bookings", {
                 params: {
-                    limit: 100,
-                    status: 'CONFIRMED' // Only show confirmed for occupancy
+                    limit: 500,
+                    status: 'CONFIRMED', // Only show confirmed for occupancy
+                    date_from: toIso(new Date(year, month, 1)),
+                    date_to: toIso(new Date(year, month + 1, 0))
                 }
             });
             setBookings(res.data);
@@ -47,7 +51,7 @@ export default function CalendarPage() {
 
     useEffect(() => {
         fetchBookings();
-    }, []);
+    }, [currentDate]);
 
     const days = getDaysInMonth(currentDate);
     const monthName = currentDate.toLocaleString('es-ES', { month: 'long', year: 'numeric' });
@@ -52,6 +52,9 @@ const Dashboard = () => {
     const [statusFilter, setStatusFilter] = useState("ALL");
     const [page, setPage] = useState(1);
     const limit = 20; // Pagination limit
+    // Keyset pagination: cursors[i] fetches page i + 1 (X-Next-Cursor of the previous page)
+    const [cursors, setCursors] = useState<(string | null)[]>([null]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
 
     // Pending Payments Hook
     const { payments: pendingPayments, loading: paymentsLoading, error: paymentsError, refetch: refetchPayments } = usePendingPayments();
@@ -92,15 +95,16 @@ const Dashboard = () => {
 
     const fetchBookings = async () => {
         try {
-            const skip = (page - 1) * limit;
+            const cursor = cursors[page - 1];
             const res = await api.get("/admin/bookings", {
                 params: {
                     status: statusFilter,
                     limit: limit,
-                    skip: skip
+                    ...(cursor ? { cursor } : {})
                 }
             });
             setBookings(res.data);
+            setNextCursor(res.headers["x-next-cursor"] ?? null);
         } catch (e: any) {
             console.error("Failed to fetch bookings:", e);
         }
@@ -301,7 +305,7 @@ const Dashboard = () => {
                                         <select
                                             className="bg-transparent border-none text-sm focus:ring-0 text-gray-700 font-medium"
                                             value={statusFilter}
-                                            onChange={(e) => { setStatusFilter(e.target.value); setPage(1); }}
+                                            onChange={(e) => { setStatusFilter(e.target.value); setCursors([null]); setPage(1); }}
                                         >
                                             <option value="ALL">Todos los Estados</option>
                                             <option value="PENDING">Pendientes</option>
@@ -326,8 +330,11 @@ const Dashboard = () => {
                                         <Button
                                             variant="outline"
                                             size="sm"
-                                            onClick={() => setPage(p => p + 1)}
-                                            disabled={bookings.length < limit}
+                                            onClick={() => {
+                                                setCursors(c => [...c.slice(0, page), nextCursor]);
+                                                setPage(p => p + 1);
+                                            }}
+                                            disabled={!nextCursor}
                                         >
                                             Siguiente
                                         </Button>
@@ -1,18 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import Response
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from datetime import date
 
 from app.core.database import get_db
-from app.db.models import Booking, User, BookingStatus, Property, Payment, PaymentStatus
+from app.db.models import Booking, User, BookingStatus, Property, Payment, PaymentStatus, RatePlan
 from app.domain.models import BookingPolicy
 from app.api.deps import get_current_admin
+from app.core import money
+from app.core.config import settings
+from app.core.exceptions import InvalidCursorError
+from app.core.pagination import encode_cursor, decode_cursor, prefix_range, search_key
 from app.services.booking_engine import BookingService
 from app.db.repository import BookingRepository
 from app.services.reporting import ReportingService
-from app.services.pricing import PricingService, AdminPricingService
-from pydantic import BaseModel
+from app.services.pricing import AdminPricingService
+from app.services.kpi_snapshot import kpi_snapshot
+from pydantic import BaseModel, Field, field_validator
 
 router = APIRouter()
 
@@ -33,6 +39,7 @@ class BookingResponse(BaseModel):
     is_override: bool
     override_reason: Optional[str] = None
     rules_bypassed: Optional[str] = None
+    review_reason: Optional[str] = None
     
     # New Fields
     total_amount: float
@@ -72,87 +79,94 @@ def get_dashboard_kpis(
 ):
     """
     Returns Key Performance Indicators for the Admin Dashboard.
-    Optimized to run server-side calculations.
+    One aggregate query, cached as a short-lived snapshot (services/kpi_snapshot.py)
+    that booking / payment commits invalidate.
     """
     logger.info(f"Admin {current_admin.email} requesting KPIs")
     
     try:
-        # Total Bookings (All time)
-        total_bookings = db.query(Booking).count()
-        
-        # Active Bookings (CONFIRMED status, check_in <= today <= check_out)
-        today = date.today()
-        active_bookings = db.query(Booking).filter(
-            Booking.status == BookingStatus.CONFIRMED,
-            Booking.check_in <= today,
-            Booking.check_out >= today
-        ).count()
-        
-        # Monthly Revenue (Current Month)
-        # Since Booking doesn't have total_amount field, we calculate it for each booking
-        first_day_month = today.replace(day=1)
-        monthly_bookings = db.query(Booking).filter(
-            Booking.status == BookingStatus.CONFIRMED,
-            Booking.check_in >= first_day_month
-        ).all()
-        
-        monthly_revenue = 0.0
-        for booking in monthly_bookings:
-            try:
-                pricing = PricingService.calculate_total(
-                    check_in=booking.check_in,
-                    check_out=booking.check_out,
-                    guests=booking.guest_count,
-                    policy_type=booking.policy_type
-                )
-                monthly_revenue += pricing.get("total_amount", 0)
-            except Exception as e:
-                logger.warning(f"Error calculating price for booking {booking.id}: {e}")
-                continue
-        
-        # Occupancy Rate (Simple calculation based on active bookings)
-        # For more accuracy, would need to calculate booked nights / available nights
-        occupancy_rate = min(100.0, (active_bookings / 30.0) * 100) if active_bookings > 0 else 0.0
-        
-        return KPIResponse(
-            total_bookings=total_bookings,
-            monthly_revenue=monthly_revenue,
-            active_bookings=active_bookings,
-            occupancy_rate=round(occupancy_rate, 1)
-        )
+        return KPIResponse(**kpi_snapshot.get(db))
     except Exception as e:
         logger.error(f"Error calculating KPIs: {e}")
         raise HTTPException(status_code=500, detail=f"Error calculating KPIs: {str(e)}")
 
 @router.get("/bookings", response_model=List[BookingResponse])
 def list_bookings(
+    response: Response,
     status: Optional[str] = None,
-    limit: int = 100,
-    skip: int = 0, # Added pagination skip
+    limit: int = Query(100, ge=1, le=500),
+    skip: int = 0, # Legacy offset paging; ignored when `cursor` is sent
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    date_from: Optional[date] = Query(None, description="Stays ending on/after this day"),
+    date_to: Optional[date] = Query(None, description="Stays starting on/before this day"),
+    policy_type: Optional[BookingPolicy] = None,
+    channel: Optional[str] = Query(None, pattern="^(online|admin)$"),
+    is_override: Optional[bool] = None,
+    q: Optional[str] = Query(None, min_length=2, description="Guest name / email / phone starts with (case-insensitive)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin)
 ):
-    logger.info(f"Admin {current_user.email} listing bookings status={status} limit={limit}")
+    """
+    Bookings, newest first, filtered in SQL.
+    Keyset pagination: pass the X-Next-Cursor header back as `cursor` (absent on the last page).
+    X-Total-Count (matching rows, capped at ADMIN_LIST_COUNT_CAP) is only sent on the first page.
+    """
+    logger.info(f"Admin {current_user.email} listing bookings status={status} limit={limit} cursor={cursor is not None}")
     try:
-        query = db.query(Booking).options(joinedload(Booking.payments))
+        query = db.query(Booking)
         if status and status != "ALL":
             query = query.filter(Booking.status == status)
-        
-        # Pagination
-        bookings = query.order_by(Booking.id.desc()).offset(skip).limit(limit).all()
+        if date_from:
+            query = query.filter(Booking.check_out >= date_from)
+        if date_to:
+            query = query.filter(Booking.check_in <= date_to)
+        if policy_type:
+            query = query.filter(Booking.policy_type == policy_type)
+        if channel == "admin":
+            query = query.filter(Booking.created_by_admin_id.isnot(None))
+        elif channel == "online":
+            query = query.filter(Booking.created_by_admin_id.is_(None))
+        if is_override is not None:
+            query = query.filter(Booking.is_override == is_override)
+        if q:
+            # Prefix match written as a range, so each side can use its index
+            # (ix_bookings_guest_*); substring search would need trigram / FTS
+            query = query.filter(or_(
+                prefix_range(Booking.guest_name_key, search_key(q)),
+                prefix_range(Booking.guest_email_key, search_key(q)),
+                prefix_range(Booking.guest_phone, q)
+            ))
+
+        if cursor is None:
+            # Cheap total: count stops at the cap instead of scanning every match
+            cap = settings.ADMIN_LIST_COUNT_CAP
+            total = db.query(func.count()).select_from(
+                query.with_entities(Booking.id).limit(cap + 1).subquery()
+            ).scalar()
+            response.headers["X-Total-Count"] = str(min(total, cap))
+            if total > cap:
+                response.headers["X-Total-Count-Capped"] = "true"
+
+        # Keyset page on the primary key; payments loaded with one IN query (no JOIN + LIMIT)
+        page = query.options(selectinload(Booking.payments)).order_by(Booking.id.desc())
+        key = decode_cursor(cursor)
+        if key is not None:
+            if not isinstance(key[0], int) or isinstance(key[0], bool):
+                raise InvalidCursorError("Invalid cursor")
+            page = page.filter(Booking.id < key[0])
+        else:
+            page = page.offset(skip)
+        bookings = page.limit(limit + 1).all()
+
+        if len(bookings) > limit:
+            bookings = bookings[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(bookings[-1].id)
         
         response_list = []
         # ... mapping logic ...
         for b in bookings:
-            # Calculate Total Amount
-            pricing = PricingService.calculate_total(
-                check_in=b.check_in,
-                check_out=b.check_out,
-                guests=b.guest_count,
-                policy_type=b.policy_type,
-                manual_total=b.manual_total_amount
-            )
-            total_amnt = pricing["total_amount"]
+            # Stored at creation (scripts/backfill_booking_totals.py for older rows)
+            total_amnt = money.from_cents(b.total_cents)
             
             # Extract Payment Info (Assuming first payment record holds metadata)
             p_method = None
@@ -183,12 +197,15 @@ def list_bookings(
                 is_override=b.is_override,
                 override_reason=b.override_reason,
                 rules_bypassed=b.rules_bypassed,
+                review_reason=b.review_reason,
                 total_amount=total_amnt,
                 payment_method=p_method,
                 payment_status=p_status,
                 created_at=created_date
             ))
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing bookings: {e}")
         # Return the actual error message to help debugging
@@ -211,14 +228,7 @@ def get_booking_details(
         
     # Logic to populate BookingResponse (Reuse logic or extract to helper function)
     # For now reusing explicit logic to ensure consistency
-    pricing = PricingService.calculate_total(
-        check_in=booking.check_in,
-        check_out=booking.check_out,
-        guests=booking.guest_count,
-        policy_type=booking.policy_type,
-        manual_total=booking.manual_total_amount
-    )
-    total_amnt = pricing["total_amount"]
+    total_amnt = money.from_cents(booking.total_cents)
     
     p_method = None
     p_status = None
@@ -246,6 +256,7 @@ def get_booking_details(
         is_override=booking.is_override,
         override_reason=booking.override_reason,
         rules_bypassed=booking.rules_bypassed,
+        review_reason=booking.review_reason,
         total_amount=total_amnt,
         payment_method=p_method,
         payment_status=p_status,
@@ -275,7 +286,12 @@ def update_booking_status(
     
     logger.info(f"Admin {current_admin.email} changed booking {booking_id} status from {old_status} to {status_req.status}")
     
-    db.commit()
+    repo = BookingRepository(db)
+    repo.sync_nights(booking)
+    try:
+        repo.commit()
+    except OverbookingError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return {"status": "updated", "id": booking.id, "new_status": booking.status}
 
 # ============================================
@@ -331,7 +347,6 @@ def create_manual_booking(
     
     # NEW: Server-Side Pricing & Validation Source of Truth
     from app.services.calendar_service import CalendarService
-    from app.services.booking_engine import BookingService
     from app.db.repository import BookingRepository
 
     repo = BookingRepository(db)
@@ -468,6 +483,70 @@ def preview_manual_pricing(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# ---------- Rate Plans (dated rates, hot-reloaded by services/rate_index.py) ----------
+
+class RatePlanRequest(BaseModel):
+    policy_type: BookingPolicy
+    rate: int = Field(..., gt=0)
+    valid_from: date
+    valid_to: Optional[date] = None # Inclusive; None = open ended
+    name: Optional[str] = None
+
+    @field_validator('valid_to')
+    def validate_range(cls, v, values):
+        if v is not None and 'valid_from' in values.data and v < values.data['valid_from']:
+            raise ValueError('valid_to must be on or after valid_from')
+        return v
+
+class RatePlanResponse(RatePlanRequest):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+@router.get("/rates", response_model=List[RatePlanResponse])
+def list_rate_plans(
+    policy_type: Optional[BookingPolicy] = None,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    query = db.query(RatePlan)
+    if policy_type:
+        query = query.filter(RatePlan.policy_type == policy_type)
+    return query.order_by(RatePlan.policy_type, RatePlan.valid_from).all()
+
+@router.post("/rates", response_model=RatePlanResponse)
+def create_rate_plan(
+    req: RatePlanRequest,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Adds a dated rate. Overlaps are allowed: the plan starting later wins.
+    Prices use it as soon as this commit lands (no deploy).
+    """
+    plan = RatePlan(**req.model_dump())
+    db.add(plan)
+    db.commit()
+    db.refresh(plan)
+    logger.info(f"Admin {current_admin.email} created rate plan {plan.id} ({plan.policy_type} ${plan.rate:,} from {plan.valid_from})")
+    return plan
+
+@router.delete("/rates/{rate_id}")
+def delete_rate_plan(
+    rate_id: int,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    plan = db.query(RatePlan).filter(RatePlan.id == rate_id).first()
+    if not plan:
+        raise HTTPException(status_code=404, detail="Rate plan not found")
+    db.delete(plan) # ORM delete (not bulk) so the rate index reloads
+    db.commit()
+    logger.info(f"Admin {current_admin.email} deleted rate plan {rate_id}")
+    return {"status": "deleted", "id": rate_id}
+
+
 class BlockDatesRequest(BaseModel):
     property_id: int
     check_in: date
@@ -498,16 +577,16 @@ def block_dates(
     )
     
     db.add(block)
-    db.commit()
-    db.refresh(block)
-    
-    db.add(block)
-    db.commit()
+    db.flush()
+    repo.sync_nights(block)
+    try:
+        repo.commit()
+    except OverbookingError:
+        raise HTTPException(status_code=409, detail="Dates already booked")
     db.refresh(block)
     
     return {"status": "blocked", "id": block.id}
 
-from app.db.models import Payment, PaymentStatus
 from datetime import date as dt_date
 
 @router.post("/payments/{payment_id}/confirm")
@@ -541,10 +620,15 @@ def confirm_payment(
     payment.confirmed_by_admin_id = current_admin.id
     
     # Confirm Booking
+    repo = BookingRepository(db)
     if payment.booking:
         payment.booking.status = BookingStatus.CONFIRMED
+        repo.sync_nights(payment.booking) # Re-claims dates if the hold had expired
         
-    db.commit()
+    try:
+        repo.commit()
+    except OverbookingError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return {"status": "confirmed", "payment_status": payment.status}
 
 
@@ -618,13 +702,13 @@ def confirm_booking(
         # Case A: Manual/Direct (No Payment Record) -> Create One
         if not payment:
             # Calculate amount if missing (it should be there from creation)
-            amount = booking.manual_total_amount or 0.0 
+            amount_cents = booking.manual_total_cents or 0
             
             new_payment = Payment(
                 booking_id=booking.id,
                 provider=PaymentProvider.DUMMY, # Internal
                 payment_method=PaymentMethod.DIRECT_ADMIN_AGREEMENT,
-                amount=amount,
+                amount_cents=amount_cents,
                 status=PaymentStatus.CONFIRMED_DIRECT_PAYMENT,
                 confirmed_at=date.today(),
                 confirmed_by_admin_id=current_admin.id
@@ -679,7 +763,7 @@ def cancel_booking(
     """
     Cancels a booking.
     - Enforces State Machine: PENDING/CONFIRMED -> CANCELLED.
-    - Releases dates (implicit by status change).
+    - Releases dates (status change + night ledger rows).
     """
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
     if not booking:
@@ -696,7 +780,10 @@ def cancel_booking(
     previous_status = booking.status
     booking.status = BookingStatus.CANCELLED
     
-    # 3. Audit Log
+    # 3. Release dates in the night ledger
+    BookingRepository(db).release_nights([booking.id])
+    
+    # 4. Audit Log
     logger.info(f"AUDIT: Admin {current_admin.id} CANCELLED Booking {booking.id}. Prev: {previous_status}. Timestamp: {datetime.now()}")
 
     db.commit()
@@ -716,7 +803,12 @@ def complete_booking(
         raise HTTPException(status_code=404, detail="Booking not found")
         
     booking.status = BookingStatus.COMPLETED
-    db.commit()
+    repo = BookingRepository(db)
+    repo.sync_nights(booking)
+    try:
+        repo.commit()
+    except OverbookingError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return {"status": "completed", "id": booking.id}
 
 @router.post("/bookings/{booking_id}/expire")
@@ -733,6 +825,7 @@ def expire_booking(
         raise HTTPException(status_code=404, detail="Booking not found")
         
     booking.status = BookingStatus.EXPIRED
+    BookingRepository(db).release_nights([booking.id])
     db.commit()
     return {"status": "expired", "id": booking.id}
 
@@ -752,7 +845,6 @@ def trigger_expiration_job(
 # ==================== PAYMENT CONFIRMATION ENDPOINTS ====================
 
 from app.services.payment_state_engine import PaymentStateEngine, InvalidStateTransitionError
-from app.db.models import Payment, PaymentStatus
 
 @router.post("/payments/{payment_id}/confirm")
 def confirm_bank_transfer(
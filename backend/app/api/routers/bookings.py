@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
+from pydantic import BaseModel, Field, field_validator
 
 from app.core.database import get_db
-from app.domain.models import BookingRequest
+from app.domain.models import BookingRequest, BookingPolicy
 from app.services.booking_engine import BookingService, OverbookingError
 from app.db.repository import BookingRepository
 from app.core.exceptions import RuleViolationError
+from app.services.availability_service import AvailabilityService
+from app.services.quote_service import QuoteService
 
 router = APIRouter()
 
@@ -40,5 +43,116 @@ def check_availability(
     db: Session = Depends(get_db)
 ):
     repo = BookingRepository(db)
-    is_available = repo.check_availability(property_id, check_in, check_out)
+    is_available = AvailabilityService.is_available(repo, property_id, check_in, check_out)
     return {"property_id": property_id, "available": is_available}
+
+@router.get("/availability/calendar")
+def get_availability_calendar(
+    from_date: date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last day, inclusive (YYYY-MM-DD)"),
+    property_id: int = 1,
+    db: Session = Depends(get_db)
+):
+    """
+    Per-day occupancy (free, night_occupied, day_pass_occupied, blocked, pending_hold)
+    for up to 12 months, resolved with a single range query.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if (to_date - from_date).days + 1 > AvailabilityService.MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large. Maximum is {AvailabilityService.MAX_CALENDAR_DAYS} days."
+        )
+
+    repo = BookingRepository(db)
+    return AvailabilityService.build_calendar(repo, property_id, from_date, to_date)
+
+@router.get("/availability/next")
+def find_next_available(
+    policy_type: BookingPolicy,
+    guests: int = Query(..., gt=0),
+    nights: int = Query(1, ge=0, le=30, description="Ignored for day_pass (always 0)"),
+    limit: int = Query(5, ge=1, le=50),
+    from_date: date = Query(None, alias="from", description="Search start (default: today)"),
+    property_id: int = 1,
+    db: Session = Depends(get_db)
+):
+    """
+    First `limit` date windows that are free AND valid for the plan,
+    scanning up to 12 months ahead. Meant for suggesting alternatives after a 409.
+    """
+    if policy_type == BookingPolicy.DAY_PASS:
+        nights = 0
+    elif nights == 0:
+        raise HTTPException(status_code=400, detail="nights must be at least 1 for this plan")
+
+    repo = BookingRepository(db)
+    windows = AvailabilityService.next_windows(
+        repo, property_id, policy_type, nights, guests,
+        from_date or date.today(), limit
+    )
+    return {
+        "property_id": property_id,
+        "policy_type": policy_type,
+        "nights": nights,
+        "windows": windows
+    }
+
+@router.get("/quote")
+def get_quote(
+    check_in: date,
+    check_out: date,
+    guests: int = Query(..., gt=0),
+    property_id: int = 1,
+    db: Session = Depends(get_db)
+):
+    """
+    Evaluates every plan for the dates at once: eligibility, rule violations
+    and price breakdown per policy_type (no need to guess one and parse a 422).
+    """
+    if check_out < check_in:
+        raise HTTPException(status_code=400, detail="Check-out must be at or after check-in")
+
+    repo = BookingRepository(db)
+    return QuoteService.quote(repo, property_id, check_in, check_out, guests)
+
+
+class AvailabilityRange(BaseModel):
+    property_id: int = 1
+    check_in: date
+    check_out: date
+
+    @field_validator('check_out')
+    def validate_dates(cls, v, values):
+        if 'check_in' in values.data and v < values.data['check_in']:
+            raise ValueError('Check-out must be at or after check-in')
+        return v
+
+class BatchAvailabilityRequest(BaseModel):
+    ranges: List[AvailabilityRange] = Field(..., min_length=1, max_length=500)
+
+@router.post("/availability/batch")
+def check_availability_batch(
+    request: BatchAvailabilityRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Availability for many ranges (e.g. every weekend of the season) in one call.
+    Bookings are fetched once per property instead of once per range.
+    """
+    repo = BookingRepository(db)
+    ranges = [(r.property_id, r.check_in, r.check_out) for r in request.ranges]
+    available = AvailabilityService.check_many(repo, ranges)
+
+    return {
+        "results": [
+            {
+                "property_id": r.property_id,
+                "check_in": r.check_in,
+                "check_out": r.check_out,
+                "available": is_available
+            }
+            for r, is_available in zip(request.ranges, available)
+        ]
+    }
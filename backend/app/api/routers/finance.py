@@ -8,8 +8,8 @@ All endpoints are protected with admin authentication.
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import date, datetime
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel, Field
 
 from app.core.database import get_db
@@ -132,6 +132,80 @@ def get_financial_summary(
         )
 
 
+class RevenueBucket(BaseModel):
+    """Revenue of one day / week / month bucket (same breakdowns as the summary)."""
+    period_start: date = Field(..., description="First day of the bucket (clipped to 'from')")
+    period_end: date = Field(..., description="Last day of the bucket, inclusive (clipped to 'to')")
+    revenue: float = Field(..., description="Revenue in COP")
+    payments: int = Field(..., description="Revenue payments confirmed in the bucket")
+    bookings: int = Field(..., description="Bookings whose first revenue payment in the range falls in the bucket")
+    revenue_by_plan: dict
+    revenue_by_payment_method: dict
+    revenue_by_channel: dict
+
+
+class RevenueTimeseriesResponse(BaseModel):
+    bucket: str = Field(..., description="day, week (Monday start) or month")
+    currency: str = Field(default="COP", description="Currency code")
+    total_revenue: float = Field(..., description="Total revenue in COP over the range")
+    total_bookings_confirmed: int = Field(..., description="Sum of the bucket bookings")
+    date_range: dict = Field(..., description="Date range applied")
+    series: List[RevenueBucket] = Field(..., description="Every bucket in the range, oldest first")
+
+
+# Buckets returned when 'from' is omitted
+_DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+
+
+@router.get("/timeseries", response_model=RevenueTimeseriesResponse)
+def get_revenue_timeseries(
+    bucket: str = Query("month", pattern="^(day|week|month)$", description="Bucket size: day, week or month"),
+    from_date: Optional[date] = Query(None, alias="from", description="Start date (YYYY-MM-DD)"),
+    to_date: Optional[date] = Query(None, alias="to", description="End date, inclusive (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Revenue, payments and bookings per day / week / month for the admin charts.
+    
+    **Authorization:** Admin only
+    
+    **Date Filtering:**
+    - Uses `Payment.confirmed_at`, same revenue rules as `/summary`
+    - `to` defaults to today; `from` defaults to the last 30 days / 12 weeks / 12 months
+    - At most `FinancialService.MAX_TIMESERIES_BUCKETS` buckets per request
+    
+    One call for the whole chart: two grouped queries (served from the
+    revenue_daily rollup) instead of one summary per period.
+    """
+    to_date = to_date or date.today()
+    if not from_date:
+        from_date = FinancialService.bucket_start(to_date, bucket)
+        for _ in range(_DEFAULT_BUCKETS[bucket] - 1):
+            from_date = FinancialService.bucket_start(from_date - timedelta(days=1), bucket)
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if FinancialService.count_buckets(from_date, to_date, bucket) > FinancialService.MAX_TIMESERIES_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large. Maximum is {FinancialService.MAX_TIMESERIES_BUCKETS} buckets."
+        )
+    
+    try:
+        timeseries = FinancialService.calculate_revenue_timeseries(
+            db=db,
+            bucket=bucket,
+            start_date=from_date,
+            end_date=to_date
+        )
+        return RevenueTimeseriesResponse(**timeseries)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error calculating revenue time series: {str(e)}"
+        )
+
+
 @router.get("/report")
 def download_financial_report(
     format: str = Query("pdf", pattern="^(pdf|xlsx)$", description="Report format: pdf or xlsx"),
@@ -171,8 +245,8 @@ def download_financial_report(
             end_date=to_date
         )
         
-        # Get detailed breakdown for report
-        details = FinancialService.get_revenue_details(
+        # Detailed rows streamed straight into the report builder
+        details = FinancialService.iter_revenue_details(
             db=db,
             start_date=from_date,
             end_date=to_date
@@ -38,3 +38,21 @@ def trigger_expiration_job(authorized: bool = Depends(verify_cron_secret)):
     except Exception as e:
         logger.error(f"Error in manual expiration job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/db-stats")
+def get_db_stats(authorized: bool = Depends(verify_cron_secret)):
+    """
+    Connection pool occupancy and active DB profile (for monitoring).
+    Secured by X-Cron-Secret header.
+    """
+    from app.core.database import engine, async_engine
+    from app.core.db_profile import pool_stats
+
+    stats = {
+        "profile": settings.DB_PROFILE,
+        "dialect": engine.dialect.name,
+        "pool": pool_stats(engine)
+    }
+    if async_engine is not None:
+        stats["async_pool"] = pool_stats(async_engine)
+    return stats
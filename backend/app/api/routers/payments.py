@@ -3,9 +3,8 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.domain.models import BookingRequest
 from app.api.routers.bookings import get_service
-from app.services.booking_engine import BookingService
 from app.core.payments import get_payment_gateway
-from app.db.models import Payment, PaymentStatus, BookingStatus, PaymentProvider
+from app.db.models import Payment, PaymentStatus, BookingStatus, PaymentMethod
 from app.db.repository import BookingRepository
 import json
 
@@ -14,24 +13,61 @@ router = APIRouter()
 # Import for new endpoint
 from fastapi import Path
 
-from app.db.models import Payment, PaymentStatus, BookingStatus, PaymentProvider, PaymentMethod
-
-from app.services.booking_engine import BookingService, OverbookingError
+from app.services.booking_engine import OverbookingError
 from fastapi.responses import JSONResponse
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from app.core.config import settings
 from app.db.models import PaymentType
+from fastapi import Header
+from typing import Optional
+from app.core.exceptions import IdempotencyError, PaymentGatewayError
+from app.services.idempotency import IdempotencyService
+from app.services.checkout_service import CheckoutService
 
 @router.post("/checkout")
 def create_checkout_session(
     request: BookingRequest, 
     property_id: int = 1,
     provider: str = "DUMMY", # Only for Online
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db)
 ):
+    """
+    Creates the booking hold + payment.
+    With an Idempotency-Key header, retries (double click, mobile retry) get the
+    stored response instead of running validation, availability and the gateway again.
+    """
+    if not idempotency_key:
+        return _run_checkout(request, property_id, provider, db)
 
-    service_repo = BookingRepository(db)
-    service = BookingService(repo=service_repo)
-    
+    request_hash = IdempotencyService.request_hash({
+        "request": request.model_dump(),
+        "property_id": property_id,
+        "provider": provider
+    })
+    try:
+        stored = IdempotencyService.begin(db, idempotency_key, request_hash)
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if stored:
+        status_code, body = stored
+        return JSONResponse(status_code=status_code, content=body, headers={"Idempotent-Replayed": "true"})
+
+    try:
+        result = _run_checkout(request, property_id, provider, db)
+    except Exception:
+        # Not stored: the client may retry with the same key
+        IdempotencyService.release(db, idempotency_key)
+        raise
+
+    if isinstance(result, JSONResponse):
+        IdempotencyService.complete(db, idempotency_key, result.status_code, json.loads(result.body))
+    else:
+        IdempotencyService.complete(db, idempotency_key, 200, result)
+    return result
+
+def _run_checkout(request: BookingRequest, property_id: int, provider: str, db: Session):
     # Valida payment method
     try:
         method_enum = PaymentMethod(request.payment_method)
@@ -43,23 +79,10 @@ def create_checkout_session(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid payment type")
 
-    # 1. Create Booking
+    # Booking + Payment in one transaction, gateway intent after commit (see CheckoutService)
+    # RuleViolationError goes to the global handler (422 + error_code for the frontend)
     try:
-        # Update Service to handle payment_type save? Or update after?
-        # Service.create_booking doesn't know about payment_type yet.
-        # We can update it on the object returned.
-        booking = service.create_booking(request, property_id)
-        
-        # Update extra fields
-        booking.payment_type = type_enum
-        
-        # 60-Minute Expiration Logic
-        # Applies if Partial Payment OR Bank Transfer
-        if type_enum == PaymentType.PARTIAL or method_enum == PaymentMethod.BANK_TRANSFER:
-            booking.expires_at = datetime.now() + timedelta(minutes=60)
-            
-        db.commit()
-            
+        return CheckoutService.create_checkout(db, request, property_id, provider, method_enum, type_enum)
     except OverbookingError as e:
         return JSONResponse(
             status_code=409,
@@ -69,73 +92,8 @@ def create_checkout_session(
                 "details": str(e)
             }
         )
-    
-    # Calculate Amount using Centralized Pricing Engine
-    from app.services.pricing import PricingService
-    
-    pricing_result = PricingService.calculate_total(
-        check_in=request.check_in,
-        check_out=request.check_out,
-        guests=request.guest_count,
-        policy_type=request.policy_type
-    )
-    
-    total_amount = pricing_result["total_amount"]
-    
-    pay_amount = total_amount
-    if type_enum == PaymentType.PARTIAL:
-        pay_amount = total_amount * 0.5 # 50% Deposit
-        
-    payment_url = None
-    transaction_id = None
-    status = PaymentStatus.PENDING_PAYMENT
-    
-    # 2. Handle Payment Method Logic
-    if method_enum == PaymentMethod.ONLINE_GATEWAY:
-        # Initiate Payment Intent via Gateway
-        gateway = get_payment_gateway(provider)
-        payment_response = gateway.create_payment_intent(
-            amount=pay_amount,
-            currency="COP",
-            booking_id=booking.id,
-            customer_email=request.guest_email or "customer@example.com"
-        )
-        payment_url = payment_response["payment_url"]
-        transaction_id = payment_response.get("transaction_id")
-        # Status remains PENDING_PAYMENT
-        
-    elif method_enum == PaymentMethod.BANK_TRANSFER:
-        status = PaymentStatus.AWAITING_CONFIRMATION
-        payment_url = None # Frontend will show instructions
-        
-    elif method_enum == PaymentMethod.DIRECT_ADMIN_AGREEMENT:
-        status = PaymentStatus.PENDING_DIRECT_PAYMENT
-        payment_url = None
-        
-    # 3. Record Payment
-    payment = Payment(
-        booking_id=booking.id,
-        provider=PaymentProvider.DUMMY if provider=="DUMMY" else PaymentProvider.STRIPE, # Default
-        payment_method=method_enum,
-        amount=pay_amount,
-        currency="COP",
-        status=status,
-        transaction_id=transaction_id
-    )
-    db.add(payment)
-    db.commit()
-    
-    return {
-        "booking_id": booking.id, 
-        "payment_id": payment.id,
-        "payment_url": payment_url, 
-        "status": status,
-        "amount_due": pay_amount,
-        "total_amount": total_amount,
-        "pricing_breakdown": pricing_result["breakdown"],
-        "expires_at": booking.expires_at.isoformat() if booking.expires_at else None,
-        "message": "Booking created. Proceed with payment."
-    }
+    except PaymentGatewayError as e:
+        raise HTTPException(status_code=502, detail=str(e))
 
 import logging
 
@@ -143,6 +101,17 @@ import logging
 logger = logging.getLogger("payments.webhook")
 logger.setLevel(logging.INFO)
 
+def _record_gateway_payment(db: Session, booking, transaction_id: Optional[str]) -> Optional[Payment]:
+    """Marks the booking's payment as captured by the gateway."""
+    # Find payment by booking_id (assuming 1 payment per booking for now)
+    # In prod: search by transaction_id if available
+    payment = db.query(Payment).filter(Payment.booking_id == booking.id).first()
+    if payment:
+        payment.status = PaymentStatus.PAID
+        payment.transaction_id = transaction_id or payment.transaction_id
+        payment.confirmed_at = date.today()
+    return payment
+
 @router.post("/webhook")
 async def payment_webhook(request: Request, db: Session = Depends(get_db)):
     # 1. Get raw payload for signature verification
@@ -189,17 +158,22 @@ async def payment_webhook(request: Request, db: Session = Depends(get_db)):
         
         # Update Booking
         booking.status = BookingStatus.CONFIRMED
+        payment = _record_gateway_payment(db, booking, transaction_id)
         
-        # Update Payment Record
-        # Find payment by booking_id (assuming 1 payment per booking for now)
-        # In prod: search by transaction_id if available
-        payment = db.query(Payment).filter(Payment.booking_id == booking.id).first()
-        if payment:
-            payment.status = PaymentStatus.PAID
-            payment.transaction_id = transaction_id or payment.transaction_id
-            payment.confirmed_at = date.today()
-        
-        db.commit()
+        # Re-claim the night ledger slots if the hold had expired before the payment arrived
+        repo.sync_nights(booking)
+        try:
+            repo.commit()
+        except OverbookingError:
+            # The gateway already captured the money: keep the payment and leave the booking
+            # (unconfirmed) to an admin for a refund or new dates. A non-2xx answer would only
+            # make the gateway retry a payment that can never confirm.
+            booking = repo.get_booking(booking_id)
+            _record_gateway_payment(db, booking, transaction_id)
+            booking.review_reason = "Pago recibido pero las fechas ya no están disponibles: reembolsar o reubicar"
+            db.commit()
+            logger.error(json.dumps({"event": "payment_confirmed_dates_taken", "booking_id": booking_id}))
+            return {"status": "needs_review", "booking_id": booking.id}
         
         logger.info(json.dumps({"event": "payment_confirmed", "booking_id": booking_id, "amount": payment.amount if payment else 0}))
         
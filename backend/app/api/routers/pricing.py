@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from datetime import date
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.http_cache import cached_json, etag_matches
+from app.db.repository import BookingRepository
+from app.services.price_calendar import PriceCalendarService
+
+router = APIRouter()
+
+@router.get("/calendar")
+def get_price_calendar(
+    request: Request,
+    from_date: date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last day, inclusive (YYYY-MM-DD)"),
+    guests: int = Query(..., gt=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-day rate and price of every plan, plus weekend / holiday flags,
+    so the UI prices a whole month with the backend rates (no local pricing.ts).
+    Cacheable: strong ETag (range + guests + rates + holidays), 304 on If-None-Match.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if (to_date - from_date).days + 1 > PriceCalendarService.MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large. Maximum is {PriceCalendarService.MAX_DAYS} days."
+        )
+
+    repo = BookingRepository(db)
+    etag = PriceCalendarService.etag(repo, from_date, to_date, guests)
+    if etag_matches(request, etag):
+        # Client is up to date: skip building the body
+        return cached_json(request, None, etag, settings.PRICE_CALENDAR_HTTP_MAX_AGE)
+    data = PriceCalendarService.build(repo, from_date, to_date, guests)
+    return cached_json(request, data, etag, settings.PRICE_CALENDAR_HTTP_MAX_AGE)
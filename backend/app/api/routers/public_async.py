@@ -0,0 +1,195 @@
+"""
+Async versions of the hot public endpoints (ASYNC_DB_ENABLED=True).
+
+Mounted in main.py BEFORE the sync routers, so these handlers win for the same
+paths and run on the event loop instead of Starlette's thread pool. Sync
+service code is reused through AsyncSession.run_sync (DB I/O stays async);
+the only blocking call left, the payment gateway, goes to the thread pool.
+"""
+
+import json
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.http_cache import cached_json
+from app.core.exceptions import IdempotencyError, OverbookingError
+from app.db.models import Booking, BlogPost, Payment, PaymentMethod, PaymentType, Testimonial
+from app.db.repository import BookingRepository
+from app.domain.models import BookingRequest
+from app.services.availability_service import AvailabilityService
+from app.services.calendar_service import CalendarService
+from app.services.checkout_service import CheckoutService
+from app.services.idempotency import IdempotencyService
+from app.api.routers.content import TestimonialResponse, BlogPostResponse
+from app.api.v1.endpoints.calendar import HolidayResponse
+
+router = APIRouter()
+
+
+# ---------- Availability / Calendar ----------
+
+@router.get("/bookings/availability")
+async def check_availability(
+    check_in: date,
+    check_out: date,
+    property_id: int = 1,
+    db: AsyncSession = Depends(get_async_db)
+):
+    is_available = await db.run_sync(
+        lambda session: AvailabilityService.is_available(BookingRepository(session), property_id, check_in, check_out)
+    )
+    return {"property_id": property_id, "available": is_available}
+
+@router.get("/api/v1/calendar/holidays", response_model=HolidayResponse)
+async def check_holidays(
+    request: Request,
+    check_in: date = Query(..., description="Check-in date (YYYY-MM-DD)"),
+    check_out: date = Query(..., description="Check-out date (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    def load(session):
+        repo = BookingRepository(session)
+        return (
+            CalendarService.holidays_etag(repo, check_in, check_out),
+            CalendarService.check_holiday_window(repo, check_in, check_out)
+        )
+
+    etag, result = await db.run_sync(load)
+    return cached_json(request, HolidayResponse(**result), etag, settings.HOLIDAYS_HTTP_MAX_AGE)
+
+
+# ---------- Checkout ----------
+
+@router.post("/payments/checkout")
+async def create_checkout_session(
+    request: BookingRequest,
+    property_id: int = 1,
+    provider: str = "DUMMY", # Only for Online
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Same contract as the sync /payments/checkout (Idempotency-Key included)."""
+    if not idempotency_key:
+        return await _run_checkout(request, property_id, provider, db)
+
+    request_hash = IdempotencyService.request_hash({
+        "request": request.model_dump(),
+        "property_id": property_id,
+        "provider": provider
+    })
+    try:
+        stored = await db.run_sync(lambda session: IdempotencyService.begin(session, idempotency_key, request_hash))
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if stored:
+        status_code, body = stored
+        return JSONResponse(status_code=status_code, content=body, headers={"Idempotent-Replayed": "true"})
+
+    try:
+        result = await _run_checkout(request, property_id, provider, db)
+    except Exception:
+        # Not stored: the client may retry with the same key
+        await db.run_sync(lambda session: IdempotencyService.release(session, idempotency_key))
+        raise
+
+    if isinstance(result, JSONResponse):
+        status_code, body = result.status_code, json.loads(result.body)
+    else:
+        status_code, body = 200, result
+    await db.run_sync(lambda session: IdempotencyService.complete(session, idempotency_key, status_code, body))
+    return result
+
+async def _run_checkout(request: BookingRequest, property_id: int, provider: str, db: AsyncSession):
+    try:
+        method_enum = PaymentMethod(request.payment_method)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payment method")
+
+    try:
+        type_enum = PaymentType(request.payment_type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payment type")
+
+    try:
+        checkout = await db.run_sync(
+            lambda session: CheckoutService.reserve(session, request, property_id, provider, method_enum, type_enum)
+        )
+    except OverbookingError as e:
+        return JSONResponse(
+            status_code=409,
+            content={
+                "error_code": "OVERBOOKING_NOT_ALLOWED",
+                "message": "Las fechas seleccionadas no están disponibles.",
+                "details": str(e)
+            }
+        )
+
+    payment_response = None
+    if method_enum == PaymentMethod.ONLINE_GATEWAY:
+        try:
+            # Provider SDKs are blocking: keep them off the event loop
+            payment_response = await run_in_threadpool(CheckoutService.request_intent, checkout, request, provider)
+        except Exception as e:
+            error = str(e)  # `e` is unbound once the except block ends
+            await db.run_sync(lambda session: CheckoutService.compensate(session, checkout, error))
+            raise HTTPException(status_code=502, detail=f"No se pudo iniciar el pago: {error}")
+
+    return await db.run_sync(lambda session: CheckoutService.finalize(session, checkout, payment_response))
+
+
+# ---------- Payment Status (frontend polling) ----------
+
+@router.get("/payments/{payment_id}/status")
+async def get_payment_status(
+    payment_id: int = Path(..., description="Payment ID"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    payment = (await db.execute(select(Payment).where(Payment.id == payment_id))).scalar_one_or_none()
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    booking = (await db.execute(select(Booking).where(Booking.id == payment.booking_id))).scalar_one_or_none()
+
+    return {
+        "payment_id": payment.id,
+        "booking_id": payment.booking_id,
+        "status": payment.status.value,
+        "payment_method": payment.payment_method.value,
+        "amount": float(payment.amount),
+        "currency": payment.currency,
+        "expires_at": booking.expires_at.isoformat() if booking and booking.expires_at else None,
+        "evidence_url": payment.evidence_url,
+        "evidence_uploaded_at": payment.evidence_uploaded_at.isoformat() if payment.evidence_uploaded_at else None,
+        "created_at": payment.created_at.isoformat() if payment.created_at else None,
+        "confirmed_at": payment.confirmed_at.isoformat() if payment.confirmed_at else None,
+    }
+
+
+# ---------- Content (public reads) ----------
+
+@router.get("/content/testimonials", response_model=List[TestimonialResponse])
+async def get_testimonials(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Testimonial).where(Testimonial.is_approved == True))
+    return result.scalars().all()
+
+@router.get("/content/blog", response_model=List[BlogPostResponse])
+async def get_blog_posts(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(BlogPost).where(BlogPost.status == "PUBLISHED"))
+    return result.scalars().all()
+
+@router.get("/content/blog/{slug}", response_model=BlogPostResponse)
+async def get_blog_post_by_slug(slug: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(BlogPost).where(BlogPost.slug == slug, BlogPost.status == "PUBLISHED"))
+    post = result.scalar_one_or_none()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
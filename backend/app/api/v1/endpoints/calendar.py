@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Path, Request
 from datetime import date
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.services.calendar_service import CalendarService
 from app.core.database import get_db
+from app.core.config import settings
+from app.core.http_cache import cached_json
 from app.db.repository import BookingRepository
 
 router = APIRouter()
@@ -16,8 +18,17 @@ class HolidayResponse(BaseModel):
     window_start: date
     window_end: date
 
+class HolidayEntry(BaseModel):
+    date: date
+    name: Optional[str]
+
+class YearHolidaysResponse(BaseModel):
+    year: int
+    holidays: List[HolidayEntry]
+
 @router.get("/holidays", response_model=HolidayResponse)
 def check_holidays(
+    request: Request,
     check_in: date = Query(..., description="Check-in date (YYYY-MM-DD)"),
     check_out: date = Query(..., description="Check-out date (YYYY-MM-DD)"),
     db: Session = Depends(get_db)
@@ -25,7 +36,24 @@ def check_holidays(
     """
     Check if the user's selected dates fall within a 'Holiday Weekend' context.
     Returns the detection result using the central backend logic.
+    Cacheable: strong ETag (dates + holiday data), 304 on If-None-Match.
     """
     repo = BookingRepository(db)
+    etag = CalendarService.holidays_etag(repo, check_in, check_out)
     result = CalendarService.check_holiday_window(repo, check_in, check_out)
-    return result
+    return cached_json(request, HolidayResponse(**result), etag, settings.HOLIDAYS_HTTP_MAX_AGE)
+
+@router.get("/holidays/year/{year}", response_model=YearHolidaysResponse)
+def get_year_holidays(
+    request: Request,
+    year: int = Path(..., ge=1900, le=2200),
+    db: Session = Depends(get_db)
+):
+    """
+    Every holiday of the year (algorithmic + admin overrides) for the date picker
+    to fetch once and evaluate locally.
+    """
+    repo = BookingRepository(db)
+    data = CalendarService.holidays_for_year(repo, year)
+    etag = data.pop("etag")
+    return cached_json(request, YearHolidaysResponse(**data), etag, settings.HOLIDAYS_HTTP_MAX_AGE)
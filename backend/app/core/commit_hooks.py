@@ -0,0 +1,90 @@
+"""
+Transaction-scoped ORM change hooks.
+
+Collects insert/update/delete events of some mapped classes in session.info
+while a transaction runs, and hands the batch to a callback:
+- on_flush: at the end of each flush, inside the same transaction (can emit SQL).
+- on_commit: once the transaction has committed (cannot use the session).
+A rollback drops whatever was collected.
+
+Shared by the in-process caches and the rollup tables kept in step with the ORM.
+"""
+
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_KINDS = ("insert", "update", "delete")
+
+
+class CommitHook:
+    def __init__(
+        self,
+        name: str,
+        models: Iterable[type],
+        collect: Optional[Callable[[str, Any], Any]] = None,
+        on_commit: Optional[Callable[[Session, list], None]] = None,
+        on_flush: Optional[Callable[[Session, list], None]] = None
+    ):
+        """
+        name: session.info key (one per hook).
+        collect(kind, target): the change to queue for "insert" / "update" / "delete"
+            of `target`, or None to ignore it. Defaults to queueing the kind.
+        """
+        self.name = name
+        self.models = tuple(models)
+        self._collect = collect or (lambda kind, target: kind)
+        self._commit_callback = on_commit
+        self._flush_callback = on_flush
+        self._mapper_listeners = {kind: self._listener(kind) for kind in _KINDS}
+        self._session_listeners = [("after_rollback", self._on_rollback)]
+        if on_commit:
+            self._session_listeners.append(("after_commit", self._on_commit))
+        if on_flush:
+            self._session_listeners.append(("after_flush_postexec", self._on_flush))
+        self.installed = False
+
+    def install(self):
+        """Registers the listeners. Idempotent."""
+        if self.installed:
+            return
+        for model in self.models:
+            for kind, listener in self._mapper_listeners.items():
+                event.listen(model, f"after_{kind}", listener)
+        for name, listener in self._session_listeners:
+            event.listen(Session, name, listener)
+        self.installed = True
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        for model in self.models:
+            for kind, listener in self._mapper_listeners.items():
+                event.remove(model, f"after_{kind}", listener)
+        for name, listener in self._session_listeners:
+            event.remove(Session, name, listener)
+        self.installed = False
+
+    def _listener(self, kind: str):
+        def listener(mapper, connection, target):
+            change = self._collect(kind, target)
+            if change is None:
+                return
+            session = inspect(target).session
+            if session is not None:
+                session.info.setdefault(self.name, []).append(change)
+        return listener
+
+    def _on_flush(self, session: Session, flush_context):
+        changes = session.info.pop(self.name, None)
+        if changes:
+            self._flush_callback(session, changes)
+
+    def _on_commit(self, session: Session):
+        changes = session.info.pop(self.name, None)
+        if changes:
+            self._commit_callback(session, changes)
+
+    def _on_rollback(self, session: Session):
+        session.info.pop(self.name, None)
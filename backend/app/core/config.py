@@ -12,6 +12,23 @@ class Settings(BaseSettings):
     # Database
     # using absolute path to avoid CWD issues
     DATABASE_URL: str = "sqlite:///c:/Users/juanc/OneDrive/Documentos/Desarrollo proyectos/Villa Roli/Proyecto descargado/villa-roli-escape-main/backend/villa_roli.db"
+    # Optional async engine for the hot public endpoints (needs aiosqlite / asyncpg)
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None # Derived from DATABASE_URL if not set
+    
+    # Database tuning (see core/db_profile.py)
+    DB_PROFILE: str = "tuned" # tuned | default (plain create_engine)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456 # 256 MB
+    SQLITE_CACHE_SIZE_KB: int = 65536 # 64 MB
+    DB_POOL_SIZE: int = 10 # Server databases only (PostgreSQL / MySQL)
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000 # PostgreSQL only, 0 = disabled
     
     # Security / CORS
     ALLOWED_ORIGINS: list[str] = [
@@ -28,13 +45,30 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
     PENDING_TIMEOUT_MINUTES: int = 60
+    IDEMPOTENCY_TTL_HOURS: int = 24 # How long checkout replays return the stored response
     
     # Operations
     ENABLE_INTERNAL_SCHEDULER: bool = True
     CRON_SECRET: str = "CHANGE_ME_CRON_SECRET"
     
+    # Admin
+    ADMIN_LIST_COUNT_CAP: int = 10000 # X-Total-Count stops counting here (header X-Total-Count-Capped)
+
+    # Availability
+    AVAILABILITY_INDEX_ENABLED: bool = True
+    AVAILABILITY_INDEX_REFRESH_MINUTES: int = 10
+
+    # Pricing
+    RATE_INDEX_ENABLED: bool = True # rate_plans table loaded in memory (off = PricingService constants)
+    RATE_INDEX_REFRESH_MINUTES: int = 5 # Picks up rate changes made by other workers
+    PRICE_CALENDAR_HTTP_MAX_AGE: int = 300 # Cache-Control for /pricing/calendar
+    REVENUE_ROLLUP_VERIFY_MINUTES: int = 60 # revenue_daily checked against the payments, rebuilt on mismatch (0 = off)
+    KPI_SNAPSHOT_TTL_SECONDS: int = 30 # Dashboard KPI snapshot lifetime (0 = no caching)
+
     # Business Logic
     # Holidays are now managed by CalendarService
+    HOLIDAY_CACHE_TTL_SECONDS: int = 300 # Reload of DB holiday overrides (0 = only on add_holiday)
+    HOLIDAYS_HTTP_MAX_AGE: int = 3600 # Cache-Control for /api/v1/calendar/holidays*
 
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -0,0 +1,100 @@
+"""
+Database Profiles
+
+Engine options driven by Settings (DB_PROFILE):
+- "tuned" (default): SQLite gets connect-time pragmas (WAL, synchronous,
+  busy_timeout, mmap, page cache); server databases (PostgreSQL/MySQL) get
+  pool sizing, pre-ping, recycle and a statement timeout.
+- "default": plain create_engine, kept for comparison (benchmarks/checkout_bench.py).
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+TUNED = "tuned"
+DEFAULT = "default"
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def sqlite_pragmas() -> List[Tuple[str, Any]]:
+    """Pragmas applied on every new SQLite connection."""
+    return [
+        # Readers don't block the writer (availability polls vs checkout)
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        # NORMAL is durable enough with WAL (no corruption, last commit may be lost on power loss)
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        # Wait for the write lock instead of failing with "database is locked"
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        # Negative value = size in KiB
+        ("cache_size", -settings.SQLITE_CACHE_SIZE_KB),
+    ]
+
+def engine_options(url: str, profile: str = None) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine."""
+    profile = profile or settings.DB_PROFILE
+
+    if is_sqlite(url):
+        # SQLite pool defaults are fine; tuning happens through pragmas (apply_profile)
+        if "aiosqlite" in url:
+            return {}
+        # check_same_thread=False is needed only for SQLite
+        return {"connect_args": {"check_same_thread": False}}
+
+    if profile != TUNED:
+        return {}
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms and url.startswith("postgres"):
+        if "asyncpg" in url:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+
+    return options
+
+def apply_profile(engine, profile: str = None):
+    """Registers the connect-time hooks of the profile (SQLite pragmas). Returns the engine."""
+    profile = profile or settings.DB_PROFILE
+    if profile != TUNED or engine.dialect.name != "sqlite":
+        return engine
+
+    pragmas = sqlite_pragmas()
+    # AsyncEngine exposes its events through the wrapped sync engine
+    target = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+def create_profiled_engine(url: str, profile: str = None) -> Engine:
+    return apply_profile(create_engine(url, **engine_options(url, profile)), profile)
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Pool occupancy for the ops endpoint."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    return stats
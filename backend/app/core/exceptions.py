@@ -12,3 +12,17 @@ class OverbookingError(BookingException):
     """Raised when a booking request fails availability check"""
     def __init__(self, message: str):
         super().__init__(message)
+
+class IdempotencyError(Exception):
+    """Raised when an Idempotency-Key cannot be used for the current request"""
+    def __init__(self, message: str, status_code: int = 409):
+        self.status_code = status_code
+        super().__init__(message)
+
+class PaymentGatewayError(Exception):
+    """Raised when the payment provider could not create the payment intent"""
+    pass
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
@@ -0,0 +1,33 @@
+"""
+HTTP caching helpers (strong ETag + Cache-Control, 304 on If-None-Match).
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that fully determine the response body."""
+    raw = "|".join(str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+def cached_json(request: Request, payload: Any, etag: str, max_age: int) -> Response:
+    """JSON response with ETag / Cache-Control, or an empty 304 if the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=jsonable_encoder(payload), headers=headers)
@@ -0,0 +1,36 @@
+"""
+Money as integer minor units (centavos).
+
+Amounts are stored and summed as plain ints (Payment.amount_cents, SQL SUM);
+floats only appear at the JSON edge (from_cents) and Decimal only for
+formatting / exact conversions (to_cents, to_decimal).
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Union
+
+CENTS = 100
+
+Amount = Union[int, float, Decimal, str]
+
+
+def to_cents(amount: Optional[Amount]) -> int:
+    """Major units -> cents, rounded half up (100000.555 -> 10000056). None -> 0."""
+    if amount is None:
+        return 0
+    if isinstance(amount, int):
+        return amount * CENTS
+    # str() keeps the decimal digits the caller wrote (no binary float artefacts)
+    return int((Decimal(str(amount)) * CENTS).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+def from_cents(cents: Optional[int]) -> float:
+    """Cents -> major units for JSON responses."""
+    return (cents or 0) / CENTS
+
+def to_decimal(cents: Optional[int]) -> Decimal:
+    """Cents -> exact Decimal with 2 places (reports / formatting)."""
+    return Decimal(cents or 0).scaleb(-2)
+
+def fraction(cents: int, numerator: int, denominator: int) -> int:
+    """cents * numerator / denominator in integer math, rounded half up (e.g. 50% deposits)."""
+    return (cents * numerator * 2 + denominator) // (denominator * 2)
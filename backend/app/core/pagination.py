@@ -0,0 +1,49 @@
+"""
+Keyset (cursor) pagination and index-friendly filter helpers.
+
+A cursor is the sort key of the last row served, encoded as an opaque
+URL-safe token. The next page is `WHERE key < cursor ORDER BY key DESC LIMIT n`:
+an index range scan whatever the page depth (OFFSET re-reads every skipped row).
+"""
+
+import base64
+import json
+from typing import Any, List, Optional
+
+from sqlalchemy import and_
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(*key: Any) -> str:
+    raw = json.dumps(list(key), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token: Optional[str]) -> Optional[List[Any]]:
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError("Invalid cursor")
+    if not isinstance(key, list) or not key:
+        raise InvalidCursorError("Invalid cursor")
+    return key
+
+def search_key(text: Optional[str]) -> Optional[str]:
+    """
+    Normalized form of a searchable text: Unicode casefold ("Ángela" -> "ángela").
+    Stored next to the column at write time and applied to the search term, so
+    both sides fold the same way (SQL lower() is ASCII-only on SQLite).
+    """
+    return text.casefold() if text is not None else None
+
+def prefix_range(expr, prefix: str):
+    """
+    `expr` starts with `prefix`, as `expr >= prefix AND expr < next_prefix`.
+    Unlike LIKE 'x%' this is a plain btree range, so an index on `expr`
+    (column or expression) is used on SQLite and PostgreSQL alike.
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(expr >= prefix, expr < upper)
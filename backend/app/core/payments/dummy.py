@@ -1,6 +1,5 @@
 from typing import Dict, Any
 from app.core.payments.gateway import PaymentGateway
-from app.db.models import PaymentStatus
 
 class DummyPaymentAdapter(PaymentGateway):
     def create_payment_intent(self, amount: int, currency: str, booking_id: int, customer_email: str) -> Dict[str, Any]:
@@ -13,7 +12,7 @@ class DummyPaymentAdapter(PaymentGateway):
         # In a real provider, we would check signature here.
         # For dummy, we accept the payload as truth.
         return {
-            "status": payload.get("status", PaymentStatus.COMPLETED),
+            "status": payload.get("status", "COMPLETED"),
             "transaction_id": payload.get("transaction_id"),
             "booking_id": payload.get("booking_id")
         }
@@ -2,7 +2,9 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
+from app.core.config import settings
 from app.db.models import Booking, BookingStatus
+from app.db.repository import BookingRepository
 from datetime import datetime
 import logging
 import json
@@ -45,7 +47,7 @@ def expire_stale_bookings():
         for booking in stale_bookings:
             try:
                 old_status = booking.status
-                booking.status = BookingStatus.EXPIRED  # inventory released logically by status check
+                booking.status = BookingStatus.EXPIRED  # inventory released by status + night ledger
                 
                 # Structured audit log
                 logger.info(json.dumps({
@@ -65,6 +67,9 @@ def expire_stale_bookings():
                     "error": str(e)
                 }))
         
+        # Release the night ledger rows in bulk, same transaction as the status change
+        BookingRepository(db).release_nights([b.id for b in stale_bookings if b.status == BookingStatus.EXPIRED])
+        
         db.commit()
         
         if expired_count > 0:
@@ -78,10 +83,84 @@ def expire_stale_bookings():
     finally:
         db.close()
 
+def refresh_availability_index():
+    """
+    Full rebuild of the in-memory availability index.
+    Picks up writes made by other worker processes.
+    """
+    from app.services.availability_index import availability_index
+    if not availability_index.ready:
+        return
+
+    db = SessionLocal()
+    try:
+        availability_index.rebuild(db)
+    except Exception as e:
+        logger.error(f"Availability index refresh error: {e}")
+    finally:
+        db.close()
+
+def refresh_rate_index():
+    """Full rebuild of the in-memory rate index (rate plans changed by other workers)."""
+    from app.services.rate_index import rate_index
+    if not rate_index.ready:
+        return
+
+    db = SessionLocal()
+    try:
+        rate_index.rebuild(db)
+    except Exception as e:
+        logger.error(f"Rate index refresh error: {e}")
+    finally:
+        db.close()
+
+def verify_revenue_rollup():
+    """Rebuilds the revenue_daily rollup when it no longer matches the payments."""
+    from app.services.revenue_rollup import revenue_rollup
+    if not revenue_rollup.ready:
+        return
+
+    db = SessionLocal()
+    try:
+        if not revenue_rollup.verify(db):
+            revenue_rollup.rebuild(db)
+    except Exception as e:
+        logger.error(f"Revenue rollup verify error: {e}")
+    finally:
+        db.close()
+
+def purge_idempotency_keys():
+    """Bulk delete of expired Idempotency-Key records."""
+    from app.services.idempotency import IdempotencyService
+
+    db = SessionLocal()
+    try:
+        deleted = IdempotencyService.purge_expired(db)
+        if deleted:
+            logger.info(json.dumps({"event": "idempotency_keys_purged", "count": deleted}))
+    except Exception as e:
+        logger.error(f"Idempotency purge error: {e}")
+    finally:
+        db.close()
+
 def start_scheduler():
     if not scheduler.running:
         # Run every 5 minutes
         trigger = IntervalTrigger(minutes=5)
         scheduler.add_job(expire_stale_bookings, trigger, id="expire_bookings", replace_existing=True)
+        
+        if settings.AVAILABILITY_INDEX_ENABLED:
+            index_trigger = IntervalTrigger(minutes=settings.AVAILABILITY_INDEX_REFRESH_MINUTES)
+            scheduler.add_job(refresh_availability_index, index_trigger, id="refresh_availability_index", replace_existing=True)
+
+        if settings.RATE_INDEX_ENABLED:
+            rate_trigger = IntervalTrigger(minutes=settings.RATE_INDEX_REFRESH_MINUTES)
+            scheduler.add_job(refresh_rate_index, rate_trigger, id="refresh_rate_index", replace_existing=True)
+
+        if settings.REVENUE_ROLLUP_VERIFY_MINUTES > 0:
+            rollup_trigger = IntervalTrigger(minutes=settings.REVENUE_ROLLUP_VERIFY_MINUTES)
+            scheduler.add_job(verify_revenue_rollup, rollup_trigger, id="verify_revenue_rollup", replace_existing=True)
+
+        scheduler.add_job(purge_idempotency_keys, IntervalTrigger(hours=1), id="purge_idempotency_keys", replace_existing=True)
         scheduler.start()
         logger.info("Scheduler started. Job 'expire_bookings' active (5 min interval).")
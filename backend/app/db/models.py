@@ -1,10 +1,31 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum as SQLEnum, Date, DateTime, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Enum as SQLEnum, Date, DateTime, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.core.database import Base
+from app.core import money
+from app.core.pagination import search_key
 from app.domain.models import BookingPolicy
 import enum
 from datetime import date, datetime
 
+
+def cents_view(cents_column: str) -> hybrid_property:
+    """
+    Major-units (COP) float view of an integer cents column, for the JSON edge and
+    old callers. NULL stays None. Works in queries too (column / 100).
+    """
+    def fget(self):
+        cents = getattr(self, cents_column)
+        return None if cents is None else money.from_cents(cents)
+
+    def fset(self, value):
+        setattr(self, cents_column, None if value is None else money.to_cents(value))
+
+    def expr(cls):
+        return getattr(cls, cents_column) / float(money.CENTS)
+
+    return hybrid_property(fget, fset, expr=expr)
+
 class BookingStatus(str, enum.Enum):
     PENDING = "PENDING"
     CONFIRMED = "CONFIRMED"
@@ -29,6 +50,15 @@ class PaymentType(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Covers the availability range query (equality columns first, then the range)
+        Index("ix_bookings_availability", "property_id", "status", "check_in", "check_out"),
+        # Admin list filters: equality column + id, so the keyset page (id DESC) is a range scan
+        Index("ix_bookings_status_id", "status", "id"),
+        Index("ix_bookings_policy_id", "policy_type", "id"),
+        Index("ix_bookings_admin_id", "created_by_admin_id", "id"),
+        Index("ix_bookings_override_id", "is_override", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
@@ -44,6 +74,9 @@ class Booking(Base):
     guest_email = Column(String, nullable=True)
     guest_phone = Column(String, nullable=True) # WhatsApp
     guest_city = Column(String, nullable=True)
+    # Casefolded guest_name / guest_email for the admin search, set with them (_set_search_key)
+    guest_name_key = Column(String, nullable=True)
+    guest_email_key = Column(String, nullable=True)
     
     policy_type = Column(SQLEnum(BookingPolicy), nullable=False)
     
@@ -57,10 +90,32 @@ class Booking(Base):
     rules_bypassed = Column(String, nullable=True) # Checkbox list or text
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     override_created_at = Column(Date, nullable=True) # Timestamp of override
-    manual_total_amount = Column(Float, nullable=True) # Override price
+    review_reason = Column(String, nullable=True) # Set when an admin must handle it by hand (e.g. paid after its dates were taken)
+    manual_total_cents = Column(Integer, nullable=True) # Override price (core/money.py minor units)
+
+    # Price stored at creation (PricingService.booking_totals), read as-is by admin lists / KPIs
+    subtotal_cents = Column(Integer, nullable=True)
+    cleaning_fee_cents = Column(Integer, nullable=True)
+    total_cents = Column(Integer, nullable=True)
+    pricing_version = Column(Integer, nullable=True) # PricingService.PRICING_VERSION used
+
+    manual_total_amount = cents_view("manual_total_cents")
+    subtotal = cents_view("subtotal_cents")
+    cleaning_fee = cents_view("cleaning_fee_cents")
+    total_amount = cents_view("total_cents")
     
     property = relationship("Property", back_populates="bookings")
 
+    @validates("guest_name", "guest_email")
+    def _set_search_key(self, key, value):
+        setattr(self, f"{key}_key", search_key(value))
+        return value
+
+# Admin list guest search (q): prefix ranges on the casefolded keys and the phone
+Index("ix_bookings_guest_name_key", Booking.guest_name_key)
+Index("ix_bookings_guest_email_key", Booking.guest_email_key)
+Index("ix_bookings_guest_phone", Booking.guest_phone)
+
 class User(Base):
     __tablename__ = "users"
 
@@ -104,7 +159,7 @@ class Payment(Base):
     transaction_id = Column(String, index=True, nullable=True) # Provider's ID or Bank Ref
     payment_reference = Column(String, nullable=True) # Manual reference code
     
-    amount = Column(Integer, nullable=False)
+    amount_cents = Column(Integer, nullable=False) # Minor units (core/money.py)
     currency = Column(String, default="COP")
     status = Column(SQLEnum(PaymentStatus), default=PaymentStatus.PENDING_PAYMENT, index=True)
     payload = Column(String, nullable=True)
@@ -119,6 +174,20 @@ class Payment(Base):
     
     booking = relationship("Booking", back_populates="payments")
 
+    @hybrid_property
+    def amount(self) -> float:
+        """Major units (COP). Reads / writes go through amount_cents."""
+        return money.from_cents(self.amount_cents)
+
+    @amount.inplace.setter
+    def _amount_setter(self, value):
+        self.amount_cents = money.to_cents(value)
+
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return cls.amount_cents / float(money.CENTS)
+
 # Update Booking to include Audit fields
 # Note: modifying existing Booking class definitions requiring re-declaring it or using alter if this was a migration script.
 # Since we are simple file replacement, we assume we can edit the Booking class above. 
@@ -172,3 +241,80 @@ class Holiday(Base):
     date = Column(Date, unique=True, nullable=False, index=True)
     name = Column(String, nullable=True)
 
+
+class NightSlot(str, enum.Enum):
+    AM = "AM" # Until 1pm (check-out morning / Day Pass)
+    PM = "PM" # From 1pm (check-in afternoon / Day Pass)
+
+class BookingNight(Base):
+    """
+    Occupancy ledger: one row per half-day held by an active booking.
+    The unique key makes the database itself reject overlapping bookings.
+    - Night [D, D+n): PM of D, AM+PM of the days in between, AM of D+n.
+    - Day Pass [D, D]: AM and PM of D.
+    """
+    __tablename__ = "booking_nights"
+    __table_args__ = (
+        UniqueConstraint("property_id", "night", "slot", name="uq_booking_nights_property_night_slot"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id"), nullable=False, index=True)
+    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
+    night = Column(Date, nullable=False)
+    slot = Column(SQLEnum(NightSlot), nullable=False)
+
+
+class IdempotencyKey(Base):
+    """
+    Stored response of a request sent with an Idempotency-Key header.
+    status_code / response are NULL while the first request is still running.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(String, nullable=True) # JSON body
+    created_at = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class RatePlan(Base):
+    """
+    Per-person (per-night) rate of a policy for [valid_from, valid_to], both inclusive.
+    valid_to NULL = open ended. Where plans overlap, the one starting later wins.
+    Dates with no plan fall back to the PricingService constants.
+    """
+    __tablename__ = "rate_plans"
+    __table_args__ = (
+        Index("ix_rate_plans_policy_from", "policy_type", "valid_from"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    policy_type = Column(SQLEnum(BookingPolicy), nullable=False)
+    rate = Column(Integer, nullable=False) # COP
+    valid_from = Column(Date, nullable=False)
+    valid_to = Column(Date, nullable=True)
+    name = Column(String, nullable=True) # e.g. "Temporada alta 2030"
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class RevenueDaily(Base):
+    """
+    Daily revenue rollup: one row per (day, plan, method, channel) with the sum of
+    the revenue payments (CONFIRMED booking, PAID / CONFIRMED_DIRECT_PAYMENT)
+    confirmed that day. Maintained by services/revenue_rollup.py.
+    """
+    __tablename__ = "revenue_daily"
+    __table_args__ = (
+        UniqueConstraint("day", "policy_type", "payment_method", "channel", name="uq_revenue_daily_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False) # Payment.confirmed_at
+    policy_type = Column(SQLEnum(BookingPolicy), nullable=False)
+    payment_method = Column(SQLEnum(PaymentMethod), nullable=False)
+    channel = Column(String, nullable=False) # online | admin
+    amount_cents = Column(Integer, nullable=False, default=0)
+    payments = Column(Integer, nullable=False, default=0)
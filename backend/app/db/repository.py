@@ -1,86 +1,216 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from datetime import date, datetime
-from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Tuple
 
-from app.db.models import Booking, BookingStatus, Property
+from app.db.models import Booking, BookingStatus, BookingNight, NightSlot
+from app.core.exceptions import OverbookingError
 
 class BookingRepository:
+    # Statuses that hold inventory (CANCELLED / EXPIRED release the dates)
+    ACTIVE_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.BLOCKED, BookingStatus.PENDING, BookingStatus.COMPLETED]
+
     def __init__(self, db: Session):
         self.db = db
 
-    def lock_property(self, property_id: int):
-        """
-        Locks the property row for the duration of the transaction.
-        Prevents race conditions (Double Booking) by serializing checks per property.
-        """
-        # with_for_update() locks the selected row(s)
-        self.db.query(Property).filter(Property.id == property_id).with_for_update().first()
-
     def check_availability(self, property_id: int, start: date, end: date) -> bool:
         """
         Checks if the property is free for the given range.
         Handles Day Pass (start==end) and Nightly (start!=end) logic correctly.
         """
         # 1. Fetch potential conflicts (Inclusive Query)
-        # We fetch anything that touches the dates [start, end]
-        # Ignore PENDING bookings that are expired
-        now = datetime.now()
-        
-        candidates = self.db.query(Booking).filter(
+        # We fetch anything that touches the dates [start, end].
+        # Only the 4 columns the rule needs; expired PENDING holds are dropped in SQL.
+        # Served by ix_bookings_availability (property_id, status, check_in, check_out).
+        candidates = self.db.query(
+            Booking.check_in,
+            Booking.check_out,
+            Booking.status,
+            Booking.expires_at
+        ).filter(
             Booking.property_id == property_id,
-            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.BLOCKED, BookingStatus.PENDING, BookingStatus.COMPLETED]),
             Booking.check_in <= end,
-            Booking.check_out >= start
+            Booking.check_out >= start,
+            *BookingRepository._active_filters(datetime.now())
         ).all()
-        
-        # Filter out Expired Pending Bookings in Python (easier than complex SQL with nullable)
-        active_candidates = []
-        for b in candidates:
-            if b.status == BookingStatus.PENDING and b.expires_at and b.expires_at < now:
-                continue # Expired, treat as free
-            active_candidates.append(b)
-            
-        candidates = active_candidates
-
-        is_request_day_pass = (start == end)
 
         for booking in candidates:
-            is_existing_day_pass = (booking.check_in == booking.check_out)
-            
-            # Case A: Day Pass Involved (Strict Overlap)
-            # If either is a Day Pass, they cannot touch at all on the same day.
-            # Day Pass [D,D] occupies D fully (8am-5pm).
-            # Night [D-1, D] occupies D fully (until 1pm). Overlap!
-            # Night [D, D+1] occupies D fully (from 1pm). Overlap!
-            if is_request_day_pass or is_existing_day_pass:
-                # Any date intersection is a conflict
-                # Range Logic: [A, B] overlaps [C, D] if A<=D and B>=C.
-                # Since we queried exactly this, ANY candidate is a conflict?
-                # Let's double check.
-                # Req Day Pass [10,10]. Ex Night [9,10].
-                # 10<=10 and 10>=9. Match. Conflict. Correct.
-                # Req Day Pass [10,10]. Ex Night [10,11].
-                # 10<=11 and 10>=10. Match. Conflict. Correct.
-                # Yes, if Day Pass is involved, the inclusive query IS the conflict.
-                return False
-
-            # Case B: Night vs Night (Standard logic)
-            # [10,11] vs [11,12]. 
-            # 10<=12, 11>=11. Match in query.
-            # But standard night-to-night allows touch points.
-            # Conflict only if STRICT overlap (Start < End AND End > Start)
-            if booking.check_in < end and booking.check_out > start:
+            if BookingRepository.ranges_conflict(start, end, booking.check_in, booking.check_out):
                 return False
                 
         return True
 
-    def create_booking(self, booking_data: dict) -> Booking:
+    @staticmethod
+    def _active_filters(now: datetime) -> tuple:
+        """SQL filters for bookings holding inventory: active status and not an expired PENDING hold."""
+        return (
+            Booking.status.in_(BookingRepository.ACTIVE_STATUSES),
+            or_(
+                Booking.status != BookingStatus.PENDING,
+                Booking.expires_at.is_(None),
+                Booking.expires_at >= now
+            )
+        )
+
+    @staticmethod
+    def ranges_conflict(start: date, end: date, other_start: date, other_end: date) -> bool:
+        """
+        Overlap rule between a requested range and an existing stay.
+        Shared by the SQL path and the in-memory availability index.
+        """
+        # Inclusive touch check (same as the candidate query)
+        if other_start > end or other_end < start:
+            return False
+
+        # Case A: Day Pass Involved (Strict Overlap)
+        # If either is a Day Pass, they cannot touch at all on the same day.
+        # Day Pass [D,D] occupies D fully (8am-5pm).
+        # Night [D-1, D] occupies D fully (until 1pm). Overlap!
+        # Night [D, D+1] occupies D fully (from 1pm). Overlap!
+        if start == end or other_start == other_end:
+            return True
+
+        # Case B: Night vs Night (Standard logic)
+        # [10,11] vs [11,12] touch but do not overlap.
+        # Conflict only if STRICT overlap (Start < End AND End > Start)
+        return other_start < end and other_end > start
+
+    def get_active_stays_in_range(self, property_id: int, start: date, end: date) -> list:
+        """
+        Returns (id, check_in, check_out, status) for every active booking touching [start, end].
+        Single range query: used by the calendar endpoint to avoid one check per day.
+        Expired PENDING holds are excluded in SQL.
+        """
+        return self.db.query(
+            Booking.id,
+            Booking.check_in,
+            Booking.check_out,
+            Booking.status
+        ).filter(
+            Booking.property_id == property_id,
+            Booking.check_in <= end,
+            Booking.check_out >= start,
+            *BookingRepository._active_filters(datetime.now())
+        ).order_by(Booking.check_in).all()
+
+    def get_active_stays_since(self, since: date) -> list:
+        """
+        Returns every active booking (all properties) ending on/after `since`.
+        Used to (re)build the in-memory availability index.
+        """
+        return self.db.query(
+            Booking.id,
+            Booking.property_id,
+            Booking.check_in,
+            Booking.check_out,
+            Booking.status,
+            Booking.expires_at
+        ).filter(
+            Booking.status.in_(BookingRepository.ACTIVE_STATUSES),
+            Booking.check_out >= since
+        ).all()
+
+    def create_booking(self, booking_data: dict, commit: bool = True) -> Booking:
+        """
+        Inserts the booking and its night ledger rows in the same transaction.
+        Raises OverbookingError if another transaction already holds any of the slots.
+        With commit=False the rows are only flushed: the caller adds the rest of its
+        unit of work (e.g. the Payment) and calls commit() once.
+        """
         db_booking = Booking(**booking_data)
         self.db.add(db_booking)
-        self.db.commit()
+        self.db.flush() # Assigns the ID for the ledger rows
+        self.sync_nights(db_booking)
+        if not commit:
+            return db_booking
+        self.commit()
         self.db.refresh(db_booking)
         return db_booking
+
+    # ---------- Night Ledger ----------
+
+    @staticmethod
+    def night_slots(check_in: date, check_out: date) -> List[Tuple[date, NightSlot]]:
+        """Half-day slots held by a stay (see BookingNight)."""
+        if check_in == check_out:
+            return [(check_in, NightSlot.AM), (check_in, NightSlot.PM)]
+
+        slots = [(check_in, NightSlot.PM)]
+        current = check_in + timedelta(days=1)
+        while current < check_out:
+            slots.append((current, NightSlot.AM))
+            slots.append((current, NightSlot.PM))
+            current += timedelta(days=1)
+        slots.append((check_out, NightSlot.AM))
+        return slots
+
+    def sync_nights(self, booking: Booking):
+        """
+        Aligns the ledger with the booking (call after any status or date change).
+        Active statuses hold exactly the slots of their dates; CANCELLED / EXPIRED release them.
+        Conflicts surface when the transaction is flushed (see commit()).
+        """
+        if booking.status not in BookingRepository.ACTIVE_STATUSES:
+            self.release_nights([booking.id])
+            return
+
+        # Diff against the stored slots, so changed dates / property free the old nights
+        expected = {
+            (booking.property_id, night, slot)
+            for night, slot in BookingRepository.night_slots(booking.check_in, booking.check_out)
+        }
+        held = self.db.query(
+            BookingNight.id, BookingNight.property_id, BookingNight.night, BookingNight.slot
+        ).filter(BookingNight.booking_id == booking.id).all()
+
+        stale = [row.id for row in held if (row.property_id, row.night, row.slot) not in expected]
+        if stale:
+            self.db.query(BookingNight).filter(BookingNight.id.in_(stale)).delete(synchronize_session=False)
+
+        missing = expected - {(row.property_id, row.night, row.slot) for row in held}
+        self.db.add_all([
+            BookingNight(booking_id=booking.id, property_id=property_id, night=night, slot=slot)
+            for property_id, night, slot in sorted(missing)
+        ])
+
+    def release_nights(self, booking_ids: List[int]):
+        if not booking_ids:
+            return
+        self.db.query(BookingNight).filter(
+            BookingNight.booking_id.in_(booking_ids)
+        ).delete(synchronize_session=False)
+
+    def release_expired_holds(self, property_id: int, start: date, end: date) -> int:
+        """
+        Expires PENDING holds past their deadline that touch [start, end] and frees their slots,
+        so a new booking is not rejected by a hold the scheduler has not swept yet.
+        """
+        expired = self.db.query(Booking).filter(
+            Booking.property_id == property_id,
+            Booking.status == BookingStatus.PENDING,
+            Booking.expires_at < datetime.now(),
+            Booking.check_in <= end,
+            Booking.check_out >= start
+        ).all()
+
+        for booking in expired:
+            booking.status = BookingStatus.EXPIRED
+        self.release_nights([b.id for b in expired])
+        return len(expired)
+
+    def commit(self):
+        """
+        Commits the unit of work. A duplicate (property, night, slot) in the ledger means
+        another transaction took the dates first: surfaced as OverbookingError.
+        """
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if "booking_nights" in str(e.orig):
+                raise OverbookingError("Las fechas seleccionadas no están disponibles. Por favor elige otra fecha.")
+            raise
     
 
     def get_booking(self, booking_id: int) -> Optional[Booking]:
@@ -94,11 +224,20 @@ class BookingRepository:
         ).all()
         return [h.date for h in holidays]
 
+    def get_holiday_entries(self, start: date, end: date) -> List[Tuple[date, Optional[str]]]:
+        from app.db.models import Holiday
+        return self.db.query(Holiday.date, Holiday.name).filter(
+            Holiday.date >= start,
+            Holiday.date <= end
+        ).all()
+
     def add_holiday(self, date_obj: date, name: str = None):
         from app.db.models import Holiday
+        from app.services.holiday_cache import holiday_cache
         # Check existence to avoid duplicate error unique constraint
         existing = self.db.query(Holiday).filter(Holiday.date == date_obj).first()
         if not existing:
             holiday = Holiday(date=date_obj, name=name)
             self.db.add(holiday)
             self.db.commit()
+            holiday_cache.invalidate(date_obj.year)
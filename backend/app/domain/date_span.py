@@ -0,0 +1,75 @@
+"""
+Date-span classification (pure domain logic, no DB).
+
+A stay's nights are summarised as a 7-bit weekday mask (bit 0 = Monday ...
+bit 6 = Sunday) computed in O(1) from the check-in weekday and the number of
+nights, instead of materialising a list of dates and calling weekday() per day.
+Rules and pricing test the whole span with one bitwise operation.
+"""
+
+from datetime import date
+from typing import Any, Dict, NamedTuple, Tuple
+
+ALL_DAYS = 0b1111111
+MON_THU = 0b0001111   # Weekday plan nights
+FRI_SAT = 0b0110000   # Weekend plan nights
+FRI_SUN = 0b1110000   # Nights priced as weekend
+
+
+def weekday_mask(check_in: date, check_out: date) -> int:
+    """Weekdays present among the nights [check_in, check_out)."""
+    return _mask(check_in, (check_out - check_in).days)
+
+
+def _mask(check_in: date, nights: int) -> int:
+    if nights <= 0:
+        return 0
+    if nights >= 7:
+        return ALL_DAYS
+    # `nights` consecutive bits starting at the check-in weekday, wrapped around Sunday
+    mask = ((1 << nights) - 1) << check_in.weekday()
+    return (mask | (mask >> 7)) & ALL_DAYS
+
+
+class DateSpan(NamedTuple):
+    check_in: date
+    check_out: date
+    nights: int
+    weekday_mask: int
+    holidays_in_range: Tuple[date, ...]
+    has_holiday_in_window: bool
+
+    @property
+    def has_holiday(self) -> bool:
+        return len(self.holidays_in_range) > 0
+
+    def only_on(self, allowed_mask: int) -> bool:
+        """True if every night falls on an allowed weekday."""
+        return self.weekday_mask & ~allowed_mask == 0
+
+    def includes_any(self, mask: int) -> bool:
+        return self.weekday_mask & mask != 0
+
+
+def classify(check_in: date, check_out: date, context: Dict[str, Any] = None) -> DateSpan:
+    """
+    Weekday / holiday / window flags for a stay.
+    `context` is the holiday context from CalendarService.check_holiday_window.
+    """
+    nights = (check_out - check_in).days
+    if nights < 0:
+        nights = 0
+    if not context:
+        holidays, in_window = (), False
+    else:
+        holidays = context.get("holidays_in_range") or ()
+        in_window = bool(context.get("has_holiday_in_window", False))
+    # Positional construction: this runs once per rule evaluation / quote
+    return DateSpan(
+        check_in,
+        check_out,
+        nights,
+        _mask(check_in, nights),
+        holidays if type(holidays) is tuple else tuple(holidays),
+        in_window
+    )
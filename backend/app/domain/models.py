@@ -9,6 +9,14 @@ class BookingPolicy(str, Enum):
     FAMILY_PLAN = "family_plan"
     DAY_PASS = "day_pass"
 
+class DayStatus(str, Enum):
+    """Occupancy of a single calendar day, as shown in the availability calendar."""
+    FREE = "free"
+    NIGHT_OCCUPIED = "night_occupied"
+    DAY_PASS_OCCUPIED = "day_pass_occupied"
+    BLOCKED = "blocked"
+    PENDING_HOLD = "pending_hold"
+
 class BookingRequest(BaseModel):
     check_in: date
     check_out: date
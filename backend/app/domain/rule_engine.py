@@ -0,0 +1,133 @@
+"""
+Compiled Booking Rule Engine
+
+Rules are declared once per BookingPolicy as (rule_name, message, predicate)
+and compiled into a flat tuple per policy (common rules first). evaluate()
+builds one shared context (DateSpan from domain/date_span.py + holiday
+context) and runs every predicate in a single pass, returning ALL violations
+in declaration order. The first one is what validate_* used to raise.
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from app.core.exceptions import RuleViolationError
+from app.domain import date_span
+from app.domain.date_span import DateSpan
+from app.domain.models import BookingRequest, BookingPolicy
+
+
+class RuleContext(NamedTuple):
+    request: BookingRequest
+    span: DateSpan
+    today: date
+
+
+class Rule(NamedTuple):
+    rule_name: str
+    message: str
+    # True when the request satisfies the rule
+    check: Callable[[RuleContext], bool]
+
+
+class Violation(NamedTuple):
+    rule_name: str
+    message: str
+
+    def to_error(self) -> RuleViolationError:
+        return RuleViolationError(self.message, rule_name=self.rule_name)
+
+
+MIN_GROUP_GUESTS = 10
+MAX_FAMILY_GUESTS = 5
+
+# ---------- Declarations ----------
+
+COMMON_RULES: Tuple[Rule, ...] = (
+    Rule("PAST_DATE_NOT_ALLOWED", "No puedes reservar fechas pasadas.",
+         lambda c: c.request.check_in >= c.today),
+)
+
+NIGHTLY_RULES: Tuple[Rule, ...] = (
+    Rule("MIN_NIGHTS_REQUIRED", "La fecha de salida debe ser posterior a la de llegada.",
+         lambda c: c.span.nights > 0),
+)
+
+_MIN_PEOPLE = Rule("MIN_PEOPLE_NOT_MET", "La Finca Completa requiere un mínimo de 10 personas para este plan.",
+                   lambda c: c.request.guest_count >= MIN_GROUP_GUESTS)
+
+POLICY_RULES: Dict[BookingPolicy, Tuple[Rule, ...]] = {
+    BookingPolicy.FULL_PROPERTY_WEEKDAY: (
+        _MIN_PEOPLE,
+        Rule("INVALID_WEEKDAY_DATES", "Este plan solo se puede reservar de lunes a jueves.",
+             lambda c: c.span.only_on(date_span.MON_THU)),
+        Rule("PLAN_NOT_ALLOWED_ON_HOLIDAY", "Este plan no está permitido en fechas festivas.",
+             lambda c: not c.span.has_holiday),
+    ),
+    BookingPolicy.FULL_PROPERTY_WEEKEND: (
+        _MIN_PEOPLE,
+        Rule("INVALID_WEEKEND_DATES", "Este plan requiere reservar fines de semana (viernes a domingo).",
+             lambda c: c.span.only_on(date_span.FRI_SAT)),
+        Rule("PLAN_NOT_ALLOWED_ON_HOLIDAY", "Este plan no está permitido en fechas festivas.",
+             lambda c: not c.span.has_holiday),
+    ),
+    BookingPolicy.FULL_PROPERTY_HOLIDAY: (
+        _MIN_PEOPLE,
+        Rule("HOLIDAY_REQUIRED", "Este plan requiere un fin de semana con festivo.",
+             lambda c: c.span.has_holiday_in_window),
+    ),
+    BookingPolicy.FAMILY_PLAN: (
+        Rule("FAMILY_PLAN_LIMIT_EXCEEDED", "El Plan Familia es válido solo para máximo 5 personas.",
+             lambda c: c.request.guest_count <= MAX_FAMILY_GUESTS),
+        Rule("FAMILY_PLAN_ONE_NIGHT", "El Plan Familia es para exactamente 1 noche.",
+             lambda c: (c.request.check_out - c.request.check_in).days == 1),
+        Rule("PLAN_NOT_ALLOWED_ON_HOLIDAY", "El Plan Familia no aplica en festivos.",
+             lambda c: not c.span.has_holiday),
+    ),
+    BookingPolicy.DAY_PASS: (
+        Rule("DAY_PASS_INVALID_RANGE", "El plan Pasadía es de un solo día (Llegada = Salida).",
+             lambda c: c.request.check_in == c.request.check_out),
+    ),
+}
+
+# ---------- Compilation ----------
+
+def _compile() -> Dict[BookingPolicy, Tuple[Rule, ...]]:
+    compiled = {}
+    for policy, rules in POLICY_RULES.items():
+        common = COMMON_RULES if policy == BookingPolicy.DAY_PASS else COMMON_RULES + NIGHTLY_RULES
+        compiled[policy] = common + rules
+    return compiled
+
+COMPILED_RULES = _compile()
+
+# ---------- Evaluation ----------
+
+def build_context(request: BookingRequest, holiday_context: Dict[str, Any] = None,
+                  today: date = None) -> RuleContext:
+    return RuleContext(
+        request,
+        date_span.classify(request.check_in, request.check_out, holiday_context),
+        today or date.today()
+    )
+
+def evaluate_rules(rules: Tuple[Rule, ...], context: RuleContext) -> List[Violation]:
+    return [Violation(r.rule_name, r.message) for r in rules if not r.check(context)]
+
+def evaluate(request: BookingRequest, holiday_context: Dict[str, Any] = None,
+             today: date = None) -> List[Violation]:
+    """
+    Every rule the request breaks for its policy, in declaration order (empty = valid).
+    Callers evaluating many requests in a loop can pass `today` once.
+    """
+    # Context built inline: this is the per-request hot path (checkout, next-windows search)
+    context = RuleContext(
+        request,
+        date_span.classify(request.check_in, request.check_out, holiday_context),
+        today or date.today()
+    )
+    return [Violation(r.rule_name, r.message) for r in COMPILED_RULES[request.policy_type] if not r.check(context)]
+
+def raise_first(violations: List[Violation]):
+    if violations:
+        raise violations[0].to_error()
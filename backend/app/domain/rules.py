@@ -1,134 +1,52 @@
-from datetime import timedelta, date
-from typing import List, Set, Dict, Any
-from app.core.exceptions import RuleViolationError
+from typing import Dict, Any
 from app.domain.models import BookingRequest, BookingPolicy
+from app.domain import rule_engine
 
-def _get_date_range(start: date, end: date) -> List[date]:
-    """Yields dates between start (inclusive) and end (exclusive)."""
-    delta = (end - start).days
-    return [start + timedelta(days=i) for i in range(delta)]
+# Rule declarations live in domain/rule_engine.py (evaluated in one pass, all violations).
+# These helpers keep the raise-on-first-failure API per rule group.
 
 def validate_dates_common(request: BookingRequest):
     """
     Common validations for all booking requests.
     """
-    # 1. Block Past Dates
-    if request.check_in < date.today():
-        raise RuleViolationError(
-            "No puedes reservar fechas pasadas.",
-            rule_name="PAST_DATE_NOT_ALLOWED"
-        )
-    
-    # 2. Min Nights (Except Day Pass)
+    rules = rule_engine.COMMON_RULES
     if request.policy_type != BookingPolicy.DAY_PASS:
-        if request.check_out <= request.check_in:
-             raise RuleViolationError(
-                "La fecha de salida debe ser posterior a la de llegada.",
-                rule_name="MIN_NIGHTS_REQUIRED"
-            )
+        rules = rules + rule_engine.NIGHTLY_RULES
+    rule_engine.raise_first(rule_engine.evaluate_rules(rules, rule_engine.build_context(request)))
+
+def _validate_policy(policy: BookingPolicy, request: BookingRequest, context: Dict[str, Any] = None):
+    rule_engine.raise_first(rule_engine.evaluate_rules(
+        rule_engine.POLICY_RULES[policy], rule_engine.build_context(request, context)
+    ))
 
 def validate_day_pass(request: BookingRequest):
     """
     Day Pass: check_in == check_out (0 nights).
     """
-    if request.check_in != request.check_out:
-         raise RuleViolationError(
-            "El plan Pasadía es de un solo día (Llegada = Salida).",
-            rule_name="DAY_PASS_INVALID_RANGE"
-        )
+    _validate_policy(BookingPolicy.DAY_PASS, request)
 
 def validate_full_property_weekday(request: BookingRequest, context: Dict[str, Any]):
     """
     Mon-Thu only. No Holidays. Min 10 people.
     """
-    if request.guest_count < 10:
-        raise RuleViolationError(
-            f"La Finca Completa requiere un mínimo de 10 personas para este plan.",
-            rule_name="MIN_PEOPLE_NOT_MET"
-        )
-        
-    nights = _get_date_range(request.check_in, request.check_out)
-    for night in nights:
-        if night.weekday() not in [0, 1, 2, 3]: # Mon=0, Thu=3
-             raise RuleViolationError(
-                "Este plan solo se puede reservar de lunes a jueves.",
-                rule_name="INVALID_WEEKDAY_DATES"
-            )
-    
-    if context.get("holidays_in_range"):
-        raise RuleViolationError(
-            "Este plan no está permitido en fechas festivas.",
-            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
-        )
+    _validate_policy(BookingPolicy.FULL_PROPERTY_WEEKDAY, request, context)
 
 def validate_full_property_weekend(request: BookingRequest, context: Dict[str, Any]):
     """
     Fri-Sun (Standard Weekend). No Holidays. Min 10 people.
     Allowed nights: Friday night, Saturday night.
     """
-    if request.guest_count < 10:
-        raise RuleViolationError(
-            "La Finca Completa requiere un mínimo de 10 personas para este plan.",
-            rule_name="MIN_PEOPLE_NOT_MET"
-        )
-    
-    # Check that all nights fall within Friday/Saturday
-    nights = _get_date_range(request.check_in, request.check_out)
-    for night in nights:
-        if night.weekday() not in [4, 5]: 
-             raise RuleViolationError(
-                "Este plan requiere reservar fines de semana (viernes a domingo).",
-                rule_name="INVALID_WEEKEND_DATES"
-            )
-        
-    # Check for holidays
-    if context.get("holidays_in_range"):
-        raise RuleViolationError(
-            "Este plan no está permitido en fechas festivas.", 
-            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
-        )
+    _validate_policy(BookingPolicy.FULL_PROPERTY_WEEKEND, request, context)
 
 def validate_full_property_holiday(request: BookingRequest, context: Dict[str, Any]):
     """
     Weekend with Holiday. Min 10 people.
-    Must include a holiday or be attached to one.
-    Strictly checks if the context indicates a holiday window.
+    Must include a holiday or be attached to one (Thu-Mon window).
     """
-    if request.guest_count < 10:
-        raise RuleViolationError(
-            "La Finca Completa requiere un mínimo de 10 personas para este plan.",
-            rule_name="MIN_PEOPLE_NOT_MET"
-        )
-    
-    # Use the context flag which represents the "Window Logic" (Thu-Mon)
-    has_holiday_in_window = context.get("has_holiday_in_window", False)
-    
-    if not has_holiday_in_window:
-         raise RuleViolationError(
-            "Este plan requiere un fin de semana con festivo.",
-            rule_name="HOLIDAY_REQUIRED"
-        )
+    _validate_policy(BookingPolicy.FULL_PROPERTY_HOLIDAY, request, context)
 
 def validate_family_plan(request: BookingRequest, context: Dict[str, Any]):
     """
     Max 5 People. Exactly 1 Night. No Holidays.
     """
-    if request.guest_count > 5:
-        raise RuleViolationError(
-            "El Plan Familia es válido solo para máximo 5 personas.", 
-            rule_name="FAMILY_PLAN_LIMIT_EXCEEDED"
-        )
-        
-    duration = (request.check_out - request.check_in).days
-    if duration != 1:
-        raise RuleViolationError(
-            "El Plan Familia es para exactamente 1 noche.", 
-            rule_name="FAMILY_PLAN_ONE_NIGHT"
-        )
-        
-    if context.get("holidays_in_range"):
-        raise RuleViolationError(
-            "El Plan Familia no aplica en festivos.", 
-            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
-        )
-
+    _validate_policy(BookingPolicy.FAMILY_PLAN, request, context)
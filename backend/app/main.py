@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from app.api.routers import bookings, auth, admin, payments, finance
+from app.api.routers import bookings, auth, admin, payments, finance, pricing
 from app.api.v1.endpoints import calendar
 from app.core.database import engine, Base
 
@@ -23,13 +23,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Admin list pagination headers must be readable by the browser
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Capped"],
 )
 
+# Async handlers for the hot public endpoints go first so they shadow the sync ones
+if settings.ASYNC_DB_ENABLED:
+    from app.api.routers import public_async
+    app.include_router(public_async.router, tags=["public-async"])
+
 app.include_router(bookings.router, prefix="/bookings", tags=["bookings"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(admin.router, prefix="/admin", tags=["admin"])
 app.include_router(finance.router, prefix="/admin/finance", tags=["finance"])
 app.include_router(payments.router, prefix="/payments", tags=["payments"])
+app.include_router(pricing.router, prefix="/pricing", tags=["pricing"])
 app.include_router(calendar.router, prefix="/api/v1/calendar", tags=["calendar"])
 
 from app.api.routers import ops
@@ -91,6 +99,40 @@ from app.core.scheduler import start_scheduler
 @app.on_event("startup")
 @app.on_event("startup")
 async def startup_event():
+    if settings.AVAILABILITY_INDEX_ENABLED:
+        from app.core.database import SessionLocal
+        from app.services.availability_index import availability_index
+        availability_index.install()
+        db = SessionLocal()
+        try:
+            availability_index.rebuild(db)
+        finally:
+            db.close()
+
+    if settings.RATE_INDEX_ENABLED:
+        from app.core.database import SessionLocal
+        from app.services.rate_index import rate_index
+        rate_index.install()
+        db = SessionLocal()
+        try:
+            rate_index.rebuild(db)
+        finally:
+            db.close()
+
+    # revenue_daily rollup kept current on every flush (rebuilt if it does not match the payments)
+    from app.core.database import SessionLocal
+    from app.services.revenue_rollup import revenue_rollup
+    revenue_rollup.install()
+    db = SessionLocal()
+    try:
+        revenue_rollup.ensure_built(db)
+    finally:
+        db.close()
+
+    # Booking / payment commits drop the cached dashboard KPIs
+    from app.services.kpi_snapshot import kpi_snapshot
+    kpi_snapshot.install()
+
     if settings.ENABLE_INTERNAL_SCHEDULER:
         start_scheduler()
     else:
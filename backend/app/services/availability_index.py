@@ -0,0 +1,161 @@
+"""
+In-process Availability Index
+
+Per-property sorted arrays of active stays, so public availability checks
+are answered with a bisect instead of a SQL range query.
+
+Kept current by a full rebuild at startup (and on the scheduler, which picks up
+bookings written by other workers), plus a commit hook (core/commit_hooks.py)
+that patches in the stays of this process's committed Booking writes.
+
+The index is an accelerator for read paths. Booking creation keeps checking
+availability against the database inside its transaction.
+"""
+
+import threading
+import logging
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.commit_hooks import CommitHook
+from app.db.models import Booking, BookingStatus
+from app.db.repository import BookingRepository
+
+logger = logging.getLogger("availability_index")
+
+IndexedStay = namedtuple("IndexedStay", ["id", "check_in", "check_out", "status", "expires_at"])
+
+
+class _PropertyStays:
+    """Stays of a single property, sorted by (check_in, id)."""
+
+    def __init__(self):
+        self.keys: List[tuple] = []
+        self.stays: List[IndexedStay] = []
+        self.by_id: Dict[int, IndexedStay] = {}
+        # Longest stay seen: bounds how far back a conflicting check_in can be
+        self.max_span = timedelta(0)
+
+    def upsert(self, stay: IndexedStay):
+        self.remove(stay.id)
+        key = (stay.check_in, stay.id)
+        pos = bisect_left(self.keys, key)
+        self.keys.insert(pos, key)
+        self.stays.insert(pos, stay)
+        self.by_id[stay.id] = stay
+        self.max_span = max(self.max_span, stay.check_out - stay.check_in)
+
+    def remove(self, booking_id: int):
+        stay = self.by_id.pop(booking_id, None)
+        if stay is None:
+            return
+        pos = bisect_left(self.keys, (stay.check_in, stay.id))
+        del self.keys[pos]
+        del self.stays[pos]
+
+    def touching(self, start: date, end: date, now: datetime) -> List[IndexedStay]:
+        """Active stays touching [start, end] (inclusive), expired holds skipped."""
+        lo = bisect_left(self.keys, (start - self.max_span,))
+        hi = bisect_right(self.keys, (end, float("inf")))
+        result = []
+        for stay in self.stays[lo:hi]:
+            if stay.check_out < start:
+                continue
+            if stay.status == BookingStatus.PENDING and stay.expires_at and stay.expires_at < now:
+                continue
+            result.append(stay)
+        return result
+
+
+class AvailabilityIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._properties: Dict[int, _PropertyStays] = {}
+        # First day covered by the index (older stays are not loaded)
+        self.horizon: Optional[date] = None
+        self.ready = False
+        self._hook = CommitHook("availability_index_changes", [Booking], self._collect, on_commit=self._on_commit)
+
+    # ---------- Build / Maintenance ----------
+
+    def rebuild(self, db: Session):
+        """Loads every active stay ending from yesterday on. One query."""
+        horizon = date.today() - timedelta(days=1)
+        rows = BookingRepository(db).get_active_stays_since(horizon)
+
+        properties: Dict[int, _PropertyStays] = {}
+        for row in rows:
+            properties.setdefault(row.property_id, _PropertyStays()).upsert(
+                IndexedStay(row.id, row.check_in, row.check_out, row.status, row.expires_at)
+            )
+
+        with self._lock:
+            self._properties = properties
+            self.horizon = horizon
+            self.ready = True
+
+        logger.info(f"Availability index rebuilt: {len(rows)} active stays")
+
+    def apply(self, property_id: int, stay: IndexedStay):
+        with self._lock:
+            stays = self._properties.setdefault(property_id, _PropertyStays())
+            if stay.status in BookingRepository.ACTIVE_STATUSES:
+                stays.upsert(stay)
+            else:
+                stays.remove(stay.id)
+
+    def discard(self, property_id: int, booking_id: int):
+        with self._lock:
+            stays = self._properties.get(property_id)
+            if stays:
+                stays.remove(booking_id)
+
+    # ---------- Queries ----------
+
+    def covers(self, start: date) -> bool:
+        return self.ready and start >= self.horizon
+
+    def stays_in_range(self, property_id: int, start: date, end: date) -> List[IndexedStay]:
+        now = datetime.now()
+        with self._lock:
+            stays = self._properties.get(property_id)
+            return stays.touching(start, end, now) if stays else []
+
+    def is_available(self, property_id: int, start: date, end: date) -> bool:
+        for stay in self.stays_in_range(property_id, start, end):
+            if BookingRepository.ranges_conflict(start, end, stay.check_in, stay.check_out):
+                return False
+        return True
+
+    # ---------- ORM Hooks ----------
+
+    def install(self):
+        """Registers the ORM listeners that keep the index coherent. Idempotent."""
+        self._hook.install()
+
+    def uninstall(self):
+        self._hook.uninstall()
+
+    def _collect(self, kind: str, target: Booking):
+        if not self.ready:
+            return None
+        if kind == "delete":
+            return ("delete", target.property_id, target.id)
+        return ("upsert", target.property_id, IndexedStay(
+            target.id, target.check_in, target.check_out, target.status, target.expires_at
+        ))
+
+    def _on_commit(self, session: Session, changes: list):
+        for op, property_id, payload in changes:
+            if op == "upsert":
+                self.apply(property_id, payload)
+            else:
+                self.discard(property_id, payload)
+
+
+# Process-wide instance
+availability_index = AvailabilityIndex()
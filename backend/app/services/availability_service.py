@@ -0,0 +1,225 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Dict, Any, List, Tuple
+from app.db.repository import BookingRepository
+from app.db.models import BookingStatus
+from app.domain.models import DayStatus, BookingPolicy, BookingRequest
+from app.domain import rule_engine
+from app.services.availability_index import availability_index
+from app.services.calendar_service import CalendarService
+
+# Priority used when several bookings touch the same half-day (highest wins)
+_PRIORITY = {
+    DayStatus.FREE: 0,
+    DayStatus.PENDING_HOLD: 1,
+    DayStatus.DAY_PASS_OCCUPIED: 2,
+    DayStatus.NIGHT_OCCUPIED: 3,
+    DayStatus.BLOCKED: 4,
+}
+_BY_PRIORITY = {v: k for k, v in _PRIORITY.items()}
+
+
+class AvailabilityService:
+    # Max range served by the calendar endpoint (12 months, leap-year safe)
+    MAX_CALENDAR_DAYS = 366
+
+    @staticmethod
+    def classify_stay(check_in: date, check_out: date, status: BookingStatus) -> DayStatus:
+        """Maps a booking to the status it paints on the calendar."""
+        if status == BookingStatus.BLOCKED:
+            return DayStatus.BLOCKED
+        if status == BookingStatus.PENDING:
+            return DayStatus.PENDING_HOLD
+        if check_in == check_out:
+            return DayStatus.DAY_PASS_OCCUPIED
+        return DayStatus.NIGHT_OCCUPIED
+
+    @staticmethod
+    def get_stays(repo: BookingRepository, property_id: int, start: date, end: date) -> list:
+        """
+        Active stays touching [start, end].
+        Served from the in-memory index when it covers the range, else one SQL query.
+        """
+        if availability_index.covers(start):
+            return availability_index.stays_in_range(property_id, start, end)
+        return repo.get_active_stays_in_range(property_id, start, end)
+
+    @staticmethod
+    def is_available(repo: BookingRepository, property_id: int, start: date, end: date) -> bool:
+        """Read-path availability check (public site). Booking creation uses the DB check."""
+        if availability_index.covers(start):
+            return availability_index.is_available(property_id, start, end)
+        return repo.check_availability(property_id, start, end)
+
+    @staticmethod
+    def check_many(repo: BookingRepository, ranges: List[Tuple[int, date, date]]) -> List[bool]:
+        """
+        Availability for many (property_id, check_in, check_out) ranges.
+        One stay lookup per property covering all its ranges, then each range
+        is resolved with a bisect over the sorted stays.
+        """
+        by_property: Dict[int, List[int]] = {}
+        for pos, (property_id, _, _) in enumerate(ranges):
+            by_property.setdefault(property_id, []).append(pos)
+
+        results = [True] * len(ranges)
+        for property_id, positions in by_property.items():
+            span_start = min(ranges[pos][1] for pos in positions)
+            span_end = max(ranges[pos][2] for pos in positions)
+
+            stays = sorted(
+                AvailabilityService.get_stays(repo, property_id, span_start, span_end),
+                key=lambda stay: stay.check_in
+            )
+            starts = [stay.check_in for stay in stays]
+            max_span = max((stay.check_out - stay.check_in for stay in stays), default=timedelta(0))
+
+            for pos in positions:
+                _, start, end = ranges[pos]
+                # Only stays with check_in in [start - longest stay, end] can touch the range
+                lo = bisect_left(starts, start - max_span)
+                hi = bisect_right(starts, end)
+                results[pos] = not any(
+                    BookingRepository.ranges_conflict(start, end, stay.check_in, stay.check_out)
+                    for stay in stays[lo:hi]
+                )
+
+        return results
+
+    @staticmethod
+    def _half_day_levels(repo: BookingRepository, property_id: int, start: date, total_days: int) -> Tuple[List[int], List[int]]:
+        """
+        AM / PM occupancy (priority level, 0 = free) for total_days + 1 days from start.
+        One extra day so the last night can check AM of the following morning.
+        """
+        am = [0] * (total_days + 1)
+        pm = [0] * (total_days + 1)
+
+        stays = AvailabilityService.get_stays(repo, property_id, start, start + timedelta(days=total_days))
+
+        for stay in stays:
+            level = _PRIORITY[AvailabilityService.classify_stay(stay.check_in, stay.check_out, stay.status)]
+            first = (stay.check_in - start).days
+            last = (stay.check_out - start).days
+
+            if first == last:
+                # Day Pass: both halves of the same day
+                if 0 <= first <= total_days:
+                    am[first] = max(am[first], level)
+                    pm[first] = max(pm[first], level)
+                continue
+
+            # Sweep the clipped interval once: PM of check-in ... AM of check-out
+            for offset in range(max(first, 0), min(last, total_days) + 1):
+                if offset > first:
+                    am[offset] = max(am[offset], level)
+                if offset < last:
+                    pm[offset] = max(pm[offset], level)
+
+        return am, pm
+
+    @staticmethod
+    def free_gaps(am: List[int], pm: List[int]) -> List[Tuple[int, int]]:
+        """
+        Maximal runs of free half-days as (first, last) inclusive indexes,
+        where half-day 2*d is AM of day d and 2*d + 1 is PM of day d.
+        """
+        gaps = []
+        gap_start = None
+        for half in range(2 * len(am)):
+            level = pm[half // 2] if half % 2 else am[half // 2]
+            if level == 0:
+                if gap_start is None:
+                    gap_start = half
+            elif gap_start is not None:
+                gaps.append((gap_start, half - 1))
+                gap_start = None
+        if gap_start is not None:
+            gaps.append((gap_start, 2 * len(am) - 1))
+        return gaps
+
+    @staticmethod
+    def next_windows(repo: BookingRepository, property_id: int, policy_type: BookingPolicy,
+                     nights: int, guests: int, start: date, limit: int,
+                     horizon_days: int = None) -> List[Dict[str, date]]:
+        """
+        First `limit` stays of `nights` nights (0 for Day Pass) from `start` on that are
+        free and pass the policy rules (domain/rule_engine.py + holiday window).
+
+        Occupancy is loaded once and turned into a free-gap list; only check-ins that
+        fit inside a gap are validated against the rules, with holidays fetched once.
+        """
+        horizon_days = horizon_days or AvailabilityService.MAX_CALENDAR_DAYS
+        start = max(start, date.today())
+        end = start + timedelta(days=horizon_days - 1)
+
+        # Slots needed by the stay, in half-days from AM of the check-in day
+        if nights == 0:
+            first_half, last_half = 0, 1  # Day Pass: AM + PM of the same day
+        else:
+            first_half, last_half = 1, 2 * nights  # PM of check-in ... AM of check-out
+
+        total_days = horizon_days + nights
+        am, pm = AvailabilityService._half_day_levels(repo, property_id, start, total_days)
+
+        # Holiday window can reach a few days beyond the stay on both sides
+        holidays = CalendarService.get_holidays_in_range(
+            repo, start - timedelta(days=7), end + timedelta(days=nights + 7)
+        )
+
+        today = date.today()
+        windows: List[Dict[str, date]] = []
+        for gap_start, gap_end in AvailabilityService.free_gaps(am, pm):
+            # Check-in offsets d with 2d + first_half >= gap_start and 2d + last_half <= gap_end
+            first_day = (gap_start - first_half + 1) // 2
+            last_day = min((gap_end - last_half) // 2, horizon_days - 1)
+
+            for offset in range(first_day, last_day + 1):
+                check_in = start + timedelta(days=offset)
+                check_out = check_in + timedelta(days=nights)
+                request = BookingRequest(
+                    check_in=check_in,
+                    check_out=check_out,
+                    guest_count=guests,
+                    policy_type=policy_type
+                )
+                if rule_engine.evaluate(request, CalendarService.holiday_window(check_in, check_out, holidays), today):
+                    continue
+
+                windows.append({"check_in": check_in, "check_out": check_out})
+                if len(windows) >= limit:
+                    return windows
+
+        return windows
+
+    @staticmethod
+    def build_calendar(repo: BookingRepository, property_id: int, start: date, end: date) -> Dict[str, Any]:
+        """
+        Per-day occupancy for [start, end] computed from ONE range lookup
+        (in-memory index, or a single SQL query as fallback).
+
+        Each day is split in two halves to keep Day Pass vs Nightly semantics:
+        - AM (until 1pm) and PM (from 1pm).
+        - Night [D, D+n) holds PM of D, both halves of the days in between, and AM of D+n.
+        - Day Pass [D, D] holds both halves of D (8am-5pm).
+        A night starting on D is free if PM(D) and AM(D+1) are free;
+        a Day Pass on D is free if both halves of D are free.
+        """
+        total_days = (end - start).days + 1
+        am, pm = AvailabilityService._half_day_levels(repo, property_id, start, total_days)
+
+        days: List[Dict[str, Any]] = []
+        for offset in range(total_days):
+            days.append({
+                "date": start + timedelta(days=offset),
+                "status": _BY_PRIORITY[pm[offset]],
+                "night_available": pm[offset] == 0 and am[offset + 1] == 0,
+                "day_pass_available": am[offset] == 0 and pm[offset] == 0,
+            })
+
+        return {
+            "property_id": property_id,
+            "from": start,
+            "to": end,
+            "days": days
+        }
@@ -1,9 +1,12 @@
-from app.domain.models import BookingRequest, BookingPolicy
-from app.domain import rules
+from typing import List
+from app.domain.models import BookingRequest
+from app.domain import rule_engine
 from app.db.repository import BookingRepository
+from app.core import money
 from app.core.exceptions import RuleViolationError, OverbookingError
 from datetime import date
 from app.services.calendar_service import CalendarService
+from app.services.pricing import PricingService
 
 class BookingService:
     def __init__(self, repo: BookingRepository = None):
@@ -12,38 +15,29 @@ class BookingService:
     def validate_request(self, request: BookingRequest) -> bool:
         """
         Validates the booking request against the selected policy rules (PURE DOMAIN LOGIC).
+        Raises RuleViolationError for the first rule that fails.
         """
+        rule_engine.raise_first(self.collect_violations(request))
+        return True
+
+    def collect_violations(self, request: BookingRequest) -> List[rule_engine.Violation]:
+        """Every commercial rule the request breaks (single pass, see domain/rule_engine.py)."""
         if not self.repo:
             raise Exception("Repository not initialized for validation")
 
-        # Common Validation (Past dates, min nights)
-        rules.validate_dates_common(request)
-        
         # Fetch holiday context (Single Source of Truth)
         # We use check_holiday_window to get the full context (Window + Range)
         holiday_context = CalendarService.check_holiday_window(self.repo, request.check_in, request.check_out)
 
-        if request.policy_type == BookingPolicy.FULL_PROPERTY_WEEKDAY:
-            rules.validate_full_property_weekday(request, holiday_context)
-            
-        elif request.policy_type == BookingPolicy.FULL_PROPERTY_WEEKEND:
-            rules.validate_full_property_weekend(request, holiday_context)
-            
-        elif request.policy_type == BookingPolicy.FULL_PROPERTY_HOLIDAY:
-            rules.validate_full_property_holiday(request, holiday_context)
-            
-        elif request.policy_type == BookingPolicy.FAMILY_PLAN:
-            rules.validate_family_plan(request, holiday_context)
-            
-        elif request.policy_type == BookingPolicy.DAY_PASS:
-            rules.validate_day_pass(request)
-        
-        return True
+        return rule_engine.evaluate(request, holiday_context)
 
     def create_booking(self, request: BookingRequest, property_id: int, 
                        is_override: bool = False, 
                        override_reason: str = None, 
-                       admin_id: int = None):
+                       admin_id: int = None,
+                       extra_fields: dict = None,
+                       commit: bool = True,
+                       pricing: dict = None):
         """
         Orchestrates booking creation with optional Admin Override.
         
@@ -53,6 +47,9 @@ class BookingService:
             is_override: If True, bypass commercial rules (but NOT availability).
             override_reason: Mandatory if is_override is True.
             admin_id: The ID of the admin creating the override.
+            extra_fields: Additional Booking columns (e.g. payment_type, expires_at).
+            commit: If False, the booking is flushed but the caller commits the transaction.
+            pricing: calculate_total() result if the caller already priced the request.
         """
         rules_bypassed = []
         
@@ -61,25 +58,26 @@ class BookingService:
              raise RuleViolationError("No puedes reservar fechas pasadas.", rule_name="PAST_DATE_NOT_ALLOWED")
 
         # 2. Domain Validation (Commercial Rules - Skippable)
-        try:
-            self.validate_request(request)
-        except RuleViolationError as e:
+        violations = self.collect_violations(request)
+        if violations:
             if is_override:
-                # If override is valid, Record the rule that WOULD have failed
-                rules_bypassed.append(f"{e.rule_name}: {str(e)}")
+                # If override is valid, Record every rule that WOULD have failed
+                rules_bypassed.extend(f"{v.rule_name}: {str(v.to_error())}" for v in violations)
             else:
                 # If no override, raise the error normally
-                raise e
+                rule_engine.raise_first(violations)
         
         # Additional checks can be added here and appended to rules_bypassed if overridden
         
         if not self.repo:
             raise Exception("Repository not initialized")
 
-        # 2. Lock Property to prevent Race Conditions (Double Booking)
-        self.repo.lock_property(property_id)
+        # 2. Free holds that timed out but were not swept yet (they still own ledger slots)
+        self.repo.release_expired_holds(property_id, request.check_in, request.check_out)
 
         # 3. Availability Check (PHYSICAL CONSTRAINT - CANNOT BE OVERRIDDEN)
+        # Fast rejection only: concurrent writers are stopped by the night ledger's
+        # unique key when the booking is persisted (raises OverbookingError).
         is_available = self.repo.check_availability(property_id, request.check_in, request.check_out)
         
         if not is_available:
@@ -92,6 +90,9 @@ class BookingService:
         # Remove fields not in Booking table
         if 'payment_method' in booking_data:
             del booking_data['payment_method']
+        # Stored as integer cents (core/money.py)
+        manual_total = booking_data.pop('manual_total_amount', None)
+        booking_data['manual_total_cents'] = money.to_cents(manual_total) if manual_total is not None else None
         
         # Add Override/Audit fields
         if is_override:
@@ -101,6 +102,19 @@ class BookingService:
             booking_data['created_by_admin_id'] = admin_id
             booking_data['created_by_admin_id'] = admin_id
             booking_data['override_created_at'] = date.today() # Or datetime.now() if column type allows
-            booking_data['manual_total_amount'] = request.manual_total_amount
+
+        # Price once at creation; reads use the stored columns
+        if pricing is None:
+            pricing = PricingService.calculate_total(
+                check_in=request.check_in,
+                check_out=request.check_out,
+                guests=request.guest_count,
+                policy_type=request.policy_type,
+                manual_total=request.manual_total_amount
+            )
+        booking_data.update(PricingService.booking_totals(pricing))
+        
+        if extra_fields:
+            booking_data.update(extra_fields)
         
-        return self.repo.create_booking(booking_data)
+        return self.repo.create_booking(booking_data, commit=commit)
@@ -1,28 +1,20 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
 from datetime import date, timedelta
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Tuple
 from app.db.repository import BookingRepository
-from app.core.holidays_co import get_colombian_holidays
+from app.services.holiday_cache import holiday_cache
+from app.core.http_cache import make_etag
 
 class CalendarService:
     @staticmethod
     def get_holidays_in_range(repo: BookingRepository, start: date, end: date) -> List[date]:
         """
         Combines algorithmic holidays (Ley Emiliani) with Database overrides.
+        Served from the process-wide merged cache (no SQL in steady state).
         """
-        # 1. Get Algorithmic Holidays for relevant years
-        algo_holidays = set()
-        for year in range(start.year, end.year + 1):
-            holidays = get_colombian_holidays(year)
-            for h in holidays:
-                h_date = h['date']
-                if start <= h_date <= end:
-                    algo_holidays.add(h_date)
-        
-        # 2. Get DB Holidays (Overrides/Additions)
-        db_holidays = set(repo.get_holidays_in_range(start, end))
-        
-        # 3. Merge (Union)
-        return sorted(list(algo_holidays | db_holidays))
+        return holiday_cache.dates_in_range(repo, start, end)
 
     @staticmethod
     def check_holiday_window(repo: BookingRepository, check_in: date, check_out: date) -> Dict[str, Any]:
@@ -47,6 +39,35 @@ class CalendarService:
         - We check if there is ANY holiday in that Thu->Mon window.
         """
         
+        # O(1) lookup in the per-date window table (anchor / bounds / holidays precomputed)
+        entry = window_table.lookup(repo, check_in)
+        
+        return {
+            "has_holiday_in_window": entry.has_holiday,
+            "window_start": entry.window_start,
+            "window_end": entry.window_end,
+            "holidays_in_window": list(entry.holidays_in_window),
+            "holidays_in_range": CalendarService.get_holidays_in_range(repo, check_in, check_out)
+        }
+
+    @staticmethod
+    def holidays_etag(repo: BookingRepository, check_in: date, check_out: date) -> str:
+        """ETag of check_holiday_window(check_in, check_out): the dates + holiday data digest."""
+        # Windows reach one year back / forward at most
+        digest = holiday_cache.digest(repo, check_in.year - 1, check_out.year + 1)
+        return make_etag("holidays", check_in, check_out, digest)
+
+    @staticmethod
+    def holidays_for_year(repo: BookingRepository, year: int) -> Dict[str, Any]:
+        return {
+            "year": year,
+            "holidays": holiday_cache.holidays_for_year(repo, year),
+            "etag": make_etag("holidays-year", year, holiday_cache.digest(repo, year, year))
+        }
+
+    @staticmethod
+    def window_bounds(check_in: date) -> Tuple[date, date]:
+        """Thursday..Monday around the 'Anchor Sunday' of a check-in (see check_holiday_window)."""
         # Find Anchor Sunday
         # If check-in is <= Sunday, use coming Sunday.
         # If check-in is Mon, use yesterday.
@@ -65,19 +86,79 @@ class CalendarService:
         # Define the window: Thursday before Sunday ... Monday after Sunday
         # Thu = Sunday - 3 days
         # Mon = Sunday + 1 day
-        window_start = anchor_sunday - timedelta(days=3)
-        window_end = anchor_sunday + timedelta(days=1)
-        
-        # 3. Check for holidays in this window (Algorithm + DB)
-        holidays_in_window = CalendarService.get_holidays_in_range(repo, window_start, window_end)
-        
-        # 4. Check for holidays in the specific requested range
-        holidays_in_range = CalendarService.get_holidays_in_range(repo, check_in, check_out)
+        return anchor_sunday - timedelta(days=3), anchor_sunday + timedelta(days=1)
+
+    @staticmethod
+    def holiday_window(check_in: date, check_out: date, holidays: List[date]) -> Dict[str, Any]:
+        """
+        Same context as check_holiday_window, computed from an already fetched,
+        sorted holiday list (no DB access). Lets callers that evaluate many
+        candidate dates fetch holidays once.
+        """
+        window_start, window_end = CalendarService.window_bounds(check_in)
+
+        def between(start: date, end: date) -> List[date]:
+            return holidays[bisect_left(holidays, start):bisect_right(holidays, end)]
+
+        holidays_in_window = between(window_start, window_end)
         
         return {
             "has_holiday_in_window": len(holidays_in_window) > 0,
             "window_start": window_start,
             "window_end": window_end,
             "holidays_in_window": holidays_in_window,
-            "holidays_in_range": holidays_in_range
+            "holidays_in_range": between(check_in, check_out)
         }
+
+
+WindowEntry = namedtuple("WindowEntry", ["anchor_sunday", "window_start", "window_end", "has_holiday", "holidays_in_window"])
+
+
+class HolidayWindowTable:
+    """
+    Precomputed holiday window per check-in date, one array per year (index = day of year).
+    Built from the merged holiday cache and rebuilt when its version changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # year -> (holiday_cache.version used to build it, entries)
+        self._years: Dict[int, Tuple[int, List[WindowEntry]]] = {}
+
+    def lookup(self, repo: BookingRepository, check_in: date) -> WindowEntry:
+        year = check_in.year
+        # Windows of early January / late December reach into the neighbour years
+        holiday_cache.ensure(repo, year - 1, year + 1)
+        version = holiday_cache.version
+
+        built = self._years.get(year)
+        if built is None or built[0] != version:
+            built = (version, HolidayWindowTable._build(repo, year))
+            with self._lock:
+                self._years[year] = built
+        return built[1][check_in.toordinal() - date(year, 1, 1).toordinal()]
+
+    @staticmethod
+    def _build(repo: BookingRepository, year: int) -> List[WindowEntry]:
+        # ~53 distinct windows per year: compute each once, share it between its dates
+        by_window: Dict[date, WindowEntry] = {}
+        entries: List[WindowEntry] = []
+        day = date(year, 1, 1)
+        while day.year == year:
+            window_start, window_end = CalendarService.window_bounds(day)
+            entry = by_window.get(window_start)
+            if entry is None:
+                holidays = tuple(holiday_cache.dates_in_range(repo, window_start, window_end))
+                entry = WindowEntry(window_end - timedelta(days=1), window_start, window_end, len(holidays) > 0, holidays)
+                by_window[window_start] = entry
+            entries.append(entry)
+            day += timedelta(days=1)
+        return entries
+
+    def clear(self):
+        with self._lock:
+            self._years.clear()
+
+
+# Process-wide instance
+window_table = HolidayWindowTable()
@@ -0,0 +1,171 @@
+"""
+Checkout Unit of Work
+
+1. Price the request (pure, no DB).
+2. ONE short transaction: Booking + night ledger + Payment, single commit.
+3. Gateway intent created AFTER the commit (no transaction / lock held during
+   the network call). If the gateway fails, a compensating update cancels the
+   hold, marks the payment FAILED and frees the nights.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.core import money
+from app.core.config import settings
+from app.core.exceptions import BookingException, PaymentGatewayError
+from app.core.payments import get_payment_gateway
+from app.db.models import (
+    BookingStatus, Payment, PaymentMethod, PaymentProvider, PaymentStatus, PaymentType
+)
+from app.db.repository import BookingRepository
+from app.domain.models import BookingRequest
+from app.services.booking_engine import BookingService
+from app.services.pricing import PricingService
+
+logger = logging.getLogger("payments.checkout")
+
+
+class CheckoutService:
+    @staticmethod
+    def create_checkout(db: Session, request: BookingRequest, property_id: int, provider: str,
+                        method: PaymentMethod, payment_type: PaymentType) -> Dict[str, Any]:
+        """
+        Creates the booking hold and its payment.
+        Raises RuleViolationError / OverbookingError (nothing persisted) or
+        PaymentGatewayError (booking cancelled by the compensating update).
+        """
+        checkout = CheckoutService.reserve(db, request, property_id, provider, method, payment_type)
+
+        # Gateway call outside the transaction
+        payment_response = None
+        if method == PaymentMethod.ONLINE_GATEWAY:
+            try:
+                payment_response = CheckoutService.request_intent(checkout, request, provider)
+            except Exception as e:
+                CheckoutService.compensate(db, checkout, str(e))
+                raise PaymentGatewayError(f"No se pudo iniciar el pago: {e}")
+
+        return CheckoutService.finalize(db, checkout, payment_response)
+
+    @staticmethod
+    def reserve(db: Session, request: BookingRequest, property_id: int, provider: str,
+                method: PaymentMethod, payment_type: PaymentType) -> Dict[str, Any]:
+        """Steps 1 + 2: pricing, then Booking + nights + Payment in a single commit."""
+        repo = BookingRepository(db)
+        service = BookingService(repo=repo)
+
+        # 1. Pricing first: nothing to roll back if it fails
+        pricing_result = PricingService.calculate_total(
+            check_in=request.check_in,
+            check_out=request.check_out,
+            guests=request.guest_count,
+            policy_type=request.policy_type
+        )
+        total_amount = pricing_result["total_amount"]
+
+        pay_cents = pricing_result["total_cents"]
+        if payment_type == PaymentType.PARTIAL:
+            pay_cents = money.fraction(pay_cents, 1, 2) # 50% Deposit
+        pay_amount = money.from_cents(pay_cents)
+
+        status = PaymentStatus.PENDING_PAYMENT
+        if method == PaymentMethod.BANK_TRANSFER:
+            status = PaymentStatus.AWAITING_CONFIRMATION # Frontend will show instructions
+        elif method == PaymentMethod.DIRECT_ADMIN_AGREEMENT:
+            status = PaymentStatus.PENDING_DIRECT_PAYMENT
+
+        # 60-Minute Expiration Logic
+        # Applies if Partial Payment OR Bank Transfer
+        expires_at = None
+        if payment_type == PaymentType.PARTIAL or method == PaymentMethod.BANK_TRANSFER:
+            expires_at = datetime.now() + timedelta(minutes=settings.PENDING_TIMEOUT_MINUTES)
+
+        # 2. Booking + nights + payment in a single commit
+        try:
+            booking = service.create_booking(
+                request, property_id,
+                extra_fields={"payment_type": payment_type, "expires_at": expires_at},
+                commit=False,
+                pricing=pricing_result
+            )
+            payment = Payment(
+                booking_id=booking.id,
+                provider=PaymentProvider.DUMMY if provider == "DUMMY" else PaymentProvider.STRIPE, # Default
+                payment_method=method,
+                amount_cents=pay_cents,
+                currency="COP",
+                status=status
+            )
+            db.add(payment)
+            repo.commit()
+        except BookingException:
+            db.rollback()
+            raise
+
+        return {
+            "booking": booking,
+            "payment": payment,
+            "pricing": pricing_result,
+            "total_amount": total_amount,
+            "pay_amount": pay_amount,
+            "status": status
+        }
+
+    @staticmethod
+    def request_intent(checkout: Dict[str, Any], request: BookingRequest, provider: str) -> Dict[str, Any]:
+        """Step 3: network call to the provider. Touches no DB state."""
+        gateway = get_payment_gateway(provider)
+        return gateway.create_payment_intent(
+            amount=checkout["pay_amount"],
+            currency="COP",
+            booking_id=checkout["booking"].id,
+            customer_email=request.guest_email or "customer@example.com"
+        )
+
+    @staticmethod
+    def finalize(db: Session, checkout: Dict[str, Any], payment_response: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Stores the gateway transaction id (online only) and builds the response."""
+        booking = checkout["booking"]
+        payment = checkout["payment"]
+
+        payment_url = None
+        if payment_response:
+            payment_url = payment_response["payment_url"]
+            payment.transaction_id = payment_response.get("transaction_id")
+            db.commit()
+
+        return {
+            "booking_id": booking.id,
+            "payment_id": payment.id,
+            "payment_url": payment_url,
+            "status": checkout["status"],
+            "amount_due": checkout["pay_amount"],
+            "total_amount": checkout["total_amount"],
+            "pricing_breakdown": checkout["pricing"]["breakdown"],
+            "expires_at": booking.expires_at.isoformat() if booking.expires_at else None,
+            "message": "Booking created. Proceed with payment."
+        }
+
+    @staticmethod
+    def compensate(db: Session, checkout: Dict[str, Any], error: str):
+        """Undoes a committed checkout whose payment intent could not be created."""
+        booking = checkout["booking"]
+        payment = checkout["payment"]
+        try:
+            booking.status = BookingStatus.CANCELLED
+            payment.status = PaymentStatus.FAILED
+            payment.payload = json.dumps({"gateway_error": error})
+            BookingRepository(db).release_nights([booking.id])
+            db.commit()
+        except Exception as e:
+            # Hold stays until an admin cancels it (or it expires, if it has expires_at)
+            db.rollback()
+            logger.error(json.dumps({"event": "checkout_compensation_failed", "booking_id": booking.id, "error": str(e)}))
+            return
+
+        logger.warning(json.dumps({"event": "checkout_gateway_failed", "booking_id": booking.id, "error": error}))
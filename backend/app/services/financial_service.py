@@ -7,16 +7,19 @@ Revenue is calculated ONLY from bookings that meet BOTH criteria:
   - Payment.status IN (PAID, CONFIRMED_DIRECT_PAYMENT)
 
 Date filtering uses Payment.confirmed_at (financial view, not operational check_in).
+Amounts are summed as integer cents (Payment.amount_cents, core/money.py);
+floats are produced only for the JSON output.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import Optional, Dict, List, Any
-from datetime import date, datetime, timezone
-from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import case, distinct, func, select
+from typing import Optional, Dict, Iterator, List, Any
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
 
-from app.db.models import Booking, Payment, BookingStatus, PaymentStatus
-from app.services.pricing import PricingService
+from app.core import money
+from app.db.models import Booking, Payment, BookingStatus, PaymentStatus, RevenueDaily
+from app.services.revenue_rollup import revenue_rollup
 
 
 class FinancialService:
@@ -33,13 +36,12 @@ class FinancialService:
         PaymentStatus.CONFIRMED_DIRECT_PAYMENT
     ]
     
-    @staticmethod
-    def _normalize_amount(amount: float) -> Decimal:
-        """
-        Normalize monetary amounts to Decimal with 2 decimal places.
-        Ensures currency consistency across all outputs.
-        """
-        return Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    # Rows fetched per round trip when streaming revenue details
+    DETAIL_BATCH_SIZE = 500
+    
+    # Time-series buckets and the most a single request may return
+    TIMESERIES_BUCKETS = ('day', 'week', 'month')
+    MAX_TIMESERIES_BUCKETS = 400
     
     @staticmethod
     def _get_booking_revenue(booking: Booking, db: Session) -> Decimal:
@@ -54,18 +56,53 @@ class FinancialService:
         Returns:
             Total revenue as Decimal (0.00 if no qualifying payments)
         """
-        # Get all qualifying payments for this booking
-        payments = db.query(Payment).filter(
+        # Integer SUM in SQL over all qualifying payments (supports multiple payments)
+        total_cents = db.query(func.coalesce(func.sum(Payment.amount_cents), 0)).filter(
             Payment.booking_id == booking.id,
             Payment.status.in_(FinancialService.REVENUE_PAYMENT_STATUSES)
-        ).all()
-        
-        if not payments:
-            return Decimal('0.00')
+        ).scalar()
+        return money.to_decimal(total_cents)
+    
+    @staticmethod
+    def _channel_column():
+        """'admin' for bookings created from the admin panel, 'online' otherwise (SQL side)."""
+        return case((Booking.created_by_admin_id.isnot(None), 'admin'), else_='online')
+    
+    @staticmethod
+    def _revenue_select(*columns, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        SELECT <columns> over the revenue rows: CONFIRMED bookings joined to their
+        qualifying payments, filtered on Payment.confirmed_at.
+        """
+        stmt = select(*columns).select_from(Payment).join(
+            Booking,
+            Payment.booking_id == Booking.id
+        ).where(
+            Booking.status == BookingStatus.CONFIRMED,
+            Payment.status.in_(FinancialService.REVENUE_PAYMENT_STATUSES)
+        )
         
-        # Sum all payment amounts (supports multiple payments)
-        total = sum(payment.amount for payment in payments)
-        return FinancialService._normalize_amount(total)
+        # Date filtering on Payment.confirmed_at (financial view)
+        if start_date:
+            stmt = stmt.where(Payment.confirmed_at >= start_date)
+        if end_date:
+            stmt = stmt.where(Payment.confirmed_at <= end_date)
+        return stmt
+    
+    @staticmethod
+    def _rollup_groups(db: Session, start_date: Optional[date], end_date: Optional[date]) -> list:
+        """(plan, method, channel, cents) groups summed from the daily rollup."""
+        stmt = select(
+            RevenueDaily.policy_type,
+            RevenueDaily.payment_method,
+            RevenueDaily.channel,
+            func.sum(RevenueDaily.amount_cents)
+        ).group_by(RevenueDaily.policy_type, RevenueDaily.payment_method, RevenueDaily.channel)
+        if start_date:
+            stmt = stmt.where(RevenueDaily.day >= start_date)
+        if end_date:
+            stmt = stmt.where(RevenueDaily.day <= end_date)
+        return db.execute(stmt).all()
     
     @staticmethod
     def calculate_revenue_summary(
@@ -76,6 +113,15 @@ class FinancialService:
         """
         Calculate comprehensive revenue summary with breakdowns.
         
+        Aggregated in SQL: one GROUP BY (plan, method, channel) query, whose
+        result has at most plans x methods x 2 rows whatever the date range,
+        plus one COUNT(DISTINCT) for the bookings. The GROUP BY reads the
+        revenue_daily rollup once it is maintained (services/revenue_rollup.py).
+        
+        The booking count always reads the raw rows: distinct bookings with a
+        revenue payment in the range are not additive across days (a booking
+        paid in installments spans several), so the rollup cannot hold them.
+        
         Args:
             db: Database session
             start_date: Filter payments confirmed from this date (inclusive)
@@ -83,7 +129,7 @@ class FinancialService:
             
         Returns:
             Dictionary with:
-            - total_revenue: Decimal
+            - total_revenue: float
             - total_bookings_confirmed: int
             - currency: str
             - revenue_by_plan: Dict[plan, revenue]
@@ -91,65 +137,104 @@ class FinancialService:
             - revenue_by_channel: Dict[channel, revenue] (online vs admin)
             - date_range: Dict with from/to dates
         """
-        # Base query: CONFIRMED bookings with qualifying payments
-        query = db.query(Booking, Payment).join(
-            Payment,
-            Payment.booking_id == Booking.id
-        ).filter(
-            Booking.status == BookingStatus.CONFIRMED,
-            Payment.status.in_(FinancialService.REVENUE_PAYMENT_STATUSES)
-        )
-        
-        # Date filtering on Payment.confirmed_at (financial view)
-        if start_date:
-            query = query.filter(Payment.confirmed_at >= start_date)
-        if end_date:
-            query = query.filter(Payment.confirmed_at <= end_date)
+        if revenue_rollup.ready:
+            groups = FinancialService._rollup_groups(db, start_date, end_date)
+        else:
+            channel = FinancialService._channel_column()
+            groups = db.execute(
+                FinancialService._revenue_select(
+                    Booking.policy_type,
+                    Payment.payment_method,
+                    channel,
+                    func.sum(Payment.amount_cents),
+                    start_date=start_date,
+                    end_date=end_date
+                ).group_by(Booking.policy_type, Payment.payment_method, channel)
+            ).all()
         
-        results = query.all()
+        # A booking paid in several payments may sit in several groups: count it once
+        total_bookings = db.execute(
+            FinancialService._revenue_select(
+                func.count(distinct(Booking.id)),
+                start_date=start_date,
+                end_date=end_date
+            )
+        ).scalar()
         
-        # Initialize aggregations
-        total_revenue = Decimal('0.00')
-        booking_ids = set()
+        # Fold the groups into the breakdowns (integer cents)
+        total_revenue = 0
         revenue_by_plan = {}
         revenue_by_payment_method = {}
-        revenue_by_channel = {'online': Decimal('0.00'), 'admin': Decimal('0.00')}
+        revenue_by_channel = {'online': 0, 'admin': 0}
         
-        # Process results
-        for booking, payment in results:
-            # Track unique bookings
-            booking_ids.add(booking.id)
-            
-            # Calculate payment amount
-            amount = FinancialService._normalize_amount(payment.amount)
+        for plan, method, channel_name, amount in groups:
             total_revenue += amount
-            
-            # Breakdown by plan
-            plan = booking.policy_type.value
-            revenue_by_plan[plan] = revenue_by_plan.get(plan, Decimal('0.00')) + amount
-            
-            # Breakdown by payment method
-            method = payment.payment_method.value
-            revenue_by_payment_method[method] = revenue_by_payment_method.get(method, Decimal('0.00')) + amount
-            
-            # Breakdown by channel
-            channel = 'admin' if booking.created_by_admin_id else 'online'
-            revenue_by_channel[channel] += amount
+            revenue_by_plan[plan.value] = revenue_by_plan.get(plan.value, 0) + amount
+            revenue_by_payment_method[method.value] = revenue_by_payment_method.get(method.value, 0) + amount
+            revenue_by_channel[channel_name] += amount
         
-        # Convert Decimal to float for JSON serialization
+        # Cents to float for JSON serialization
         return {
-            'total_revenue': float(total_revenue),
-            'total_bookings_confirmed': len(booking_ids),
+            'total_revenue': money.from_cents(total_revenue),
+            'total_bookings_confirmed': total_bookings or 0,
             'currency': 'COP',
-            'revenue_by_plan': {k: float(v) for k, v in revenue_by_plan.items()},
-            'revenue_by_payment_method': {k: float(v) for k, v in revenue_by_payment_method.items()},
-            'revenue_by_channel': {k: float(v) for k, v in revenue_by_channel.items()},
+            'revenue_by_plan': {k: money.from_cents(v) for k, v in revenue_by_plan.items()},
+            'revenue_by_payment_method': {k: money.from_cents(v) for k, v in revenue_by_payment_method.items()},
+            'revenue_by_channel': {k: money.from_cents(v) for k, v in revenue_by_channel.items()},
             'date_range': {
                 'from': start_date.isoformat() if start_date else None,
                 'to': end_date.isoformat() if end_date else None
             }
         }
     
+    @staticmethod
+    def iter_revenue_details(
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Revenue rows one per (booking, payment), streamed.
+        
+        Column projection (no ORM entities) fetched in batches of DETAIL_BATCH_SIZE
+        rows, so exports over long ranges do not hold the whole result in memory.
+        """
+        stmt = FinancialService._revenue_select(
+            Booking.id,
+            Booking.check_in,
+            Booking.check_out,
+            Booking.guest_name,
+            Booking.guest_email,
+            Booking.policy_type,
+            Booking.guest_count,
+            Booking.is_override,
+            Payment.amount_cents,
+            Payment.payment_method,
+            Payment.status,
+            Payment.confirmed_at,
+            FinancialService._channel_column(),
+            start_date=start_date,
+            end_date=end_date
+        ).order_by(Payment.confirmed_at, Payment.id).execution_options(yield_per=FinancialService.DETAIL_BATCH_SIZE)
+        
+        for (booking_id, check_in, check_out, guest_name, guest_email, plan, guest_count,
+             is_override, amount_cents, method, status, confirmed_at, channel) in db.execute(stmt):
+            yield {
+                'booking_id': booking_id,
+                'check_in': check_in.isoformat(),
+                'check_out': check_out.isoformat(),
+                'guest_name': guest_name,
+                'guest_email': guest_email,
+                'plan': plan.value,
+                'guest_count': guest_count,
+                'amount': money.from_cents(amount_cents),
+                'payment_method': method.value,
+                'payment_status': status.value,
+                'confirmed_at': confirmed_at.isoformat() if confirmed_at else None,
+                'channel': channel,
+                'is_override': is_override
+            }
+    
     @staticmethod
     def get_revenue_details(
         db: Session,
@@ -158,46 +243,146 @@ class FinancialService:
     ) -> List[Dict[str, Any]]:
         """
         Get detailed revenue breakdown by booking.
-        Used for report generation.
+        List form of iter_revenue_details (reports consume the iterator directly).
         
         Returns:
             List of dictionaries with booking and payment details
         """
-        query = db.query(Booking, Payment).join(
-            Payment,
-            Payment.booking_id == Booking.id
-        ).filter(
-            Booking.status == BookingStatus.CONFIRMED,
-            Payment.status.in_(FinancialService.REVENUE_PAYMENT_STATUSES)
-        )
+        return list(FinancialService.iter_revenue_details(db, start_date, end_date))
+    
+    @staticmethod
+    def bucket_start(day: date, bucket: str) -> date:
+        """First day of the bucket holding `day` (weeks start on Monday)."""
+        if bucket == 'week':
+            return day - timedelta(days=day.weekday())
+        if bucket == 'month':
+            return day.replace(day=1)
+        return day
+    
+    @staticmethod
+    def next_bucket(start: date, bucket: str) -> date:
+        if bucket == 'week':
+            return start + timedelta(days=7)
+        if bucket == 'month':
+            return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        return start + timedelta(days=1)
+    
+    @staticmethod
+    def count_buckets(start_date: date, end_date: date, bucket: str) -> int:
+        if bucket == 'week':
+            return (FinancialService.bucket_start(end_date, 'week') - FinancialService.bucket_start(start_date, 'week')).days // 7 + 1
+        if bucket == 'month':
+            return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+        return (end_date - start_date).days + 1
+    
+    @staticmethod
+    def calculate_revenue_timeseries(
+        db: Session,
+        bucket: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """
+        Revenue, payments and bookings per day / week / month bucket, with the
+        same breakdowns as the summary, for [start_date, end_date] (inclusive).
         
-        if start_date:
-            query = query.filter(Payment.confirmed_at >= start_date)
-        if end_date:
-            query = query.filter(Payment.confirmed_at <= end_date)
-        
-        results = query.all()
-        
-        details = []
-        for booking, payment in results:
-            amount = FinancialService._normalize_amount(payment.amount)
-            details.append({
-                'booking_id': booking.id,
-                'check_in': booking.check_in.isoformat(),
-                'check_out': booking.check_out.isoformat(),
-                'guest_name': booking.guest_name,
-                'guest_email': booking.guest_email,
-                'plan': booking.policy_type.value,
-                'guest_count': booking.guest_count,
-                'amount': float(amount),
-                'payment_method': payment.payment_method.value,
-                'payment_status': payment.status.value,
-                'confirmed_at': payment.confirmed_at.isoformat() if payment.confirmed_at else None,
-                'channel': 'admin' if booking.created_by_admin_id else 'online',
-                'is_override': booking.is_override
+        Two grouped queries whatever the number of buckets: revenue per
+        (day, plan, method, channel), from the revenue_daily rollup when ready,
+        and bookings per day, always from the raw rows (as in the summary). Days are folded into buckets here, which keeps the
+        SQL portable (no dialect date truncation).
+        
+        A booking counts in the bucket of its first revenue payment inside the
+        range, so the bookings of all buckets add up to total_bookings_confirmed.
+        Every bucket in the range is returned, empty ones with zeros.
+        """
+        if revenue_rollup.ready:
+            days = db.execute(
+                select(
+                    RevenueDaily.day,
+                    RevenueDaily.policy_type,
+                    RevenueDaily.payment_method,
+                    RevenueDaily.channel,
+                    func.sum(RevenueDaily.amount_cents),
+                    func.sum(RevenueDaily.payments)
+                ).where(
+                    RevenueDaily.day >= start_date,
+                    RevenueDaily.day <= end_date
+                ).group_by(RevenueDaily.day, RevenueDaily.policy_type, RevenueDaily.payment_method, RevenueDaily.channel)
+            ).all()
+        else:
+            channel = FinancialService._channel_column()
+            days = db.execute(
+                FinancialService._revenue_select(
+                    Payment.confirmed_at,
+                    Booking.policy_type,
+                    Payment.payment_method,
+                    channel,
+                    func.sum(Payment.amount_cents),
+                    func.count(Payment.id),
+                    start_date=start_date,
+                    end_date=end_date
+                ).group_by(Payment.confirmed_at, Booking.policy_type, Payment.payment_method, channel)
+            ).all()
+        
+        first_payments = FinancialService._revenue_select(
+            func.min(Payment.confirmed_at).label('first_day'),
+            start_date=start_date,
+            end_date=end_date
+        ).group_by(Booking.id).subquery()
+        bookings_by_day = db.execute(
+            select(first_payments.c.first_day, func.count()).group_by(first_payments.c.first_day)
+        ).all()
+        
+        # Empty buckets for the whole range (integer cents until the output)
+        buckets = {}
+        start = FinancialService.bucket_start(start_date, bucket)
+        while start <= end_date:
+            buckets[start] = {
+                'revenue': 0,
+                'payments': 0,
+                'bookings': 0,
+                'revenue_by_plan': {},
+                'revenue_by_payment_method': {},
+                'revenue_by_channel': {'online': 0, 'admin': 0}
+            }
+            start = FinancialService.next_bucket(start, bucket)
+        
+        for day, plan, method, channel_name, amount, payments in days:
+            row = buckets[FinancialService.bucket_start(day, bucket)]
+            row['revenue'] += amount
+            row['payments'] += payments
+            row['revenue_by_plan'][plan.value] = row['revenue_by_plan'].get(plan.value, 0) + amount
+            row['revenue_by_payment_method'][method.value] = row['revenue_by_payment_method'].get(method.value, 0) + amount
+            row['revenue_by_channel'][channel_name] += amount
+        
+        for day, count in bookings_by_day:
+            buckets[FinancialService.bucket_start(day, bucket)]['bookings'] += count
+        
+        series = []
+        for start, row in buckets.items():
+            end = min(FinancialService.next_bucket(start, bucket) - timedelta(days=1), end_date)
+            series.append({
+                'period_start': max(start, start_date).isoformat(),
+                'period_end': end.isoformat(),
+                'revenue': money.from_cents(row['revenue']),
+                'payments': row['payments'],
+                'bookings': row['bookings'],
+                'revenue_by_plan': {k: money.from_cents(v) for k, v in row['revenue_by_plan'].items()},
+                'revenue_by_payment_method': {k: money.from_cents(v) for k, v in row['revenue_by_payment_method'].items()},
+                'revenue_by_channel': {k: money.from_cents(v) for k, v in row['revenue_by_channel'].items()}
             })
         
-        return details
+        return {
+            'bucket': bucket,
+            'currency': 'COP',
+            'total_revenue': money.from_cents(sum(row['revenue'] for row in buckets.values())),
+            'total_bookings_confirmed': sum(row['bookings'] for row in buckets.values()),
+            'date_range': {
+                'from': start_date.isoformat(),
+                'to': end_date.isoformat()
+            },
+            'series': series
+        }
     
     @staticmethod
     def calculate_monthly_revenue(db: Session, target_date: Optional[date] = None) -> Decimal:
@@ -230,4 +415,4 @@ class FinancialService:
             end_date=last_day
         )
         
-        return Decimal(str(summary['total_revenue']))
+        return money.to_decimal(money.to_cents(summary['total_revenue']))
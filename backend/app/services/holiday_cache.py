@@ -0,0 +1,97 @@
+"""
+Merged Holiday Cache
+
+Process-wide cache of the holiday calendar per year: algorithmic holidays
+(Ley Emiliani, core/holidays_co.py) merged with the DB overrides (Holiday table),
+stored as a sorted array so range lookups are two bisects and no SQL.
+
+Invalidation:
+- Write-through: BookingRepository.add_holiday invalidates the year it touched.
+- TTL (HOLIDAY_CACHE_TTL_SECONDS): picks up rows written by other workers / scripts.
+
+`version` changes whenever the cached content may have changed, so derived
+data (window tables) can be memoized against it. Each year also carries a
+content digest, stable across workers, used for HTTP ETags.
+"""
+
+import hashlib
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.holidays_co import get_colombian_holidays
+
+_YearEntry = namedtuple("_YearEntry", ["dates", "names", "digest", "loaded_at"])
+
+
+class HolidayCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._years: Dict[int, _YearEntry] = {}
+        self.version = 0
+
+    def _year(self, repo, year: int) -> _YearEntry:
+        entry = self._years.get(year)
+        ttl = settings.HOLIDAY_CACHE_TTL_SECONDS
+        if entry is not None and (ttl <= 0 or time.monotonic() - entry.loaded_at < ttl):
+            return entry
+
+        fresh = HolidayCache._load(repo, year)
+        with self._lock:
+            if entry is None or entry.names != fresh.names:
+                self.version += 1
+            self._years[year] = fresh
+        return fresh
+
+    @staticmethod
+    def _load(repo, year: int) -> _YearEntry:
+        names: Dict[date, str] = {}
+        for h in get_colombian_holidays(year):
+            # Two holidays can land on the same Monday: keep both names
+            names[h["date"]] = f"{names[h['date']]} / {h['name']}" if h["date"] in names else h["name"]
+        # DB rows add dates (or rename them); they never remove algorithmic ones
+        for holiday_date, name in repo.get_holiday_entries(date(year, 1, 1), date(year, 12, 31)):
+            names[holiday_date] = name or names.get(holiday_date)
+        dates = sorted(names)
+        # Content digest: same data -> same value in every worker (unlike `version`)
+        digest = hashlib.sha256(
+            "|".join(f"{d.isoformat()}={names[d] or ''}" for d in dates).encode("utf-8")
+        ).hexdigest()[:16]
+        return _YearEntry(dates, names, digest, time.monotonic())
+
+    def ensure(self, repo, first_year: int, last_year: int):
+        """Loads (or TTL-refreshes) the given years, so `version` reflects their content."""
+        for year in range(first_year, last_year + 1):
+            self._year(repo, year)
+
+    def dates_in_range(self, repo, start: date, end: date) -> List[date]:
+        """Sorted holiday dates in [start, end]."""
+        result: List[date] = []
+        for year in range(start.year, end.year + 1):
+            dates = self._year(repo, year).dates
+            result.extend(dates[bisect_left(dates, start):bisect_right(dates, end)])
+        return result
+
+    def holidays_for_year(self, repo, year: int) -> List[dict]:
+        entry = self._year(repo, year)
+        return [{"date": d, "name": entry.names[d]} for d in entry.dates]
+
+    def digest(self, repo, first_year: int, last_year: int) -> str:
+        """Content fingerprint of the given years (for HTTP ETags)."""
+        return "-".join(self._year(repo, year).digest for year in range(first_year, last_year + 1))
+
+    def invalidate(self, year: int = None):
+        with self._lock:
+            if year is None:
+                self._years.clear()
+            else:
+                self._years.pop(year, None)
+            self.version += 1
+
+
+# Process-wide instance
+holiday_cache = HolidayCache()
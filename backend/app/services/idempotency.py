@@ -0,0 +1,98 @@
+"""
+Idempotency Keys
+
+Clients send an `Idempotency-Key` header on non-idempotent calls (checkout).
+The first request claims the key with a placeholder row, runs, and stores its
+response; replays with the same key get the stored response back without
+running the booking / gateway path again.
+
+- Same key, different body      -> 422
+- Same key, first still running -> 409 (retry later)
+- Expired keys are purged in bulk by the scheduler.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import IdempotencyError
+from app.db.models import IdempotencyKey
+
+
+class IdempotencyService:
+    @staticmethod
+    def request_hash(payload: Any) -> str:
+        """Stable fingerprint of the request body + parameters."""
+        raw = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def begin(db: Session, key: str, request_hash: str) -> Optional[Tuple[int, Any]]:
+        """
+        Claims the key for this request.
+        Returns (status_code, body) if a stored response exists (replay), None if the
+        caller owns the key and must run the request and then call complete().
+        """
+        now = datetime.now()
+        record = db.query(IdempotencyKey).filter(IdempotencyKey.key == key).first()
+
+        if record and record.expires_at < now:
+            # Stale key: treat as new
+            db.delete(record)
+            db.commit()
+            record = None
+
+        if record:
+            if record.request_hash != request_hash:
+                raise IdempotencyError("Idempotency-Key was already used with a different request.", status_code=422)
+            if record.status_code is None:
+                raise IdempotencyError("A request with this Idempotency-Key is still being processed.")
+            return record.status_code, json.loads(record.response)
+
+        db.add(IdempotencyKey(
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request claimed the same key between our read and insert
+            db.rollback()
+            raise IdempotencyError("A request with this Idempotency-Key is still being processed.")
+        return None
+
+    @staticmethod
+    def complete(db: Session, key: str, status_code: int, body: Any):
+        """Stores the response served for the key."""
+        db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update({
+            IdempotencyKey.status_code: status_code,
+            IdempotencyKey.response: json.dumps(jsonable_encoder(body))
+        }, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, key: str):
+        """Drops an unfinished claim (request failed unexpectedly) so the client can retry."""
+        db.rollback()
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        """Bulk delete of expired keys. Returns the number of rows removed."""
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at < datetime.now()
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
@@ -0,0 +1,126 @@
+"""
+Dashboard KPI Snapshot
+
+All dashboard KPIs come from ONE aggregate SELECT (conditional sums over
+bookings + scalar subqueries for occupied nights and property count), and the
+result is kept in memory as a snapshot so dashboard refreshes skip the DB.
+
+The snapshot is dropped when a transaction that wrote a Booking or Payment
+commits in this process. Writes from other workers are only picked up when it
+expires (KPI_SNAPSHOT_TTL_SECONDS; 0 disables caching) or the day changes,
+since active bookings and the month window depend on today's date.
+"""
+
+import calendar
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.core import money
+from app.core.commit_hooks import CommitHook
+from app.core.config import settings
+from app.db.models import Booking, BookingNight, BookingStatus, NightSlot, Payment, Property
+
+# Bookings that really occupy the villa (holds and blocks are not revenue/occupancy)
+OCCUPIED_STATUSES = [BookingStatus.CONFIRMED, BookingStatus.COMPLETED]
+
+
+def compute(db: Session, today: date) -> Dict[str, Any]:
+    """One round trip for every KPI."""
+    first_day = today.replace(day=1)
+    month_days = calendar.monthrange(today.year, today.month)[1]
+    last_day = first_day + timedelta(days=month_days - 1)
+
+    confirmed = Booking.status == BookingStatus.CONFIRMED
+
+    # Each occupied night (and Day Pass) holds exactly one PM slot in the ledger
+    occupied_nights = select(func.count(BookingNight.id)).join(
+        Booking, Booking.id == BookingNight.booking_id
+    ).where(
+        BookingNight.slot == NightSlot.PM,
+        BookingNight.night >= first_day,
+        BookingNight.night <= last_day,
+        Booking.status.in_(OCCUPIED_STATUSES)
+    ).scalar_subquery()
+
+    properties = select(func.count(Property.id)).scalar_subquery()
+
+    row = db.execute(
+        select(
+            func.count(Booking.id),
+            func.coalesce(func.sum(case(
+                (and_(confirmed, Booking.check_in <= today, Booking.check_out >= today), 1),
+                else_=0
+            )), 0),
+            # Stored integer totals (set at booking creation), never re-priced here
+            func.coalesce(func.sum(case(
+                (and_(confirmed, Booking.check_in >= first_day), Booking.total_cents),
+                else_=0
+            )), 0),
+            occupied_nights,
+            properties
+        ).select_from(Booking)
+    ).one()
+
+    total, active, revenue, nights, property_count = row
+    available_nights = month_days * max(property_count or 0, 1)
+
+    return {
+        "total_bookings": total or 0,
+        "monthly_revenue": money.from_cents(revenue),
+        "active_bookings": active or 0,
+        "occupancy_rate": round(min(100.0, (nights or 0) * 100.0 / available_nights), 1),
+    }
+
+
+class KPISnapshot:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value: Optional[Dict[str, Any]] = None
+        self._day: Optional[date] = None
+        self._expires = 0.0
+        self._generation = 0
+        self._hook = CommitHook("kpi_snapshot_dirty", [Booking, Payment], on_commit=self._on_commit)
+
+    def get(self, db: Session, today: date = None) -> Dict[str, Any]:
+        today = today or date.today()
+        ttl = settings.KPI_SNAPSHOT_TTL_SECONDS
+        with self._lock:
+            if self._value is not None and self._day == today and time.monotonic() < self._expires:
+                return self._value
+            generation = self._generation
+
+        value = compute(db, today)
+        if ttl > 0:
+            with self._lock:
+                if generation != self._generation:
+                    return value  # A commit landed while computing: don't cache a stale result
+                self._value, self._day = value, today
+                self._expires = time.monotonic() + ttl
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._day = None
+            self._generation += 1
+
+    # ---------- ORM Hooks ----------
+
+    def install(self):
+        """Registers the ORM listeners that drop the snapshot. Idempotent."""
+        self._hook.install()
+
+    def uninstall(self):
+        self._hook.uninstall()
+
+    def _on_commit(self, session: Session, changes: list):
+        self.invalidate()
+
+
+# Process-wide instance
+kpi_snapshot = KPISnapshot()
@@ -8,6 +8,8 @@ consistency with the financial reporting system.
 
 from sqlalchemy.orm import Session
 from app.db.models import Payment, Booking, PaymentStatus, BookingStatus
+from app.db.repository import BookingRepository
+from app.core.exceptions import OverbookingError
 from datetime import date
 import logging
 import json
@@ -82,7 +84,7 @@ class PaymentStateEngine:
         if booking.status in [BookingStatus.PENDING, BookingStatus.EXPIRED]:
             booking.status = BookingStatus.CONFIRMED
         
-        db.commit()
+        PaymentStateEngine._commit_with_nights(booking, db)
         
         # Audit log
         logger.info(json.dumps({
@@ -235,7 +237,7 @@ class PaymentStateEngine:
         if booking.status in [BookingStatus.PENDING, BookingStatus.EXPIRED]:
             booking.status = BookingStatus.CONFIRMED
         
-        db.commit()
+        PaymentStateEngine._commit_with_nights(booking, db)
         
         # Audit log
         logger.info(json.dumps({
@@ -259,6 +261,21 @@ class PaymentStateEngine:
             "channel": "admin"
         }
     
+    @staticmethod
+    def _commit_with_nights(booking: Booking, db: Session):
+        """
+        Commits a confirmation. A reactivated (EXPIRED) booking must re-claim its
+        night ledger slots; if someone else booked them meanwhile the transition fails.
+        """
+        repo = BookingRepository(db)
+        repo.sync_nights(booking)
+        try:
+            repo.commit()
+        except OverbookingError:
+            raise InvalidStateTransitionError(
+                "Booking dates are no longer available (taken after the hold expired)"
+            )
+    
     @staticmethod
     def validate_state_transition(
         current_state: PaymentStatus,
@@ -0,0 +1,108 @@
+"""
+Price Calendar
+
+Per-day rate of every BookingPolicy for a date range, so the frontend shows
+server prices for a whole month instead of re-implementing src/lib/pricing.ts.
+
+Built in one pass per policy over the range (rate index bisects, holidays
+from the merged cache) and memoized per (range, guests, rates, holidays).
+The ETag uses content digests, so it is the same in every worker.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from app.core.http_cache import make_etag
+from app.db.repository import BookingRepository
+from app.domain import date_span
+from app.domain.models import BookingPolicy
+from app.services.calendar_service import CalendarService, window_table
+from app.services.holiday_cache import holiday_cache
+from app.services.pricing import PricingService
+from app.services.rate_index import rate_index
+
+_MEMO_SIZE = 128
+
+
+class PriceCalendarService:
+    # Same cap as the availability calendar (12 months, leap-year safe)
+    MAX_DAYS = 366
+
+    _lock = threading.Lock()
+    _memo: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def _holidays_digest(repo: BookingRepository, start: date, end: date) -> str:
+        # Holiday windows reach into the neighbour years
+        return holiday_cache.digest(repo, start.year - 1, end.year + 1)
+
+    @staticmethod
+    def etag(repo: BookingRepository, start: date, end: date, guests: int) -> str:
+        return make_etag(
+            "price-calendar", start, end, guests,
+            PricingService.PRICING_VERSION, rate_index.digest,
+            PriceCalendarService._holidays_digest(repo, start, end)
+        )
+
+    @staticmethod
+    def build(repo: BookingRepository, start: date, end: date, guests: int) -> Dict[str, Any]:
+        key = (start, end, guests, rate_index.version, PriceCalendarService._holidays_digest(repo, start, end))
+        with PriceCalendarService._lock:
+            cached = PriceCalendarService._memo.get(key)
+            if cached is not None:
+                PriceCalendarService._memo.move_to_end(key)
+                return cached
+
+        result = PriceCalendarService._compute(repo, start, end, guests)
+
+        with PriceCalendarService._lock:
+            PriceCalendarService._memo[key] = result
+            if len(PriceCalendarService._memo) > _MEMO_SIZE:
+                PriceCalendarService._memo.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _compute(repo: BookingRepository, start: date, end: date, guests: int) -> Dict[str, Any]:
+        total_days = (end - start).days + 1
+        holidays = set(CalendarService.get_holidays_in_range(repo, start, end))
+        rates = {policy: PricingService.nightly_rates(policy, start, total_days) for policy in BookingPolicy}
+
+        days = []
+        for offset in range(total_days):
+            day = start + timedelta(days=offset)
+            day_rates = {policy.value: rates[policy][offset] for policy in BookingPolicy}
+            days.append({
+                "date": day,
+                "is_weekend": bool(date_span.FRI_SUN >> day.weekday() & 1), # Night priced as weekend
+                "is_holiday": day in holidays,
+                "in_holiday_window": window_table.lookup(repo, day).has_holiday,
+                "rates": day_rates,
+                "prices": {
+                    policy.value: PriceCalendarService.unit_price(policy, day_rates[policy.value], guests)
+                    for policy in BookingPolicy
+                }
+            })
+
+        return {
+            "from": start,
+            "to": end,
+            "guests": guests,
+            "currency": "COP",
+            "cleaning_fee": PricingService.CLEANING_FEE, # Once per stay, full property plans
+            "deposit": PricingService.DEPOSIT_AMOUNT,
+            "days": days
+        }
+
+    @staticmethod
+    def unit_price(policy: BookingPolicy, rate: int, guests: int) -> int:
+        """Price of one night (one day for Day Pass) for `guests`, as calculate_total charges it."""
+        if policy == BookingPolicy.FAMILY_PLAN:
+            return rate # Flat per night
+        return rate * guests
+
+    @staticmethod
+    def clear():
+        with PriceCalendarService._lock:
+            PriceCalendarService._memo.clear()
@@ -1,10 +1,14 @@
 from datetime import date, timedelta
 from typing import Dict, Any, List
 from app.domain.models import BookingPolicy
+from app.domain import date_span
 from app.core.config import settings
+from app.core import money
+from app.services.rate_index import rate_index
 
 class PricingService:
     # Constants ported from src/lib/pricing.ts
+    # Rates below are the fallback: dated rates come from the rate_plans table (services/rate_index.py)
     DEPOSIT_AMOUNT = 200000
     CLEANING_FEE = 70000
     
@@ -19,11 +23,54 @@ class PricingService:
     MIN_PEOPLE_GROUP = 10
     MAX_PEOPLE_FAMILY = 5
 
+    # Bump when rates / formulas change: stored booking totals keep the version they were priced with
+    PRICING_VERSION = 1
+
+    @classmethod
+    def booking_totals(cls, pricing: Dict[str, Any]) -> Dict[str, Any]:
+        """Booking columns (integer cents) persisted from a calculate_total() result."""
+        return {
+            "subtotal_cents": money.to_cents(pricing["subtotal"]),
+            "cleaning_fee_cents": money.to_cents(pricing["cleaning_fee"]),
+            "total_cents": money.to_cents(pricing["total_amount"]),
+            "pricing_version": cls.PRICING_VERSION
+        }
+
     @staticmethod
     def get_nights(check_in: date, check_out: date) -> int:
         delta = (check_out - check_in).days
         return max(1, delta)
 
+    @classmethod
+    def default_rate(cls, policy_type: BookingPolicy) -> int:
+        return {
+            BookingPolicy.DAY_PASS: cls.PASADIA_RATE,
+            BookingPolicy.FULL_PROPERTY_WEEKDAY: cls.WEEKDAY_RATE,
+            BookingPolicy.FULL_PROPERTY_WEEKEND: cls.WEEKEND_RATE,
+            BookingPolicy.FULL_PROPERTY_HOLIDAY: cls.HOLIDAY_RATE,
+            BookingPolicy.FAMILY_PLAN: cls.FAMILY_PLAN_RATE,
+        }[policy_type]
+
+    @classmethod
+    def nightly_rates(cls, policy_type: BookingPolicy, check_in: date, nights: int) -> List[int]:
+        """Rate of each night from check_in (in-memory bisect, constant when no plan covers it)."""
+        default = cls.default_rate(policy_type)
+        return [
+            rate_index.rate_for(policy_type, check_in + timedelta(days=i), default)
+            for i in range(nights)
+        ]
+
+    @staticmethod
+    def group_rates(rates: List[int]) -> List[tuple]:
+        """(rate, nights) runs in stay order, for the breakdown."""
+        groups = []
+        for rate in rates:
+            if groups and groups[-1][0] == rate:
+                groups[-1] = (rate, groups[-1][1] + 1)
+            else:
+                groups.append((rate, 1))
+        return groups
+
     @classmethod
     def calculate_total(cls, check_in: date, check_out: date, guests: int, policy_type: BookingPolicy, manual_total: float = None) -> Dict[str, Any]:
         """
@@ -49,6 +96,7 @@ class PricingService:
                 "cleaning_fee": 0,
                 "deposit": cls.DEPOSIT_AMOUNT,
                 "total_amount": manual_total,
+                "total_cents": money.to_cents(manual_total),
                 "currency": "COP",
                 "breakdown": breakdown
             }
@@ -56,7 +104,7 @@ class PricingService:
         if policy_type == BookingPolicy.DAY_PASS:
             # Pasadía: Flat rate per person
             # Frontend uses "entreSemana" price generally for simpler logic in this prototype
-            rate = cls.PASADIA_RATE
+            rate = cls.nightly_rates(policy_type, check_in, 1)[0]
             subtotal = rate * guests
             breakdown.append(f"{guests} personas x ${rate:,} (Pasadía)")
             
@@ -66,9 +114,10 @@ class PricingService:
                 # This should be caught by validation, but safeguard here
                 pass 
             
-            rate = cls.FAMILY_PLAN_RATE
-            subtotal = rate * nights
-            breakdown.append(f"Plan Familia x {nights} noche(s) (${rate:,}/noche)")
+            rates = cls.nightly_rates(policy_type, check_in, nights)
+            subtotal = sum(rates)
+            for rate, count in cls.group_rates(rates):
+                breakdown.append(f"Plan Familia x {count} noche(s) (${rate:,}/noche)")
             # Cleaning included in Family Plan
             cleaning_fee = 0 
             
@@ -77,16 +126,10 @@ class PricingService:
             # Default to provided policy logic, but we could enforce strict date checks here too.
             # For this Phase 7, we trust the policy_type matched the dates (validated in Step 1 of BookingService).
             
-            rate = 0
-            if policy_type == BookingPolicy.FULL_PROPERTY_WEEKDAY:
-                rate = cls.WEEKDAY_RATE
-            elif policy_type == BookingPolicy.FULL_PROPERTY_WEEKEND:
-                rate = cls.WEEKEND_RATE
-            elif policy_type == BookingPolicy.FULL_PROPERTY_HOLIDAY:
-                rate = cls.HOLIDAY_RATE
-                
-            subtotal = rate * guests * nights
-            breakdown.append(f"{guests} personas x {nights} noche(s) x ${rate:,}")
+            rates = cls.nightly_rates(policy_type, check_in, nights)
+            subtotal = sum(rates) * guests
+            for rate, count in cls.group_rates(rates):
+                breakdown.append(f"{guests} personas x {count} noche(s) x ${rate:,}")
             
             # Add Cleaning Fee
             cleaning_fee = cls.CLEANING_FEE
@@ -99,6 +142,7 @@ class PricingService:
             "cleaning_fee": cleaning_fee,
             "deposit": cls.DEPOSIT_AMOUNT,
             "total_amount": total,
+            "total_cents": money.to_cents(total), # Rates are whole pesos: exact
             "currency": "COP",
             "breakdown": breakdown
         }
@@ -204,12 +248,12 @@ class AdminPricingService:
         breakdown = []
         
         if policy_type == BookingPolicy.DAY_PASS:
-            rate = PricingService.PASADIA_RATE
+            rate = PricingService.nightly_rates(policy_type, check_in, 1)[0]
             subtotal = rate * guests
             breakdown.append(f"Pasadía: {guests} pax x ${rate:,}")
             
         elif policy_type == BookingPolicy.FAMILY_PLAN:
-            rate = PricingService.FAMILY_PLAN_RATE
+            rate = PricingService.nightly_rates(policy_type, check_in, 1)[0]
             subtotal = rate
             breakdown.append(f"Plan Familia: ${rate:,}")
             
@@ -224,25 +268,20 @@ class AdminPricingService:
             # If NO holiday but includes Weekend (Fri, Sat, Sun) -> ALL nights at WEEKEND_RATE ($60k).
             # Else -> WEEKDAY_RATE ($55k).
             
-            applicable_rate = PricingService.WEEKDAY_RATE
+            rate_policy = BookingPolicy.FULL_PROPERTY_WEEKDAY
             rate_name = "Semana"
             
             if has_holiday:
-                applicable_rate = PricingService.HOLIDAY_RATE
+                rate_policy = BookingPolicy.FULL_PROPERTY_HOLIDAY
                 rate_name = "Festivo"
             else:
-                # Check for weekend in range
-                is_weekend = False
-                curr = check_in
-                while curr < check_out:
-                    if curr.weekday() in [4, 5, 6]: # Fri, Sat, Sun
-                        is_weekend = True
-                        break
-                    curr += timedelta(days=1)
-                
-                if is_weekend:
-                    applicable_rate = PricingService.WEEKEND_RATE
+                # Check for weekend in range (Fri, Sat, Sun nights)
+                if date_span.classify(check_in, check_out).includes_any(date_span.FRI_SUN):
+                    rate_policy = BookingPolicy.FULL_PROPERTY_WEEKEND
                     rate_name = "Fin de Semana"
+
+            # High water mark also across dated rates: the highest night of the tier
+            applicable_rate = max(PricingService.nightly_rates(rate_policy, check_in, nights))
             
             subtotal = applicable_rate * guests * nights
             breakdown.append(f"Tarifa {rate_name} (Aplicada a todo): ${applicable_rate:,}")
@@ -255,6 +294,7 @@ class AdminPricingService:
             "subtotal": subtotal,
             "cleaning_fee": cleaning_fee,
             "total_amount": subtotal + cleaning_fee,
+            "total_cents": money.to_cents(subtotal + cleaning_fee),
             "breakdown": breakdown
         }
 
@@ -0,0 +1,56 @@
+"""
+Quote for a date range across every BookingPolicy.
+
+The holiday context and the availability lookup do not depend on the policy,
+so they are resolved once and shared; each policy then costs one pass of the
+rule engine (domain/rule_engine.py) plus PricingService.calculate_total.
+"""
+
+from datetime import date
+from typing import Any, Dict
+
+from app.db.repository import BookingRepository
+from app.domain import rule_engine
+from app.domain.models import BookingRequest, BookingPolicy
+from app.services.availability_service import AvailabilityService
+from app.services.calendar_service import CalendarService
+from app.services.pricing import PricingService
+
+
+class QuoteService:
+    @staticmethod
+    def quote(repo: BookingRepository, property_id: int, check_in: date, check_out: date, guests: int) -> Dict[str, Any]:
+        """
+        Eligibility, violations and pricing for each policy.
+        A policy is `eligible` when it breaks no rule AND the dates are free.
+        """
+        holiday_context = CalendarService.check_holiday_window(repo, check_in, check_out)
+        available = AvailabilityService.is_available(repo, property_id, check_in, check_out)
+        today = date.today()
+
+        policies = []
+        for policy in BookingPolicy:
+            request = BookingRequest(
+                check_in=check_in,
+                check_out=check_out,
+                guest_count=guests,
+                policy_type=policy
+            )
+            violations = rule_engine.evaluate(request, holiday_context, today)
+            policies.append({
+                "policy_type": policy,
+                "eligible": available and not violations,
+                "violations": [{"rule_name": v.rule_name, "message": v.message} for v in violations],
+                "pricing": PricingService.calculate_total(check_in, check_out, guests, policy)
+            })
+
+        return {
+            "property_id": property_id,
+            "check_in": check_in,
+            "check_out": check_out,
+            "guests": guests,
+            "available": available,
+            "has_holiday_in_window": holiday_context["has_holiday_in_window"],
+            "holidays_in_range": holiday_context["holidays_in_range"],
+            "policies": policies
+        }
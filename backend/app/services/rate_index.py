@@ -0,0 +1,149 @@
+"""
+In-process Rate Index
+
+The rate_plans table flattened, per policy, into sorted non-overlapping
+segments, so the rate of a night is a bisect instead of a SQL query.
+
+Rate plans are few and rarely edited, so any committed RatePlan write simply
+reloads the whole table (commit hook, core/commit_hooks.py); the scheduler
+reloads it too, for edits made through another worker.
+
+`version` changes on every rebuild, so derived data (price memos) can be
+keyed on it; `digest` fingerprints the loaded rates (same in every worker,
+used for HTTP ETags). Until the first rebuild (scripts, unit tests) every lookup
+returns the caller's default: the PricingService constants.
+"""
+
+import hashlib
+import threading
+import logging
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.commit_hooks import CommitHook
+from app.db.models import RatePlan
+from app.domain.models import BookingPolicy
+
+logger = logging.getLogger("rate_index")
+
+# valid_to is inclusive in the table; segments use an exclusive end
+Segment = namedtuple("Segment", ["start", "end", "rate", "plan_id"])
+
+
+def flatten(plans: list) -> List[Segment]:
+    """
+    Non-overlapping segments for one policy's plans, sorted by start.
+    At each date the covering plan with the latest valid_from (then highest id) wins.
+    """
+    if not plans:
+        return []
+
+    bounds = sorted({p.valid_from for p in plans} | {p.valid_to + timedelta(days=1) for p in plans if p.valid_to})
+    # Precedence order: later start first, then newer row
+    ranked = sorted(plans, key=lambda p: (p.valid_from, p.id), reverse=True)
+
+    segments: List[Segment] = []
+    for i, start in enumerate(bounds):
+        end = bounds[i + 1] if i + 1 < len(bounds) else date.max
+        winner = next(
+            (p for p in ranked if p.valid_from <= start and (p.valid_to is None or p.valid_to >= start)),
+            None
+        )
+        if winner is None:
+            continue
+        last = segments[-1] if segments else None
+        if last and last.end == start and last.plan_id == winner.id:
+            segments[-1] = last._replace(end=end)  # Same plan on both sides of a boundary
+        else:
+            segments.append(Segment(start, end, winner.rate, winner.id))
+    return segments
+
+
+class RateIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # policy -> (segment starts, segments), replaced as a whole so lock-free
+        # readers never pair the starts of one build with the segments of another
+        self._tables: Dict[BookingPolicy, Tuple[List[date], List[Segment]]] = {}
+        self.version = 0
+        self.digest = ""
+        self.ready = False
+        self._hook = CommitHook("rate_index_dirty", [RatePlan], on_commit=self._on_commit)
+
+    # ---------- Build / Maintenance ----------
+
+    def rebuild(self, db: Session):
+        """Loads every rate plan. One query."""
+        plans = db.query(
+            RatePlan.id,
+            RatePlan.policy_type,
+            RatePlan.rate,
+            RatePlan.valid_from,
+            RatePlan.valid_to
+        ).all()
+
+        by_policy: Dict[BookingPolicy, list] = {}
+        for plan in plans:
+            by_policy.setdefault(plan.policy_type, []).append(plan)
+
+        segments = {policy: flatten(rows) for policy, rows in by_policy.items()}
+        digest = hashlib.sha256("|".join(
+            f"{policy.value}:{s.start}:{s.end}:{s.rate}"
+            for policy in sorted(segments, key=lambda p: p.value) for s in segments[policy]
+        ).encode("utf-8")).hexdigest()[:16]
+        tables = {policy: ([s.start for s in segs], segs) for policy, segs in segments.items()}
+        with self._lock:
+            self._tables = tables
+            self.digest = digest
+            self.version += 1
+            self.ready = True
+
+        logger.info(f"Rate index rebuilt: {len(plans)} rate plans")
+
+    def reset(self):
+        """Back to the constants (rate_plans ignored until the next rebuild)."""
+        with self._lock:
+            self._tables = {}
+            self.digest = ""
+            self.version += 1
+            self.ready = False
+
+    # ---------- Queries ----------
+
+    def rate_for(self, policy: BookingPolicy, night: date, default: int) -> int:
+        table = self._tables.get(policy)  # One read: starts and segments of the same build
+        if not table or not table[0]:
+            return default
+        starts, segments = table
+        pos = bisect_right(starts, night) - 1
+        if pos < 0:
+            return default
+        segment = segments[pos]
+        return segment.rate if night < segment.end else default
+
+    # ---------- ORM Hooks ----------
+
+    def install(self):
+        """Registers the ORM listeners that trigger rebuilds. Idempotent."""
+        self._hook.install()
+
+    def uninstall(self):
+        self._hook.uninstall()
+
+    def _on_commit(self, session: Session, changes: list):
+        # The committing session cannot emit SQL here: reload through a fresh one
+        db = Session(bind=session.get_bind())
+        try:
+            self.rebuild(db)
+        except Exception as e:
+            logger.error(f"Rate index reload error: {e}")
+        finally:
+            db.close()
+
+
+# Process-wide instance
+rate_index = RateIndex()
@@ -1,5 +1,5 @@
 import io
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
 from datetime import date
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, landscape
@@ -103,7 +103,7 @@ class ReportingService:
         return buffer.getvalue()
 
     @staticmethod
-    def generate_financial_report_pdf(details: List[Dict[str, Any]], summary: Dict[str, Any]) -> bytes:
+    def generate_financial_report_pdf(details: Iterable[Dict[str, Any]], summary: Dict[str, Any]) -> bytes:
         """
         Generate comprehensive financial report PDF.
         Uses FinancialService data for consistency.
@@ -183,7 +183,7 @@ class ReportingService:
         return buffer.getvalue()
 
     @staticmethod
-    def generate_financial_report_xlsx(details: List[Dict[str, Any]], summary: Dict[str, Any]) -> bytes:
+    def generate_financial_report_xlsx(details: Iterable[Dict[str, Any]], summary: Dict[str, Any]) -> bytes:
         """
         Generate comprehensive financial report XLSX.
         Uses FinancialService data for consistency.
@@ -0,0 +1,164 @@
+"""
+Daily Revenue Rollup
+
+Keeps the revenue_daily table (one row per day, plan, method and channel) in
+step with the revenue rows FinancialService recognizes, so finance summaries
+and time series read a few hundred pre-aggregated rows instead of every Payment.
+Rows carry revenue cents and payment counts only: distinct booking counts are
+not additive across days and stay live queries (FinancialService).
+
+Maintenance:
+- Every flush that changes a revenue-relevant column of a Payment (status,
+  confirmed_at, amount, method, booking) or a Booking (status, plan, channel)
+  re-aggregates, in the SAME transaction, the days it touches (old and new);
+  a booking change touches the days of all its payments.
+- Days are recomputed from the raw rows (DELETE + INSERT ... SELECT GROUP BY),
+  not patched with +/- deltas. On PostgreSQL each day is first locked with a
+  transaction-scoped advisory lock, so concurrent confirmations of the same
+  day recompute one after the other instead of racing on uq_revenue_daily_key.
+- verify() compares the table totals with the raw rows; startup and the
+  scheduler rebuild() it on a mismatch (writes made without the hooks, such as
+  offline scripts or a crash between deploys).
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, Set
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from app.core.commit_hooks import CommitHook
+from app.db.models import Booking, Payment, RevenueDaily
+
+logger = logging.getLogger("revenue_rollup")
+
+_PAYMENT_FIELDS = ("status", "confirmed_at", "amount_cents", "payment_method", "booking_id")
+_BOOKING_FIELDS = ("status", "policy_type", "created_by_admin_id")
+
+# pg_advisory_xact_lock(key, day) namespace for the per-day locks
+_LOCK_KEY = 0x52455644
+
+_COLUMNS = ["day", "policy_type", "payment_method", "channel", "amount_cents", "payments"]
+
+
+class RevenueRollup:
+    def __init__(self):
+        self.ready = False
+        self._hook = CommitHook("revenue_rollup_changes", [Booking, Payment], self._collect, on_flush=self._on_flush)
+
+    # ---------- Build / Maintenance ----------
+
+    def refresh_days(self, connection, days: Iterable[date]):
+        """Re-aggregates revenue_daily for `days` from the raw payments."""
+        days = sorted({d for d in days if d is not None})
+        if not days:
+            return
+        if connection.dialect.name == "postgresql":
+            # Held until commit / rollback; sorted so two flushes lock in the same order
+            for day in days:
+                connection.execute(select(func.pg_advisory_xact_lock(_LOCK_KEY, day.toordinal())))
+        connection.execute(delete(RevenueDaily).where(RevenueDaily.day.in_(days)))
+        connection.execute(insert(RevenueDaily).from_select(_COLUMNS, self._rows(Payment.confirmed_at.in_(days))))
+
+    def rebuild(self, db: Session):
+        """Recomputes the whole table in one transaction."""
+        connection = db.connection()
+        if connection.dialect.name == "postgresql":
+            # Waits for (and then blocks) the per-day recomputes of other transactions
+            connection.execute(text("LOCK TABLE revenue_daily IN EXCLUSIVE MODE"))
+        connection.execute(delete(RevenueDaily))
+        connection.execute(insert(RevenueDaily).from_select(_COLUMNS, self._rows(Payment.confirmed_at.isnot(None))))
+        db.commit()
+        self.ready = True
+        logger.info(f"Revenue rollup rebuilt: {db.query(RevenueDaily).count()} rows")
+
+    def verify(self, db: Session) -> bool:
+        """
+        Cheap checksum: total cents and payments of the table against the same
+        totals over the raw rows (two single-row aggregates).
+        """
+        stored = db.execute(select(
+            func.coalesce(func.sum(RevenueDaily.amount_cents), 0),
+            func.coalesce(func.sum(RevenueDaily.payments), 0)
+        )).one()
+        rows = self._rows(Payment.confirmed_at.isnot(None)).subquery()
+        raw = db.execute(select(
+            func.coalesce(func.sum(rows.c.amount_cents), 0),
+            func.coalesce(func.sum(rows.c.payments), 0)
+        )).one()
+        if tuple(stored) != tuple(raw):
+            logger.warning(f"Revenue rollup out of date: stored {tuple(stored)}, payments {tuple(raw)}")
+            return False
+        return True
+
+    def ensure_built(self, db: Session):
+        """Startup: rebuilds the table when it is empty or does not match the payments."""
+        if not self.verify(db):
+            self.rebuild(db)
+        self.ready = True
+
+    def _rows(self, day_filter):
+        # Local import: FinancialService reads the rollup (defines the revenue rows)
+        from app.services.financial_service import FinancialService
+
+        channel = FinancialService._channel_column()
+        return FinancialService._revenue_select(
+            Payment.confirmed_at.label("day"),
+            Booking.policy_type,
+            Payment.payment_method,
+            channel.label("channel"),
+            func.sum(Payment.amount_cents).label("amount_cents"),
+            func.count(Payment.id).label("payments")
+        ).where(day_filter).group_by(
+            Payment.confirmed_at, Booking.policy_type, Payment.payment_method, channel
+        )
+
+    # ---------- ORM Hooks ----------
+
+    def install(self):
+        """Registers the flush hook that keeps the table current. Idempotent."""
+        self._hook.install()
+
+    def uninstall(self):
+        self._hook.uninstall()
+        self.ready = False
+
+    def _collect(self, kind: str, target):
+        # (days, booking ids) touched by one write; history still holds the old values here
+        if isinstance(target, Payment):
+            if kind != "update":
+                return {target.confirmed_at}, set()
+            if not any(get_history(target, field).has_changes() for field in _PAYMENT_FIELDS):
+                return None
+            return set(get_history(target, "confirmed_at").sum()) | {target.confirmed_at}, set()
+        if kind == "insert":
+            return None  # Its payments are collected on their own insert
+        if kind == "update" and not any(get_history(target, field).has_changes() for field in _BOOKING_FIELDS):
+            return None
+        return set(), {target.id}
+
+    def _on_flush(self, session: Session, changes: list):
+        days: Set[date] = set()
+        booking_ids: Set[int] = set()
+        for changed_days, changed_bookings in changes:
+            days |= changed_days
+            booking_ids |= changed_bookings
+        booking_ids.discard(None)
+
+        connection = session.connection()
+        if booking_ids:
+            # A booking change moves all its payments in or out of revenue
+            days.update(connection.execute(
+                select(Payment.confirmed_at).where(
+                    Payment.booking_id.in_(booking_ids),
+                    Payment.confirmed_at.isnot(None)
+                ).distinct()
+            ).scalars())
+
+        self.refresh_days(connection, days)
+
+
+# Process-wide instance
+revenue_rollup = RevenueRollup()
@@ -0,0 +1,126 @@
+"""
+Availability Check Benchmark
+
+Compares the legacy check (full ORM rows, expired holds filtered in Python,
+single-column indexes) against the current BookingRepository.check_availability
+(4-column projection, expiry in SQL, composite ix_bookings_availability).
+
+Usage (from backend/):
+    python benchmarks/availability_bench.py [--sizes 10000 100000] [--checks 500]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.db.models import Booking, BookingStatus
+from app.db.repository import BookingRepository
+from app.domain.models import BookingPolicy
+
+PROPERTIES = 20
+HISTORY_STATUSES = [BookingStatus.COMPLETED, BookingStatus.CANCELLED, BookingStatus.EXPIRED, BookingStatus.CONFIRMED]
+
+
+def legacy_check_availability(db, property_id: int, start: date, end: date) -> bool:
+    """Pre-optimization implementation, kept here as the baseline."""
+    now = datetime.now()
+    candidates = db.query(Booking).filter(
+        Booking.property_id == property_id,
+        Booking.status.in_(BookingRepository.ACTIVE_STATUSES),
+        Booking.check_in <= end,
+        Booking.check_out >= start
+    ).all()
+    candidates = [b for b in candidates if not (b.status == BookingStatus.PENDING and b.expires_at and b.expires_at < now)]
+    for b in candidates:
+        if BookingRepository.ranges_conflict(start, end, b.check_in, b.check_out):
+            return False
+    return True
+
+
+def seed(session_factory, size: int):
+    """`size` bookings spread over the last 10 years, ~2% recent PENDING holds."""
+    rng = random.Random(42)
+    today = date.today()
+    rows = []
+    for i in range(size):
+        check_in = today - timedelta(days=rng.randint(-60, 3650))
+        nights = rng.choice([0, 1, 2, 3])
+        pending = rng.random() < 0.02
+        rows.append({
+            "property_id": rng.randint(1, PROPERTIES),
+            "check_in": check_in,
+            "check_out": check_in + timedelta(days=nights),
+            "status": BookingStatus.PENDING if pending else rng.choice(HISTORY_STATUSES),
+            "expires_at": datetime.now() + timedelta(minutes=rng.randint(-600, 60)) if pending else None,
+            "guest_count": 10,
+            "policy_type": BookingPolicy.DAY_PASS if nights == 0 else BookingPolicy.FULL_PROPERTY_WEEKDAY,
+        })
+    session = session_factory()
+    session.bulk_insert_mappings(Booking, rows)
+    session.commit()
+    session.close()
+
+
+def time_checks(session_factory, check_fn, ranges) -> float:
+    session = session_factory()
+    started = time.perf_counter()
+    for property_id, start, end in ranges:
+        check_fn(session, property_id, start, end)
+    elapsed = time.perf_counter() - started
+    session.close()
+    return elapsed / len(ranges) * 1000
+
+
+def run(size: int, checks: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        seed(factory, size)
+
+        rng = random.Random(7)
+        today = date.today()
+        ranges = []
+        for _ in range(checks):
+            start = today + timedelta(days=rng.randint(0, 60))
+            ranges.append((rng.randint(1, PROPERTIES), start, start + timedelta(days=rng.choice([0, 1, 2]))))
+
+        repo_check = lambda db, p, s, e: BookingRepository(db).check_availability(p, s, e)
+
+        # Baseline: legacy query without the composite index
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_bookings_availability"))
+            conn.execute(text("ANALYZE"))
+        legacy_ms = time_checks(factory, legacy_check_availability, ranges)
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE INDEX ix_bookings_availability ON bookings (property_id, status, check_in, check_out)"
+            ))
+            conn.execute(text("ANALYZE"))
+        current_ms = time_checks(factory, repo_check, ranges)
+
+        engine.dispose()
+
+    print(f"{size:>8} bookings | legacy {legacy_ms:8.3f} ms/check | current {current_ms:8.3f} ms/check | x{legacy_ms / current_ms:5.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--checks", type=int, default=500)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.checks)
@@ -0,0 +1,118 @@
+"""
+Concurrent Checkout Throughput Benchmark
+
+Runs N writer threads doing full checkouts (CheckoutService: booking + night
+ledger + payment, one commit) while M reader threads poll availability,
+once per DB profile (core/db_profile.py):
+- default: plain create_engine (rollback journal, synchronous=FULL)
+- tuned:   WAL, synchronous=NORMAL, busy_timeout, mmap, page cache
+
+Usage (from backend/):
+    python benchmarks/checkout_bench.py [--writers 8] [--readers 8] [--checkouts 50]
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import threading
+from datetime import date, timedelta
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.db_profile import create_profiled_engine, DEFAULT, TUNED
+from app.db.models import Property, PaymentMethod, PaymentType
+from app.db.repository import BookingRepository
+from app.domain.models import BookingRequest, BookingPolicy
+from app.services.checkout_service import CheckoutService
+
+
+def writer(factory, worker: int, checkouts: int, results: dict):
+    """Each worker books day passes on its own dates: every failure is contention, not overlap."""
+    ok = errors = 0
+    first_day = date.today() + timedelta(days=1 + worker * checkouts)
+    for i in range(checkouts):
+        day = first_day + timedelta(days=i)
+        db = factory()
+        try:
+            CheckoutService.create_checkout(
+                db,
+                BookingRequest(check_in=day, check_out=day, guest_count=5, policy_type=BookingPolicy.DAY_PASS,
+                               payment_method="BANK_TRANSFER"),
+                property_id=1, provider="DUMMY",
+                method=PaymentMethod.BANK_TRANSFER, payment_type=PaymentType.FULL
+            )
+            ok += 1
+        except Exception:
+            db.rollback()
+            errors += 1
+        finally:
+            db.close()
+    results[worker] = (ok, errors)
+
+
+def reader(factory, stop: threading.Event, counter: list):
+    today = date.today()
+    i = 0
+    while not stop.is_set():
+        db = factory()
+        try:
+            day = today + timedelta(days=1 + i % 365)
+            BookingRepository(db).check_availability(1, day, day + timedelta(days=1))
+            counter[0] += 1
+        except Exception:
+            pass
+        finally:
+            db.close()
+        i += 1
+
+
+def run(profile: str, writers: int, readers: int, checkouts: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_profiled_engine(f"sqlite:///{tmp}/bench.db", profile=profile)
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        session = factory()
+        session.add(Property(id=1, name="Bench Villa", max_guests=20))
+        session.commit()
+        session.close()
+
+        results: dict = {}
+        reads = [0]
+        stop = threading.Event()
+        reader_threads = [threading.Thread(target=reader, args=(factory, stop, reads)) for _ in range(readers)]
+        writer_threads = [threading.Thread(target=writer, args=(factory, w, checkouts, results)) for w in range(writers)]
+
+        for t in reader_threads:
+            t.start()
+        started = time.perf_counter()
+        for t in writer_threads:
+            t.start()
+        for t in writer_threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for t in reader_threads:
+            t.join()
+
+        engine.dispose()
+
+    ok = sum(r[0] for r in results.values())
+    errors = sum(r[1] for r in results.values())
+    print(f"{profile:>8} | {ok / elapsed:8.1f} checkouts/s | {errors:4d} failed | {reads[0] / elapsed:9.1f} reads/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--checkouts", type=int, default=50, help="Checkouts per writer")
+    args = parser.parse_args()
+
+    for profile in (DEFAULT, TUNED):
+        run(profile, args.writers, args.readers, args.checkouts)
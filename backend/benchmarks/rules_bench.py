@@ -0,0 +1,218 @@
+"""
+Booking Rules Benchmark
+
+Compares the legacy validation (if/elif dispatch per policy, per-day loops over
+the stay, first violation raised as an exception) against the compiled
+rule engine in app/domain/rule_engine.py (one shared DateSpan, single pass,
+all violations returned).
+
+Usage (from backend/):
+    python benchmarks/rules_bench.py [--requests 20000] [--max-nights 14] [--repeat 7]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.exceptions import RuleViolationError
+from app.domain import rule_engine
+from app.domain.models import BookingRequest, BookingPolicy
+
+POLICIES = list(BookingPolicy)
+
+
+# ---------- Legacy (pre-engine app/domain/rules.py, same checks and rule names) ----------
+
+def _get_date_range(start: date, end: date) -> List[date]:
+    """Yields dates between start (inclusive) and end (exclusive)."""
+    delta = (end - start).days
+    return [start + timedelta(days=i) for i in range(delta)]
+
+def validate_dates_common(request: BookingRequest):
+    if request.check_in < date.today():
+        raise RuleViolationError(
+            "No puedes reservar fechas pasadas.",
+            rule_name="PAST_DATE_NOT_ALLOWED"
+        )
+    if request.policy_type != BookingPolicy.DAY_PASS:
+        if request.check_out <= request.check_in:
+             raise RuleViolationError(
+                "La fecha de salida debe ser posterior a la de llegada.",
+                rule_name="MIN_NIGHTS_REQUIRED"
+            )
+
+def validate_day_pass(request: BookingRequest):
+    if request.check_in != request.check_out:
+         raise RuleViolationError(
+            "El plan Pasadía es de un solo día (Llegada = Salida).",
+            rule_name="DAY_PASS_INVALID_RANGE"
+        )
+
+def validate_full_property_weekday(request: BookingRequest, context: Dict[str, Any]):
+    if request.guest_count < 10:
+        raise RuleViolationError(
+            "La Finca Completa requiere un mínimo de 10 personas para este plan.",
+            rule_name="MIN_PEOPLE_NOT_MET"
+        )
+    nights = _get_date_range(request.check_in, request.check_out)
+    for night in nights:
+        if night.weekday() not in [0, 1, 2, 3]: # Mon=0, Thu=3
+             raise RuleViolationError(
+                "Este plan solo se puede reservar de lunes a jueves.",
+                rule_name="INVALID_WEEKDAY_DATES"
+            )
+    if context.get("holidays_in_range"):
+        raise RuleViolationError(
+            "Este plan no está permitido en fechas festivas.",
+            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
+        )
+
+def validate_full_property_weekend(request: BookingRequest, context: Dict[str, Any]):
+    if request.guest_count < 10:
+        raise RuleViolationError(
+            "La Finca Completa requiere un mínimo de 10 personas para este plan.",
+            rule_name="MIN_PEOPLE_NOT_MET"
+        )
+    nights = _get_date_range(request.check_in, request.check_out)
+    for night in nights:
+        if night.weekday() not in [4, 5]:
+             raise RuleViolationError(
+                "Este plan requiere reservar fines de semana (viernes a domingo).",
+                rule_name="INVALID_WEEKEND_DATES"
+            )
+    if context.get("holidays_in_range"):
+        raise RuleViolationError(
+            "Este plan no está permitido en fechas festivas.",
+            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
+        )
+
+def validate_full_property_holiday(request: BookingRequest, context: Dict[str, Any]):
+    if request.guest_count < 10:
+        raise RuleViolationError(
+            "La Finca Completa requiere un mínimo de 10 personas para este plan.",
+            rule_name="MIN_PEOPLE_NOT_MET"
+        )
+    has_holiday_in_window = context.get("has_holiday_in_window", False)
+    if not has_holiday_in_window:
+         raise RuleViolationError(
+            "Este plan requiere un fin de semana con festivo.",
+            rule_name="HOLIDAY_REQUIRED"
+        )
+
+def validate_family_plan(request: BookingRequest, context: Dict[str, Any]):
+    if request.guest_count > 5:
+        raise RuleViolationError(
+            "El Plan Familia es válido solo para máximo 5 personas.",
+            rule_name="FAMILY_PLAN_LIMIT_EXCEEDED"
+        )
+    duration = (request.check_out - request.check_in).days
+    if duration != 1:
+        raise RuleViolationError(
+            "El Plan Familia es para exactamente 1 noche.",
+            rule_name="FAMILY_PLAN_ONE_NIGHT"
+        )
+    if context.get("holidays_in_range"):
+        raise RuleViolationError(
+            "El Plan Familia no aplica en festivos.",
+            rule_name="PLAN_NOT_ALLOWED_ON_HOLIDAY"
+        )
+
+def legacy_validate(request: BookingRequest, holiday_context: dict):
+    """BookingService.validate_request before the engine (holiday context passed in)."""
+    validate_dates_common(request)
+
+    if request.policy_type == BookingPolicy.FULL_PROPERTY_WEEKDAY:
+        validate_full_property_weekday(request, holiday_context)
+
+    elif request.policy_type == BookingPolicy.FULL_PROPERTY_WEEKEND:
+        validate_full_property_weekend(request, holiday_context)
+
+    elif request.policy_type == BookingPolicy.FULL_PROPERTY_HOLIDAY:
+        validate_full_property_holiday(request, holiday_context)
+
+    elif request.policy_type == BookingPolicy.FAMILY_PLAN:
+        validate_family_plan(request, holiday_context)
+
+    elif request.policy_type == BookingPolicy.DAY_PASS:
+        validate_day_pass(request)
+
+    return True
+
+
+# ---------- Benchmark ----------
+
+def make_requests(count: int, max_nights: int, seed: int = 42):
+    rng = random.Random(seed)
+    start = date.today() + timedelta(days=1)
+    out = []
+    for _ in range(count):
+        check_in = start + timedelta(days=rng.randrange(365))
+        nights = rng.randint(0, max_nights)
+        holidays = [check_in + timedelta(days=1)] if rng.random() < 0.1 else []
+        request = BookingRequest(
+            check_in=check_in,
+            check_out=check_in + timedelta(days=nights),
+            guest_count=rng.randint(1, 20),
+            policy_type=rng.choice(POLICIES)
+        )
+        out.append((request, {"holidays_in_range": holidays, "has_holiday_in_window": bool(holidays)}))
+    return out
+
+
+def run_legacy(cases) -> int:
+    failures = 0
+    for request, context in cases:
+        try:
+            legacy_validate(request, context)
+        except RuleViolationError:
+            failures += 1
+    return failures
+
+
+def run_engine(cases) -> int:
+    today = date.today()
+    return sum(1 for request, context in cases if rule_engine.evaluate(request, context, today))
+
+
+def timed(fn, cases, repeat: int):
+    """Best of `repeat` runs (single runs of a few ms are noisy)."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(cases)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy rules vs compiled rule engine")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-nights", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    cases = make_requests(args.requests, args.max_nights)
+    # Valid requests run every rule on both sides (next-windows / checkout hot path)
+    valid = [case for case in cases if not rule_engine.evaluate(*case)]
+    valid = (valid * (args.requests // max(len(valid), 1) + 1))[:args.requests]
+
+    for label, batch in (("mixed", cases), ("valid only", valid)):
+        legacy_time, legacy_failed = timed(run_legacy, batch, args.repeat)
+        engine_time, engine_failed = timed(run_engine, batch, args.repeat)
+
+        print(f"{label}: {len(batch)} requests (0-{args.max_nights} nights)")
+        print(f"  legacy : {legacy_time * 1000:8.1f} ms  ({legacy_failed} rejected, first violation only)")
+        print(f"  engine : {engine_time * 1000:8.1f} ms  ({engine_failed} rejected, all violations collected)")
+        print(f"  speedup: {legacy_time / engine_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys
+import os
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, select, text, update
+
+from app.core.database import engine
+from app.core.pagination import search_key
+from app.db.models import Booking
+
+ADMIN_LIST_INDEXES = {
+    "ix_bookings_status_id", "ix_bookings_policy_id", "ix_bookings_admin_id", "ix_bookings_override_id",
+    "ix_bookings_guest_name_key", "ix_bookings_guest_email_key", "ix_bookings_guest_phone",
+}
+
+# Casefolded guest search keys (Booking._set_search_key fills them on new writes)
+SEARCH_KEY_COLUMNS = {
+    "guest_name_key": "VARCHAR",
+    "guest_email_key": "VARCHAR",
+}
+
+# Replaced by the search key indexes (SQL lower() is ASCII-only on SQLite)
+OBSOLETE_INDEXES = ["ix_bookings_guest_name_lower", "ix_bookings_guest_email_lower"]
+
+def add_search_keys(batch_size: int = 500):
+    # create_all() does not add columns to tables that already exist
+    existing = {c["name"] for c in inspect(engine).get_columns("bookings")}
+    with engine.begin() as conn:
+        for name, sql_type in SEARCH_KEY_COLUMNS.items():
+            if name not in existing:
+                print(f"Adding 'bookings.{name}'...")
+                conn.execute(text(f"ALTER TABLE bookings ADD COLUMN {name} {sql_type}"))
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    filled = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Booking.id, Booking.guest_name, Booking.guest_email)
+                .where(Booking.id > last_id).order_by(Booking.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for booking_id, name, email in rows:
+                conn.execute(update(Booking).where(Booking.id == booking_id).values(
+                    guest_name_key=search_key(name), guest_email_key=search_key(email)
+                ))
+            filled += len(rows)
+            last_id = rows[-1].id
+    print(f"Search keys set for {filled} bookings.")
+
+def add_admin_list_indexes():
+    add_search_keys()
+    # create_all() does not add indexes to tables that already exist
+    for index in Booking.__table__.indexes:
+        if index.name in ADMIN_LIST_INDEXES:
+            print(f"Creating '{index.name}' on 'bookings' if missing...")
+            index.create(bind=engine, checkfirst=True)
+    print("Done.")
+
+if __name__ == "__main__":
+    add_admin_list_indexes()
@@ -0,0 +1,19 @@
+import sys
+import os
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine
+from app.db.models import Booking
+
+def add_availability_index():
+    # create_all() does not add indexes to tables that already exist
+    for index in Booking.__table__.indexes:
+        if index.name == "ix_bookings_availability":
+            print("Creating 'ix_bookings_availability' on 'bookings' if missing...")
+            index.create(bind=engine, checkfirst=True)
+            print("Done.")
+
+if __name__ == "__main__":
+    add_availability_index()
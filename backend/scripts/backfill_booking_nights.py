@@ -0,0 +1,60 @@
+import sys
+import os
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.database import SessionLocal, engine
+from app.core.exceptions import OverbookingError
+from app.db.repository import BookingRepository
+from app.db.models import Booking, BookingNight
+
+# Flag set by the payment webhook when a captured payment finds its dates taken
+BOOKING_COLUMNS = {
+    "review_reason": "VARCHAR",
+}
+
+def add_booking_columns():
+    # create_all() does not add columns to tables that already exist
+    existing = {c["name"] for c in inspect(engine).get_columns("bookings")}
+    with engine.begin() as conn:
+        for name, sql_type in BOOKING_COLUMNS.items():
+            if name not in existing:
+                print(f"Adding 'bookings.{name}'...")
+                conn.execute(text(f"ALTER TABLE bookings ADD COLUMN {name} {sql_type}"))
+
+def backfill_booking_nights():
+    print("Creating tables if not exist...")
+    # Ensure the booking_nights ledger exists
+    BookingNight.__table__.create(bind=engine, checkfirst=True)
+    add_booking_columns()
+
+    session = SessionLocal()
+    repo = BookingRepository(session)
+
+    bookings = session.query(Booking).filter(
+        Booking.status.in_(BookingRepository.ACTIVE_STATUSES)
+    ).order_by(Booking.id).all()
+
+    print(f"Backfilling night ledger for {len(bookings)} active bookings...")
+
+    claimed = 0
+    conflicts = []
+    for booking in bookings:
+        # One transaction per booking so a legacy double booking does not abort the run
+        repo.sync_nights(booking)
+        try:
+            repo.commit()
+            claimed += 1
+        except OverbookingError:
+            conflicts.append(booking.id)
+
+    print(f"Ledger rows written for {claimed} bookings.")
+    if conflicts:
+        print(f"WARNING: {len(conflicts)} bookings overlap an earlier booking and were not claimed: {conflicts}")
+    session.close()
+
+if __name__ == "__main__":
+    backfill_booking_nights()
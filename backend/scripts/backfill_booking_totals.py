@@ -0,0 +1,72 @@
+import sys
+import os
+import argparse
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.database import SessionLocal, engine
+from app.db.models import Booking, BookingStatus
+from app.services.pricing import PricingService
+
+# Integer cents (core/money.py). Databases that already have the legacy FLOAT
+# columns: run scripts/migrate_payment_amount_cents.py first.
+TOTAL_COLUMNS = {
+    "subtotal_cents": "INTEGER",
+    "cleaning_fee_cents": "INTEGER",
+    "total_cents": "INTEGER",
+    "pricing_version": "INTEGER",
+}
+
+def add_total_columns():
+    # create_all() does not add columns to tables that already exist
+    existing = {c["name"] for c in inspect(engine).get_columns("bookings")}
+    with engine.begin() as conn:
+        for name, sql_type in TOTAL_COLUMNS.items():
+            if name not in existing:
+                print(f"Adding 'bookings.{name}'...")
+                conn.execute(text(f"ALTER TABLE bookings ADD COLUMN {name} {sql_type}"))
+
+def backfill_booking_totals(batch_size: int = 500):
+    add_total_columns()
+
+    session = SessionLocal()
+    # Same price the admin screens used to compute on every read (manual override wins).
+    # Blocks carry no price and stay NULL.
+    pending = session.query(Booking).filter(
+        Booking.pricing_version.is_(None),
+        Booking.status != BookingStatus.BLOCKED
+    ).order_by(Booking.id)
+
+    print(f"Backfilling totals for {pending.count()} bookings...")
+
+    priced = 0
+    last_id = 0
+    while True:
+        batch = pending.filter(Booking.id > last_id).limit(batch_size).all()
+        if not batch:
+            break
+        for booking in batch:
+            pricing = PricingService.calculate_total(
+                check_in=booking.check_in,
+                check_out=booking.check_out,
+                guests=booking.guest_count,
+                policy_type=booking.policy_type,
+                manual_total=booking.manual_total_amount
+            )
+            for column, value in PricingService.booking_totals(pricing).items():
+                setattr(booking, column, value)
+        session.commit()
+        priced += len(batch)
+        last_id = batch[-1].id
+
+    print(f"Totals stored for {priced} bookings (pricing version {PricingService.PRICING_VERSION}).")
+    session.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store computed totals on existing bookings")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    backfill_booking_totals(args.batch_size)
@@ -0,0 +1,98 @@
+import sys
+import os
+import argparse
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.core import money
+
+def migrate_payment_amount_cents(keep_legacy: bool = False):
+    """
+    payments.amount (major units, float-ish) -> payments.amount_cents (integer minor units).
+    The ORM no longer writes `amount`, so its NOT NULL column is dropped unless --keep-legacy.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("payments")}
+
+    with engine.begin() as conn:
+        if "amount_cents" not in columns:
+            print("Adding 'payments.amount_cents'...")
+            conn.execute(text("ALTER TABLE payments ADD COLUMN amount_cents INTEGER"))
+
+        if "amount" not in columns:
+            print("No legacy 'payments.amount' column: nothing to backfill.")
+            return
+
+        # Converted in Python with the same half-up rounding as the app (no float surprises in SQL)
+        rows = conn.execute(text(
+            "SELECT id, amount FROM payments WHERE amount_cents IS NULL"
+        )).fetchall()
+        print(f"Backfilling amount_cents for {len(rows)} payments...")
+        for payment_id, amount in rows:
+            conn.execute(
+                text("UPDATE payments SET amount_cents = :cents WHERE id = :id"),
+                {"cents": money.to_cents(amount), "id": payment_id}
+            )
+
+    if keep_legacy:
+        print("Legacy 'payments.amount' kept. New rows need it nullable (or a default) to insert.")
+        return
+
+    with engine.begin() as conn:
+        print("Dropping legacy 'payments.amount'...")
+        conn.execute(text("ALTER TABLE payments DROP COLUMN amount")) # SQLite >= 3.35 / PostgreSQL
+    print("Done.")
+
+# Legacy float columns of bookings -> integer cents columns
+BOOKING_CENTS_COLUMNS = {
+    "manual_total_amount": "manual_total_cents",
+    "subtotal": "subtotal_cents",
+    "cleaning_fee": "cleaning_fee_cents",
+    "total_amount": "total_cents",
+}
+
+def migrate_booking_amount_cents(keep_legacy: bool = False):
+    """
+    bookings.manual_total_amount / subtotal / cleaning_fee / total_amount (FLOAT)
+    -> *_cents INTEGER columns. NULL stays NULL (blocks, rows never priced).
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("bookings")}
+
+    with engine.begin() as conn:
+        for legacy, cents in BOOKING_CENTS_COLUMNS.items():
+            if cents not in columns:
+                print(f"Adding 'bookings.{cents}'...")
+                conn.execute(text(f"ALTER TABLE bookings ADD COLUMN {cents} INTEGER"))
+            if legacy not in columns:
+                continue
+
+            rows = conn.execute(text(
+                f"SELECT id, {legacy} FROM bookings WHERE {legacy} IS NOT NULL AND {cents} IS NULL"
+            )).fetchall()
+            print(f"Backfilling bookings.{cents} for {len(rows)} rows...")
+            for booking_id, amount in rows:
+                conn.execute(
+                    text(f"UPDATE bookings SET {cents} = :cents WHERE id = :id"),
+                    {"cents": money.to_cents(amount), "id": booking_id}
+                )
+
+    if keep_legacy:
+        print("Legacy float booking columns kept (no longer read or written).")
+        return
+
+    with engine.begin() as conn:
+        for legacy in BOOKING_CENTS_COLUMNS:
+            if legacy in columns:
+                print(f"Dropping legacy 'bookings.{legacy}'...")
+                conn.execute(text(f"ALTER TABLE bookings DROP COLUMN {legacy}"))
+    print("Done.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move payment and booking amounts to integer cents")
+    parser.add_argument("--keep-legacy", action="store_true", help="Do not drop the legacy float columns")
+    args = parser.parse_args()
+    migrate_payment_amount_cents(args.keep_legacy)
+    migrate_booking_amount_cents(args.keep_legacy)
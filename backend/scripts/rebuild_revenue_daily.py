@@ -0,0 +1,22 @@
+import sys
+import os
+
+# Add parent directory to path so we can import 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine, SessionLocal
+from app.db.models import RevenueDaily
+from app.services.revenue_rollup import revenue_rollup
+
+def rebuild_revenue_daily():
+    # create_all() in main.py also creates it; here for scripts run before the first start
+    RevenueDaily.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        revenue_rollup.rebuild(db)
+        print(f"Rebuilt revenue_daily: {db.query(RevenueDaily).count()} rows.")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_revenue_daily()
@@ -0,0 +1,226 @@
+"""
+Tests for the admin booking list (/admin/bookings)
+
+Covers:
+- Keyset pagination (X-Next-Cursor) walks every row exactly once, newest first
+- Server-side filters: date range, policy, channel, override flag, guest text
+- Capped X-Total-Count on the first page only
+- Dashboard KPIs: one aggregate query, cached snapshot dropped on commit
+- Revenue time series endpoint: default range and validation
+"""
+
+import pytest
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.api.deps import get_current_admin
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.core.pagination import encode_cursor
+from app.db.models import Booking, BookingStatus, Property, User
+from app.db.repository import BookingRepository
+from app.domain.models import BookingPolicy
+from app.services.kpi_snapshot import compute, kpi_snapshot
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+START = date(2030, 3, 1)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    admin = User(id=1, email="admin@test.com", hashed_password="x", is_admin=True)
+    db.add_all([Property(id=1, name="Villa Roli", max_guests=20), admin])
+    db.commit()
+
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_admin] = lambda: admin
+    try:
+        yield db
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_admin, None)
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(db_session):
+    return TestClient(app)
+
+
+def seed(db, count=25):
+    for i in range(count):
+        check_in = START + timedelta(days=3 * i)
+        db.add(Booking(
+            property_id=1, check_in=check_in, check_out=check_in + timedelta(days=2),
+            status=BookingStatus.CONFIRMED if i % 2 else BookingStatus.PENDING,
+            guest_count=12, guest_name=f"Guest {i}", guest_email=f"guest{i}@test.com",
+            policy_type=BookingPolicy.FAMILY_PLAN if i % 5 == 0 else BookingPolicy.FULL_PROPERTY_WEEKEND,
+            created_by_admin_id=1 if i % 3 == 0 else None,
+            is_override=i % 7 == 0,
+            total_amount=1000.0 * i
+        ))
+    db.commit()
+
+
+class TestKeysetPagination:
+    def test_cursor_walks_every_row_once(self, client, db_session):
+        seed(db_session)
+
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 10}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/admin/bookings", params=params)
+            assert response.status_code == 200
+            if pages == 0:
+                assert response.headers["X-Total-Count"] == "25"
+            else:
+                assert "X-Total-Count" not in response.headers
+            ids.extend(b["id"] for b in response.json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert ids == sorted(range(1, 26), reverse=True)
+
+    def test_legacy_skip_still_works(self, client, db_session):
+        seed(db_session)
+        response = client.get("/admin/bookings", params={"limit": 5, "skip": 5})
+        assert [b["id"] for b in response.json()] == [20, 19, 18, 17, 16]
+
+    def test_invalid_cursor(self, client, db_session):
+        assert client.get("/admin/bookings", params={"cursor": "not-a-cursor"}).status_code == 400
+        # JSON true is a Python int subclass: still not a booking id
+        assert client.get("/admin/bookings", params={"cursor": encode_cursor(True)}).status_code == 400
+
+    def test_total_count_is_capped(self, client, db_session, monkeypatch):
+        seed(db_session)
+        monkeypatch.setattr(settings, "ADMIN_LIST_COUNT_CAP", 10)
+        response = client.get("/admin/bookings", params={"limit": 5})
+        assert response.headers["X-Total-Count"] == "10"
+        assert response.headers["X-Total-Count-Capped"] == "true"
+
+
+class TestFilters:
+    def ids(self, client, **params):
+        response = client.get("/admin/bookings", params=dict(limit=500, **params))
+        assert response.status_code == 200
+        return {b["id"] for b in response.json()}
+
+    def test_filters_match_python(self, client, db_session):
+        seed(db_session)
+        rows = db_session.query(Booking).all()
+
+        assert self.ids(client, policy_type="family_plan") == {b.id for b in rows if b.policy_type == BookingPolicy.FAMILY_PLAN}
+        assert self.ids(client, channel="admin") == {b.id for b in rows if b.created_by_admin_id}
+        assert self.ids(client, channel="online") == {b.id for b in rows if not b.created_by_admin_id}
+        assert self.ids(client, is_override=True) == {b.id for b in rows if b.is_override}
+        assert self.ids(client, q="guest1@") == {b.id for b in rows if b.guest_email == "guest1@test.com"}
+        # Case-insensitive prefix on the name: Guest 1, Guest 10..19
+        assert self.ids(client, q="GUEST 1") == {b.id for b in rows if b.guest_name.startswith("Guest 1")}
+        assert self.ids(client, q="uest") == set()
+
+        # Non-ASCII capitals fold like Python's casefold, also after a rename
+        angela = rows[3]
+        angela.guest_name = "Ángela Núñez"
+        db_session.commit()
+        assert self.ids(client, q="ángela") == self.ids(client, q="ÁNGELA N") == {angela.id}
+
+        date_from, date_to = START + timedelta(days=10), START + timedelta(days=20)
+        assert self.ids(client, date_from=date_from.isoformat(), date_to=date_to.isoformat()) == {
+            b.id for b in rows if b.check_out >= date_from and b.check_in <= date_to
+        }
+
+    def test_filters_combine_with_status(self, client, db_session):
+        seed(db_session)
+        rows = db_session.query(Booking).all()
+        assert self.ids(client, status="CONFIRMED", channel="admin") == {
+            b.id for b in rows if b.status == BookingStatus.CONFIRMED and b.created_by_admin_id
+        }
+
+
+class TestDashboardKPIs:
+    @pytest.fixture(autouse=True)
+    def hooks(self):
+        kpi_snapshot.install()
+        kpi_snapshot.invalidate()
+        yield
+        kpi_snapshot.invalidate()
+        kpi_snapshot.uninstall()
+
+    def stay(self, db, check_in, nights, status, total):
+        booking = Booking(
+            property_id=1, check_in=check_in, check_out=check_in + timedelta(days=nights),
+            status=status, guest_count=10, guest_name="KPI", guest_email="kpi@test.com",
+            policy_type=BookingPolicy.FULL_PROPERTY_WEEKEND, total_amount=total
+        )
+        db.add(booking)
+        db.flush()
+        BookingRepository(db).sync_nights(booking)
+        db.commit()
+        return booking
+
+    def test_single_query_values(self, db_session):
+        today = date(2030, 6, 15)
+        self.stay(db_session, date(2030, 6, 14), 3, BookingStatus.CONFIRMED, 900.0)  # active, 3 nights
+        self.stay(db_session, date(2030, 6, 29), 4, BookingStatus.CONFIRMED, 1200.0)  # 2 nights in June
+        self.stay(db_session, date(2030, 6, 20), 2, BookingStatus.PENDING, 500.0)  # hold: not counted
+        self.stay(db_session, date(2030, 5, 20), 2, BookingStatus.CONFIRMED, 700.0)  # last month
+
+        assert compute(db_session, today) == {
+            "total_bookings": 4,
+            "monthly_revenue": 2100.0,
+            "active_bookings": 1,
+            "occupancy_rate": round(5 * 100 / 30, 1),
+        }
+
+    def test_snapshot_dropped_on_commit_only(self, client, db_session):
+        self.stay(db_session, date.today(), 1, BookingStatus.CONFIRMED, 100.0)
+        assert client.get("/admin/kpis").json()["total_bookings"] == 1
+
+        # Rolled back writes keep the snapshot
+        db_session.add(Booking(
+            property_id=1, check_in=START, check_out=START, status=BookingStatus.PENDING,
+            guest_count=1, guest_name="x", guest_email="x@test.com",
+            policy_type=BookingPolicy.DAY_PASS
+        ))
+        db_session.flush()
+        db_session.rollback()
+        assert kpi_snapshot._value is not None
+
+        self.stay(db_session, START, 2, BookingStatus.CONFIRMED, 100.0)
+        assert kpi_snapshot._value is None
+        assert client.get("/admin/kpis").json()["total_bookings"] == 2
+
+    def test_ttl_zero_disables_cache(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "KPI_SNAPSHOT_TTL_SECONDS", 0)
+        kpi_snapshot.get(db_session)
+        assert kpi_snapshot._value is None
+
+
+class TestRevenueTimeseriesEndpoint:
+    def test_default_range_and_validation(self, client, db_session):
+        response = client.get("/admin/finance/timeseries")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["bucket"] == "month"
+        assert len(body["series"]) == 12
+        assert body["series"][-1]["period_end"] == date.today().isoformat()
+
+        assert len(client.get("/admin/finance/timeseries", params={"bucket": "day"}).json()["series"]) == 30
+        assert client.get("/admin/finance/timeseries", params={"bucket": "year"}).status_code == 422
+        assert client.get("/admin/finance/timeseries", params={"from": "2030-02-01", "to": "2030-01-01"}).status_code == 400
+        assert client.get("/admin/finance/timeseries", params={"bucket": "day", "from": "2029-01-01", "to": "2030-12-31"}).status_code == 400
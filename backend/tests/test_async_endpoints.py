@@ -0,0 +1,130 @@
+"""
+Tests for the async public endpoints (ASYNC_DB_ENABLED)
+
+The router is mounted on a bare app with an aiosqlite engine, so the
+tests do not depend on the process-wide async setting.
+"""
+
+import pytest
+from datetime import date, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base, get_async_db, get_async_database_url
+from app.db import models
+from app.db.models import Booking, Property, BookingStatus
+from app.domain.models import BookingPolicy
+from app.api.routers import public_async
+from app.core.exceptions import RuleViolationError
+from app.main import rule_violation_handler
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'async_test.db'}"
+
+
+@pytest.fixture
+def sync_session(db_url):
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Property(id=1, name="Test Villa", max_guests=20))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(db_url, sync_session):
+    # NullPool: TestClient runs each request on its own event loop
+    async_engine = create_async_engine(get_async_database_url(db_url), poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(public_async.router)
+    app.add_exception_handler(RuleViolationError, rule_violation_handler)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app)
+
+
+def test_async_url_derivation():
+    assert get_async_database_url("sqlite:///./villa_roli.db") == "sqlite+aiosqlite:///./villa_roli.db"
+    assert get_async_database_url("postgresql://u:p@db/villa") == "postgresql+asyncpg://u:p@db/villa"
+
+
+def test_availability(client, sync_session):
+    check_in = date.today() + timedelta(days=40)
+    sync_session.add(Booking(
+        property_id=1, check_in=check_in, check_out=check_in + timedelta(days=2),
+        status=BookingStatus.CONFIRMED, guest_count=10, policy_type=BookingPolicy.FULL_PROPERTY_WEEKDAY
+    ))
+    sync_session.commit()
+
+    busy = client.get("/bookings/availability", params={"check_in": check_in, "check_out": check_in + timedelta(days=1)})
+    free = client.get("/bookings/availability", params={"check_in": check_in + timedelta(days=2), "check_out": check_in + timedelta(days=3)})
+
+    assert busy.json()["available"] is False
+    assert free.json()["available"] is True
+
+
+def test_holidays(client):
+    # 2030-01-06 (Reyes) moves to Monday 2030-01-07
+    response = client.get("/api/v1/calendar/holidays", params={"check_in": "2030-01-04", "check_out": "2030-01-06"})
+    assert response.status_code == 200
+    assert response.json()["has_holiday_in_window"] is True
+
+
+def test_checkout_and_status_polling(client, sync_session):
+    check_in = (date.today() + timedelta(days=30)).isoformat()
+    body = {
+        "check_in": check_in, "check_out": check_in, "guest_count": 5, "policy_type": "day_pass",
+        "payment_method": "ONLINE_GATEWAY", "payment_type": "FULL"
+    }
+    headers = {"Idempotency-Key": "async-1"}
+    first = client.post("/payments/checkout", json=body, headers=headers)
+    replay = client.post("/payments/checkout", json=body, headers=headers)
+
+    assert first.status_code == 200
+    assert replay.json() == first.json()
+    assert sync_session.query(Booking).count() == 1
+
+    status = client.get(f"/payments/{first.json()['payment_id']}/status")
+    assert status.status_code == 200
+    assert status.json()["booking_id"] == first.json()["booking_id"]
+
+    # Same day again -> overbooking
+    assert client.post("/payments/checkout", json=body).status_code == 409
+
+
+def test_checkout_rule_violation(client, sync_session):
+    check_in = (date.today() + timedelta(days=30)).isoformat()
+    body = {
+        "check_in": check_in, "check_out": check_in, "guest_count": 8, "policy_type": "family_plan",
+        "payment_method": "ONLINE_GATEWAY", "payment_type": "FULL"
+    }
+    response = client.post("/payments/checkout", json=body)
+    assert response.status_code == 422
+    assert response.json()["error_code"]
+    assert sync_session.query(Booking).count() == 0
+
+
+def test_content(client, sync_session):
+    sync_session.add_all([
+        models.Testimonial(name="Ana", comment="Excelente", is_approved=True),
+        models.Testimonial(name="Luis", comment="Pendiente", is_approved=False),
+    ])
+    sync_session.commit()
+
+    response = client.get("/content/testimonials")
+    assert [t["name"] for t in response.json()] == ["Ana"]
+    assert client.get("/content/blog/missing").status_code == 404
@@ -0,0 +1,426 @@
+"""
+Unit Tests for availability lookups
+
+Covers:
+- Month-grid calendar (single range query + in-memory sweep)
+- Day Pass vs Nightly semantics on shared days
+- Expired PENDING holds treated as free
+- In-memory interval index coherence with the SQL check
+- Night ledger (DB-enforced no-overlap), including late gateway payments
+- Batch checks and next-available-window search
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.routers import payments
+from app.core.database import Base, get_db
+from app.db.models import Booking, Property, BookingStatus, BookingNight, Payment, PaymentProvider, PaymentStatus
+from app.core.exceptions import OverbookingError, RuleViolationError
+from app.db.repository import BookingRepository
+from app.domain.models import BookingPolicy, BookingRequest, DayStatus
+from app.services.availability_service import AvailabilityService
+from app.services.availability_index import AvailabilityIndex
+from app.services.booking_engine import BookingService
+from app.services.pricing import PricingService
+from app.services.quote_service import QuoteService
+
+
+# In-memory database shared across the session's connections
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+START = date(2030, 3, 1)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Create a fresh database for each test"""
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add(Property(id=1, name="Test Villa", max_guests=20))
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def add_booking(db, check_in, check_out, status=BookingStatus.CONFIRMED, expires_at=None, policy=BookingPolicy.FULL_PROPERTY_WEEKDAY):
+    booking = Booking(
+        property_id=1,
+        check_in=check_in,
+        check_out=check_out,
+        status=status,
+        guest_count=10,
+        policy_type=policy,
+        expires_at=expires_at
+    )
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def day(calendar, d):
+    return next(x for x in calendar["days"] if x["date"] == d)
+
+
+class TestAvailabilityCalendar:
+    """Test the month-grid calendar"""
+
+    def test_empty_calendar_is_free(self, db_session):
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=30))
+
+        assert len(calendar["days"]) == 31
+        assert all(d["status"] == DayStatus.FREE for d in calendar["days"])
+        assert all(d["night_available"] and d["day_pass_available"] for d in calendar["days"])
+
+    def test_night_stay_marks_nights_and_checkout_morning(self, db_session):
+        add_booking(db_session, START + timedelta(days=2), START + timedelta(days=4))
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=6))
+
+        # Day before check-in: night blocked (would overlap), day pass fine
+        before = day(calendar, START + timedelta(days=1))
+        assert before["status"] == DayStatus.FREE
+        assert before["night_available"] is True
+        assert before["day_pass_available"] is True
+
+        for offset in (2, 3):
+            d = day(calendar, START + timedelta(days=offset))
+            assert d["status"] == DayStatus.NIGHT_OCCUPIED
+            assert d["night_available"] is False
+            assert d["day_pass_available"] is False
+
+        # Check-out day: a new night can start, a day pass cannot
+        checkout = day(calendar, START + timedelta(days=4))
+        assert checkout["status"] == DayStatus.FREE
+        assert checkout["night_available"] is True
+        assert checkout["day_pass_available"] is False
+
+    def test_day_pass_blocks_adjacent_night(self, db_session):
+        add_booking(db_session, START + timedelta(days=5), START + timedelta(days=5), policy=BookingPolicy.DAY_PASS)
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=6))
+
+        assert day(calendar, START + timedelta(days=5))["status"] == DayStatus.DAY_PASS_OCCUPIED
+        # Night of day 4 would check out on day 5 morning -> conflicts with the Day Pass
+        assert day(calendar, START + timedelta(days=4))["night_available"] is False
+
+    def test_blocked_and_pending_statuses(self, db_session):
+        add_booking(db_session, START, START + timedelta(days=1), status=BookingStatus.BLOCKED)
+        add_booking(
+            db_session, START + timedelta(days=2), START + timedelta(days=3),
+            status=BookingStatus.PENDING, expires_at=datetime.now() + timedelta(minutes=30)
+        )
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=3))
+
+        assert day(calendar, START)["status"] == DayStatus.BLOCKED
+        assert day(calendar, START + timedelta(days=2))["status"] == DayStatus.PENDING_HOLD
+
+    def test_expired_and_cancelled_are_free(self, db_session):
+        add_booking(
+            db_session, START, START + timedelta(days=1),
+            status=BookingStatus.PENDING, expires_at=datetime.now() - timedelta(minutes=1)
+        )
+        add_booking(db_session, START + timedelta(days=1), START + timedelta(days=2), status=BookingStatus.CANCELLED)
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=2))
+
+        assert all(d["status"] == DayStatus.FREE for d in calendar["days"])
+
+    def test_calendar_matches_check_availability(self, db_session):
+        add_booking(db_session, START + timedelta(days=3), START + timedelta(days=6))
+        add_booking(db_session, START + timedelta(days=9), START + timedelta(days=9), policy=BookingPolicy.DAY_PASS)
+        repo = BookingRepository(db_session)
+        calendar = AvailabilityService.build_calendar(repo, 1, START, START + timedelta(days=12))
+
+        for d in calendar["days"]:
+            assert d["night_available"] == repo.check_availability(1, d["date"], d["date"] + timedelta(days=1))
+            assert d["day_pass_available"] == repo.check_availability(1, d["date"], d["date"])
+
+
+class TestAvailabilityIndex:
+    """Test the in-memory interval index against the SQL check"""
+
+    @pytest.fixture
+    def index(self, db_session):
+        idx = AvailabilityIndex()
+        idx.install()
+        yield idx
+        idx.uninstall()
+
+    def test_index_matches_sql_check(self, db_session, index):
+        today = date.today()
+        add_booking(db_session, today + timedelta(days=3), today + timedelta(days=6))
+        add_booking(db_session, today + timedelta(days=6), today + timedelta(days=8))
+        add_booking(db_session, today + timedelta(days=10), today + timedelta(days=10), policy=BookingPolicy.DAY_PASS)
+        add_booking(db_session, today + timedelta(days=20), today + timedelta(days=40), status=BookingStatus.BLOCKED)
+        add_booking(
+            db_session, today + timedelta(days=12), today + timedelta(days=13),
+            status=BookingStatus.PENDING, expires_at=datetime.now() - timedelta(minutes=5)
+        )
+        index.rebuild(db_session)
+        repo = BookingRepository(db_session)
+
+        for offset in range(0, 45):
+            start = today + timedelta(days=offset)
+            for length in (0, 1, 2, 5):
+                end = start + timedelta(days=length)
+                assert index.is_available(1, start, end) == repo.check_availability(1, start, end), (start, end)
+
+    def test_commit_updates_index_and_rollback_does_not(self, db_session, index):
+        index.rebuild(db_session)
+        start = date.today() + timedelta(days=5)
+        end = start + timedelta(days=2)
+
+        booking = add_booking(db_session, start, end)
+        assert index.is_available(1, start, end) is False
+
+        booking.status = BookingStatus.CANCELLED
+        db_session.commit()
+        assert index.is_available(1, start, end) is True
+
+        db_session.add(Booking(
+            property_id=1, check_in=start, check_out=end, status=BookingStatus.CONFIRMED,
+            guest_count=10, policy_type=BookingPolicy.FULL_PROPERTY_WEEKDAY
+        ))
+        db_session.flush()
+        db_session.rollback()
+        assert index.is_available(1, start, end) is True
+
+
+class TestNightLedger:
+    """Test the booking_nights unique key as the overlap guard"""
+
+    def booking_data(self, check_in, check_out, **extra):
+        data = {
+            "property_id": 1,
+            "check_in": check_in,
+            "check_out": check_out,
+            "status": BookingStatus.CONFIRMED,
+            "guest_count": 10,
+            "policy_type": BookingPolicy.FULL_PROPERTY_WEEKDAY,
+        }
+        data.update(extra)
+        return data
+
+    def test_overlapping_insert_rejected_by_database(self, db_session):
+        repo = BookingRepository(db_session)
+        repo.create_booking(self.booking_data(START, START + timedelta(days=3)))
+
+        # Bypasses check_availability, as a racing transaction would
+        with pytest.raises(OverbookingError):
+            repo.create_booking(self.booking_data(START + timedelta(days=2), START + timedelta(days=4)))
+
+        assert db_session.query(Booking).count() == 1
+
+    def test_back_to_back_nights_allowed(self, db_session):
+        repo = BookingRepository(db_session)
+        repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+        repo.create_booking(self.booking_data(START + timedelta(days=2), START + timedelta(days=4)))
+
+        assert db_session.query(Booking).count() == 2
+
+    def test_day_pass_on_checkout_day_rejected(self, db_session):
+        repo = BookingRepository(db_session)
+        repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+        with pytest.raises(OverbookingError):
+            repo.create_booking(self.booking_data(
+                START + timedelta(days=2), START + timedelta(days=2), policy_type=BookingPolicy.DAY_PASS
+            ))
+
+    def test_cancellation_releases_nights(self, db_session):
+        repo = BookingRepository(db_session)
+        booking = repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+        booking.status = BookingStatus.CANCELLED
+        repo.sync_nights(booking)
+        repo.commit()
+
+        assert db_session.query(BookingNight).count() == 0
+        repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+    def test_date_change_resyncs_nights(self, db_session):
+        repo = BookingRepository(db_session)
+        booking = repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+        booking.check_in = START + timedelta(days=1)
+        booking.check_out = START + timedelta(days=4)
+        repo.sync_nights(booking)
+        repo.commit()
+
+        held = {(n.night, n.slot) for n in db_session.query(BookingNight).filter(BookingNight.booking_id == booking.id)}
+        assert held == set(BookingRepository.night_slots(booking.check_in, booking.check_out))
+        # The freed first night can be booked again
+        repo.create_booking(self.booking_data(START - timedelta(days=1), START + timedelta(days=1)))
+
+    def test_expired_hold_released_before_new_booking(self, db_session):
+        repo = BookingRepository(db_session)
+        hold = repo.create_booking(self.booking_data(
+            START, START + timedelta(days=2),
+            status=BookingStatus.PENDING, expires_at=datetime.now() - timedelta(minutes=1)
+        ))
+
+        assert repo.release_expired_holds(1, START, START + timedelta(days=2)) == 1
+        repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+        db_session.refresh(hold)
+        assert hold.status == BookingStatus.EXPIRED
+
+    def test_late_webhook_records_payment_when_dates_taken(self, db_session):
+        repo = BookingRepository(db_session)
+        hold = repo.create_booking(self.booking_data(
+            START, START + timedelta(days=2),
+            status=BookingStatus.PENDING, expires_at=datetime.now() - timedelta(minutes=1)
+        ))
+        db_session.add(Payment(booking_id=hold.id, provider=PaymentProvider.DUMMY, amount=500000))
+        db_session.commit()
+        repo.release_expired_holds(1, START, START + timedelta(days=2))
+        repo.create_booking(self.booking_data(START, START + timedelta(days=2)))
+
+        app = FastAPI()
+        app.include_router(payments.router, prefix="/payments")
+        app.dependency_overrides[get_db] = lambda: db_session
+        response = TestClient(app).post("/payments/webhook", json={
+            "status": "COMPLETED", "booking_id": hold.id, "transaction_id": "tx-late"
+        })
+
+        # Acknowledged so the gateway stops retrying; the captured money is kept for an admin
+        assert response.status_code == 200
+        assert response.json() == {"status": "needs_review", "booking_id": hold.id}
+        db_session.expire_all()
+        assert hold.status == BookingStatus.EXPIRED
+        assert hold.review_reason
+        assert hold.payments[0].status == PaymentStatus.PAID
+        assert hold.payments[0].transaction_id == "tx-late"
+
+
+class TestBatchAvailability:
+    """Test many ranges answered from one fetch per property"""
+
+    def test_batch_matches_single_checks(self, db_session):
+        add_booking(db_session, START + timedelta(days=3), START + timedelta(days=6))
+        add_booking(db_session, START + timedelta(days=9), START + timedelta(days=9), policy=BookingPolicy.DAY_PASS)
+        add_booking(db_session, START + timedelta(days=14), START + timedelta(days=30), status=BookingStatus.BLOCKED)
+        repo = BookingRepository(db_session)
+
+        ranges = []
+        for offset in range(0, 35):
+            for length in (0, 1, 2, 7):
+                start = START + timedelta(days=offset)
+                ranges.append((1, start, start + timedelta(days=length)))
+        # Another property with no bookings
+        ranges.append((2, START + timedelta(days=4), START + timedelta(days=5)))
+
+        results = AvailabilityService.check_many(repo, ranges)
+
+        expected = [repo.check_availability(p, s, e) for p, s, e in ranges]
+        assert results == expected
+        assert results[-1] is True
+
+
+class TestNextAvailable:
+    """Test the free-gap search for the next valid windows"""
+
+    def brute_force(self, repo, policy, nights, guests, start, limit, horizon):
+        service = BookingService(repo)
+        found = []
+        for offset in range(horizon):
+            check_in = start + timedelta(days=offset)
+            request = BookingRequest(
+                check_in=check_in, check_out=check_in + timedelta(days=nights),
+                guest_count=guests, policy_type=policy
+            )
+            if not repo.check_availability(1, request.check_in, request.check_out):
+                continue
+            try:
+                service.validate_request(request)
+            except RuleViolationError:
+                continue
+            found.append({"check_in": request.check_in, "check_out": request.check_out})
+            if len(found) == limit:
+                break
+        return found
+
+    @pytest.mark.parametrize("policy,nights,guests", [
+        (BookingPolicy.FULL_PROPERTY_WEEKDAY, 2, 12),
+        (BookingPolicy.FULL_PROPERTY_WEEKEND, 2, 12),
+        (BookingPolicy.FULL_PROPERTY_HOLIDAY, 3, 12),
+        (BookingPolicy.FAMILY_PLAN, 1, 4),
+        (BookingPolicy.DAY_PASS, 0, 8),
+    ])
+    def test_matches_brute_force(self, db_session, policy, nights, guests):
+        add_booking(db_session, START + timedelta(days=3), START + timedelta(days=6))
+        add_booking(db_session, START + timedelta(days=9), START + timedelta(days=9), policy=BookingPolicy.DAY_PASS)
+        add_booking(db_session, START + timedelta(days=14), START + timedelta(days=30), status=BookingStatus.BLOCKED)
+        repo = BookingRepository(db_session)
+
+        windows = AvailabilityService.next_windows(repo, 1, policy, nights, guests, START, limit=8, horizon_days=120)
+
+        assert windows == self.brute_force(repo, policy, nights, guests, START, 8, 120)
+        assert len(windows) == 8
+
+    def test_invalid_guest_count_finds_nothing(self, db_session):
+        repo = BookingRepository(db_session)
+        windows = AvailabilityService.next_windows(
+            repo, 1, BookingPolicy.FULL_PROPERTY_WEEKEND, 2, 5, START, limit=3
+        )
+        assert windows == []
+
+
+class TestQuote:
+    """Test the all-policies quote for a date range"""
+
+    def test_weekend_quote(self, db_session):
+        repo = BookingRepository(db_session)
+        # Friday -> Sunday, 12 guests
+        quote = QuoteService.quote(repo, 1, START, START + timedelta(days=2), 12)
+        policies = {p["policy_type"]: p for p in quote["policies"]}
+
+        assert quote["available"] is True
+        assert len(policies) == len(BookingPolicy)
+        assert [p for p, q in policies.items() if q["eligible"]] == [BookingPolicy.FULL_PROPERTY_WEEKEND]
+        assert [v["rule_name"] for v in policies[BookingPolicy.FAMILY_PLAN]["violations"]] == [
+            "FAMILY_PLAN_LIMIT_EXCEEDED", "FAMILY_PLAN_ONE_NIGHT"
+        ]
+        assert policies[BookingPolicy.FULL_PROPERTY_WEEKEND]["pricing"] == PricingService.calculate_total(
+            START, START + timedelta(days=2), 12, BookingPolicy.FULL_PROPERTY_WEEKEND
+        )
+
+    def test_occupied_dates_are_not_eligible(self, db_session):
+        add_booking(db_session, START, START + timedelta(days=2))
+        repo = BookingRepository(db_session)
+        quote = QuoteService.quote(repo, 1, START, START + timedelta(days=2), 12)
+
+        assert quote["available"] is False
+        assert not any(p["eligible"] for p in quote["policies"])
+        # Rules are still reported so the client knows which plan fits the dates
+        weekend = next(p for p in quote["policies"] if p["policy_type"] == BookingPolicy.FULL_PROPERTY_WEEKEND)
+        assert weekend["violations"] == []
+
+
+class TestAdminOverride:
+    """Test that overrides record every bypassed rule"""
+
+    def test_override_records_all_violations(self, db_session):
+        service = BookingService(BookingRepository(db_session))
+        # Thursday -> Saturday, 4 guests: weekday plan breaks people + weekday rules
+        request = BookingRequest(
+            check_in=START + timedelta(days=6), check_out=START + timedelta(days=8),
+            guest_count=4, policy_type=BookingPolicy.FULL_PROPERTY_WEEKDAY
+        )
+
+        with pytest.raises(RuleViolationError):
+            service.create_booking(request, 1)
+
+        booking = service.create_booking(request, 1, is_override=True, override_reason="Cliente VIP", admin_id=1)
+        assert "MIN_PEOPLE_NOT_MET" in booking.rules_bypassed
+        assert "INVALID_WEEKDAY_DATES" in booking.rules_bypassed
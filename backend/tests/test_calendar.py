@@ -0,0 +1,155 @@
+"""
+Unit Tests for the holiday calendar
+
+Covers:
+- Merged holiday cache (algorithmic + DB overrides)
+- Write-through invalidation on add_holiday
+- No SQL in steady state
+- Precomputed per-date holiday window table
+"""
+
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.holidays_co import get_colombian_holidays
+from app.db.repository import BookingRepository
+from app.services.calendar_service import CalendarService, window_table
+from app.services.holiday_cache import holiday_cache
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def repo():
+    """Fresh database and empty cache for each test"""
+    Base.metadata.create_all(bind=engine)
+    holiday_cache.invalidate()
+    session = TestingSessionLocal()
+    yield BookingRepository(session)
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+    holiday_cache.invalidate()
+
+
+@pytest.fixture
+def sql_counter():
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+
+
+class TestHolidayCache:
+    def test_merges_algorithmic_and_db_holidays(self, repo):
+        repo.add_holiday(date(2030, 2, 14), "Festivo local")
+
+        result = CalendarService.get_holidays_in_range(repo, date(2029, 12, 1), date(2030, 3, 31))
+
+        expected = sorted(
+            {h["date"] for y in (2029, 2030) for h in get_colombian_holidays(y)
+             if date(2029, 12, 1) <= h["date"] <= date(2030, 3, 31)} | {date(2030, 2, 14)}
+        )
+        assert result == expected
+
+    def test_add_holiday_invalidates(self, repo):
+        assert CalendarService.get_holidays_in_range(repo, date(2030, 2, 14), date(2030, 2, 14)) == []
+        version = holiday_cache.version
+
+        repo.add_holiday(date(2030, 2, 14), "Festivo local")
+
+        assert holiday_cache.version != version
+        assert CalendarService.get_holidays_in_range(repo, date(2030, 2, 14), date(2030, 2, 14)) == [date(2030, 2, 14)]
+
+    def test_steady_state_runs_no_sql(self, repo, sql_counter):
+        CalendarService.check_holiday_window(repo, date(2030, 1, 4), date(2030, 1, 6))
+        warm = len(sql_counter)
+
+        for _ in range(20):
+            context = CalendarService.check_holiday_window(repo, date(2030, 1, 4), date(2030, 1, 6))
+
+        assert len(sql_counter) == warm
+        assert context["has_holiday_in_window"] is True
+
+
+class TestHolidayWindowTable:
+    def test_table_matches_direct_computation(self, repo):
+        holidays = CalendarService.get_holidays_in_range(repo, date(2028, 12, 20), date(2031, 1, 10))
+        day = date(2029, 1, 1)
+        while day <= date(2030, 12, 31):
+            check_out = day + timedelta(days=2)
+            assert CalendarService.check_holiday_window(repo, day, check_out) == \
+                CalendarService.holiday_window(day, check_out, holidays), day
+            day += timedelta(days=1)
+
+    def test_anchor_sunday(self, repo):
+        # Friday 2030-01-04 -> Sunday 2030-01-06, window Thu 3 .. Mon 7 (Reyes moved to Monday)
+        entry = window_table.lookup(repo, date(2030, 1, 4))
+        assert entry.anchor_sunday == date(2030, 1, 6)
+        assert (entry.window_start, entry.window_end) == (date(2030, 1, 3), date(2030, 1, 7))
+        assert entry.holidays_in_window == (date(2030, 1, 7),)
+
+    def test_rebuilt_after_add_holiday(self, repo):
+        assert CalendarService.check_holiday_window(repo, date(2030, 2, 15), date(2030, 2, 17))["has_holiday_in_window"] is False
+
+        repo.add_holiday(date(2030, 2, 18), "Festivo local")
+
+        assert CalendarService.check_holiday_window(repo, date(2030, 2, 15), date(2030, 2, 17))["has_holiday_in_window"] is True
+
+
+class TestHolidaysHttpCache:
+    @pytest.fixture
+    def client(self, repo):
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.core.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: repo.db
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_db, None)
+
+    def test_etag_and_not_modified(self, client):
+        params = {"check_in": "2030-01-04", "check_out": "2030-01-06"}
+        first = client.get("/api/v1/calendar/holidays", params=params)
+
+        assert first.status_code == 200
+        assert first.json()["has_holiday_in_window"] is True
+        etag = first.headers["ETag"]
+        assert "max-age" in first.headers["Cache-Control"]
+
+        second = client.get("/api/v1/calendar/holidays", params=params, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+
+        other = client.get("/api/v1/calendar/holidays", params={"check_in": "2030-02-01", "check_out": "2030-02-03"})
+        assert other.headers["ETag"] != etag
+
+    def test_etag_changes_with_holiday_data(self, client, repo):
+        params = {"check_in": "2030-02-15", "check_out": "2030-02-17"}
+        etag = client.get("/api/v1/calendar/holidays", params=params).headers["ETag"]
+
+        repo.add_holiday(date(2030, 2, 18), "Festivo local")
+
+        response = client.get("/api/v1/calendar/holidays", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["has_holiday_in_window"] is True
+
+    def test_year_endpoint(self, client):
+        response = client.get("/api/v1/calendar/holidays/year/2030")
+
+        assert response.status_code == 200
+        holidays = response.json()["holidays"]
+        assert len(holidays) == len({h["date"] for h in get_colombian_holidays(2030)})
+        assert holidays == sorted(holidays, key=lambda h: h["date"])
+
+        cached = client.get("/api/v1/calendar/holidays/year/2030", headers={"If-None-Match": response.headers["ETag"]})
+        assert cached.status_code == 304
@@ -0,0 +1,51 @@
+"""
+Unit Tests for the date-span classifier (domain/date_span.py)
+"""
+
+from datetime import date, timedelta
+
+from app.domain import date_span
+
+
+def brute_force_mask(check_in, check_out):
+    mask = 0
+    day = check_in
+    while day < check_out:
+        mask |= 1 << day.weekday()
+        day += timedelta(days=1)
+    return mask
+
+
+class TestWeekdayMask:
+    def test_matches_day_by_day_walk(self):
+        start = date(2030, 3, 4) # Monday
+        for offset in range(7):
+            check_in = start + timedelta(days=offset)
+            for nights in range(0, 16):
+                check_out = check_in + timedelta(days=nights)
+                assert date_span.weekday_mask(check_in, check_out) == brute_force_mask(check_in, check_out), (check_in, nights)
+
+    def test_weekend_and_weekday_spans(self):
+        friday = date(2030, 3, 8)
+        weekend = date_span.classify(friday, friday + timedelta(days=2))
+        assert weekend.only_on(date_span.FRI_SAT)
+        assert not weekend.only_on(date_span.MON_THU)
+
+        # Thursday -> Saturday wraps into the weekend
+        thursday = date(2030, 3, 7)
+        mixed = date_span.classify(thursday, thursday + timedelta(days=2))
+        assert not mixed.only_on(date_span.MON_THU)
+        assert mixed.includes_any(date_span.FRI_SUN)
+
+        # Sunday night -> Monday wraps across the week boundary
+        sunday = date(2030, 3, 10)
+        assert date_span.weekday_mask(sunday, sunday + timedelta(days=2)) == 0b1000001
+
+    def test_holiday_flags_from_context(self):
+        span = date_span.classify(date(2030, 1, 4), date(2030, 1, 7), {
+            "holidays_in_range": [date(2030, 1, 7)],
+            "has_holiday_in_window": True
+        })
+        assert span.has_holiday
+        assert span.has_holiday_in_window
+        assert span.nights == 3
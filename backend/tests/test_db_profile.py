@@ -0,0 +1,45 @@
+"""
+Tests for the database profile layer (core/db_profile.py)
+"""
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db_profile import create_profiled_engine, engine_options, pool_stats
+
+
+def test_tuned_sqlite_applies_pragmas(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path / 'tuned.db'}", profile="tuned")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1 # NORMAL
+    engine.dispose()
+
+
+def test_default_profile_leaves_sqlite_untouched(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path / 'plain.db'}", profile="default")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "delete"
+    engine.dispose()
+
+
+def test_server_profile_options():
+    options = engine_options("postgresql://u:p@db/villa", profile="tuned")
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["pool_pre_ping"] is True
+    assert f"statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}" in options["connect_args"]["options"]
+
+    async_options = engine_options("postgresql+asyncpg://u:p@db/villa", profile="tuned")
+    assert async_options["connect_args"]["server_settings"]["statement_timeout"] == str(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    assert engine_options("postgresql://u:p@db/villa", profile="default") == {}
+
+
+def test_pool_stats(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    with engine.connect():
+        stats = pool_stats(engine)
+    assert stats["checkedout"] == 1
+    assert "status" in stats
+    engine.dispose()
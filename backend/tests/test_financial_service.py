@@ -7,6 +7,7 @@ Tests edge cases including:
 - Multiple payments per booking
 - Date filtering on Payment.confirmed_at
 - Currency normalization
+- SQL GROUP BY summary and the revenue_daily rollup
 """
 
 import pytest
@@ -17,11 +18,14 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.database import Base
 from app.db.models import (
-    Booking, Payment, Property, User,
+    Booking, Payment, Property, User, RevenueDaily,
     BookingStatus, PaymentStatus, PaymentMethod, PaymentProvider
 )
 from app.domain.models import BookingPolicy
 from app.services.financial_service import FinancialService
+from app.services.payment_state_engine import PaymentStateEngine
+from app.services.revenue_rollup import revenue_rollup
+from app.core import money
 
 
 # Test Database Setup
@@ -638,3 +642,289 @@ class TestCurrencyNormalization:
         assert summary['revenue_by_plan'] == {}
         assert summary['revenue_by_channel']['online'] == 0.0
         assert summary['revenue_by_channel']['admin'] == 0.0
+
+
+class TestIntegerCents:
+    """Test integer minor-unit money (core/money.py + Payment.amount_cents)"""
+
+    def test_conversions(self):
+        assert money.to_cents(100000) == 10000000
+        assert money.to_cents(100000.555) == 10000056
+        assert money.to_cents(0.1) + money.to_cents(0.2) == money.to_cents(0.3)
+        assert money.to_cents(None) == 0
+        assert money.from_cents(10000056) == 100000.56
+        assert money.to_decimal(10000056) == Decimal("100000.56")
+        # 50% deposit of an odd amount rounds half up
+        assert money.fraction(101, 1, 2) == 51
+        assert money.fraction(1510000 * 100, 1, 2) == 755000 * 100
+
+    def test_payment_amount_is_stored_as_cents(self, setup_test_data):
+        db = setup_test_data
+        booking = Booking(
+            id=1, property_id=1, check_in=date.today(), check_out=date.today() + timedelta(days=1),
+            status=BookingStatus.CONFIRMED, guest_count=2, policy_type=BookingPolicy.FAMILY_PLAN
+        )
+        db.add(booking)
+        db.add(Payment(
+            booking_id=1, provider=PaymentProvider.DUMMY, payment_method=PaymentMethod.ONLINE_GATEWAY,
+            amount=755000.5, status=PaymentStatus.PAID, confirmed_at=date.today()
+        ))
+        db.commit()
+
+        payment = db.query(Payment).filter(Payment.amount > 755000).one()
+        assert payment.amount_cents == 75500050
+        assert payment.amount == 755000.5
+        assert FinancialService._get_booking_revenue(booking, db) == Decimal("755000.50")
+
+    def test_booking_amounts_are_stored_as_cents(self, setup_test_data):
+        db = setup_test_data
+        db.add(Booking(
+            id=1, property_id=1, check_in=date.today(), check_out=date.today() + timedelta(days=1),
+            status=BookingStatus.CONFIRMED, guest_count=2, policy_type=BookingPolicy.FAMILY_PLAN,
+            manual_total_amount=100000.555, subtotal=0.1, cleaning_fee=0.2, total_amount=0.3
+        ))
+        db.commit()
+
+        booking = db.query(Booking).filter(Booking.total_amount == 0.3).one()
+        assert (booking.manual_total_cents, booking.subtotal_cents, booking.cleaning_fee_cents, booking.total_cents) == (10000056, 10, 20, 30)
+        assert booking.subtotal_cents + booking.cleaning_fee_cents == booking.total_cents
+        assert booking.manual_total_amount == 100000.56
+        booking.total_amount = None
+        assert booking.total_cents is None and booking.total_amount is None
+
+
+class TestGroupedAggregation:
+    """Test the SQL GROUP BY summary against the streamed detail rows"""
+
+    def test_summary_matches_detail_rows(self, setup_test_data):
+        db = setup_test_data
+        plans = [BookingPolicy.FAMILY_PLAN, BookingPolicy.FULL_PROPERTY_WEEKDAY, BookingPolicy.FULL_PROPERTY_WEEKEND]
+        methods = [PaymentMethod.ONLINE_GATEWAY, PaymentMethod.BANK_TRANSFER, PaymentMethod.DIRECT_ADMIN_AGREEMENT]
+        for i in range(1, 13):
+            db.add(Booking(
+                id=i, property_id=1, check_in=date.today(), check_out=date.today() + timedelta(days=1),
+                status=BookingStatus.CONFIRMED if i % 4 else BookingStatus.CANCELLED,
+                guest_count=2, policy_type=plans[i % 3], created_by_admin_id=1 if i % 2 else None
+            ))
+            # Two payments per booking, one of them not yet paid on odd bookings
+            db.add(Payment(
+                booking_id=i, provider=PaymentProvider.DUMMY, payment_method=methods[i % 3],
+                amount=1000 * i + 0.25, status=PaymentStatus.PAID, confirmed_at=date.today()
+            ))
+            db.add(Payment(
+                booking_id=i, provider=PaymentProvider.DUMMY, payment_method=methods[(i + 1) % 3],
+                amount=500, status=PaymentStatus.PENDING_PAYMENT if i % 2 else PaymentStatus.CONFIRMED_DIRECT_PAYMENT,
+                confirmed_at=date.today()
+            ))
+        db.commit()
+
+        summary = FinancialService.calculate_revenue_summary(db)
+        details = FinancialService.iter_revenue_details(db)
+        assert not isinstance(details, list)  # Streamed
+        rows = list(details)
+
+        def fold(key):
+            totals = {}
+            for row in rows:
+                totals[row[key]] = totals.get(row[key], 0) + money.to_cents(row['amount'])
+            return {k: money.from_cents(v) for k, v in totals.items()}
+
+        assert summary['total_bookings_confirmed'] == len({row['booking_id'] for row in rows}) == 9
+        assert summary['total_revenue'] == money.from_cents(sum(money.to_cents(row['amount']) for row in rows))
+        assert summary['revenue_by_plan'] == fold('plan')
+        assert summary['revenue_by_payment_method'] == fold('payment_method')
+        assert summary['revenue_by_channel'] == fold('channel')
+        assert FinancialService.get_revenue_details(db) == rows
+
+
+class TestRevenueRollup:
+    """Test the revenue_daily rollup maintained on flush"""
+
+    @pytest.fixture(autouse=True)
+    def rollup(self, setup_test_data):
+        revenue_rollup.install()
+        revenue_rollup.ensure_built(setup_test_data)
+        yield
+        revenue_rollup.uninstall()
+
+    def pending(self, db, booking_id, method, status, day=date(2030, 1, 10), amount=250000.5):
+        db.add(Booking(
+            id=booking_id, property_id=1, check_in=day, check_out=day + timedelta(days=1),
+            status=BookingStatus.PENDING, guest_count=2, policy_type=BookingPolicy.FAMILY_PLAN,
+            created_by_admin_id=1 if method == PaymentMethod.DIRECT_ADMIN_AGREEMENT else None
+        ))
+        payment = Payment(
+            booking_id=booking_id, provider=PaymentProvider.DUMMY, payment_method=method,
+            amount=amount, status=status, evidence_url="https://example.com/proof.png"
+        )
+        db.add(payment)
+        db.commit()
+        return payment
+
+    def raw_summary(self, db, **dates):
+        revenue_rollup.ready = False
+        try:
+            return FinancialService.calculate_revenue_summary(db, **dates)
+        finally:
+            revenue_rollup.ready = True
+
+    def test_state_transitions_update_rollup(self, setup_test_data):
+        db = setup_test_data
+        transfer = self.pending(db, 1, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION)
+        direct = self.pending(db, 2, PaymentMethod.DIRECT_ADMIN_AGREEMENT, PaymentStatus.PENDING_DIRECT_PAYMENT,
+                              day=date(2030, 2, 10))
+        rejected = self.pending(db, 3, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION,
+                                day=date(2030, 3, 10))
+        assert db.query(RevenueDaily).count() == 0
+
+        PaymentStateEngine.confirm_bank_transfer(transfer.id, 1, db)
+        PaymentStateEngine.confirm_direct_payment(direct.id, 1, db)
+        PaymentStateEngine.reject_payment(rejected.id, 1, "Comprobante ilegible", db)
+
+        rows = {(r.payment_method, r.channel): (r.amount_cents, r.payments) for r in db.query(RevenueDaily).all()}
+        assert rows == {
+            (PaymentMethod.BANK_TRANSFER, 'online'): (25000050, 1),
+            (PaymentMethod.DIRECT_ADMIN_AGREEMENT, 'admin'): (25000050, 1),
+        }
+        assert FinancialService.calculate_revenue_summary(db) == self.raw_summary(db)
+
+        # Refund and booking cancellation take the revenue out again
+        transfer.status = PaymentStatus.REFUNDED
+        db.query(Booking).filter(Booking.id == 2).one().status = BookingStatus.CANCELLED
+        db.commit()
+        assert db.query(RevenueDaily).count() == 0
+        assert FinancialService.calculate_revenue_summary(db)['total_revenue'] == 0.0
+
+    def test_rollback_leaves_rollup_untouched(self, setup_test_data):
+        db = setup_test_data
+        transfer = self.pending(db, 1, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION)
+        transfer.status = PaymentStatus.PAID
+        transfer.confirmed_at = date.today()
+        transfer.booking.status = BookingStatus.CONFIRMED
+        db.flush()
+        assert db.query(RevenueDaily).count() == 1
+        db.rollback()
+        assert db.query(RevenueDaily).count() == 0
+
+    def test_rebuild_matches_incremental(self, setup_test_data):
+        db = setup_test_data
+        for i in range(1, 8):
+            payment = self.pending(db, i, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION,
+                                   day=date(2030, 1, 2 * i), amount=1000 * i)
+            PaymentStateEngine.confirm_bank_transfer(payment.id, 1, db)
+            payment.confirmed_at = date(2030, 1, 1 + i % 3)  # Backdated: moves between days
+            db.commit()
+
+        incremental = sorted((r.day, r.amount_cents, r.payments) for r in db.query(RevenueDaily).all())
+        revenue_rollup.rebuild(db)
+        assert sorted((r.day, r.amount_cents, r.payments) for r in db.query(RevenueDaily).all()) == incremental
+        assert len(incremental) == 3
+
+        dates = {"start_date": date(2030, 1, 2), "end_date": date(2030, 1, 3)}
+        assert FinancialService.calculate_revenue_summary(db, **dates) == self.raw_summary(db, **dates)
+
+    def test_booking_count_is_distinct_over_range(self, setup_test_data):
+        db = setup_test_data
+        deposit = self.pending(db, 1, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION)
+        PaymentStateEngine.confirm_bank_transfer(deposit.id, 1, db)
+        deposit.confirmed_at = date(2030, 1, 5)
+        for day in (date(2030, 1, 20), date(2030, 1, 25)):
+            db.add(Payment(
+                booking_id=1, provider=PaymentProvider.DUMMY, payment_method=PaymentMethod.ONLINE_GATEWAY,
+                amount=1000, status=PaymentStatus.PAID, confirmed_at=day
+            ))
+        db.commit()
+
+        # Deposit before the range, two installments inside it: one booking
+        january = {"start_date": date(2030, 1, 10), "end_date": date(2030, 1, 31)}
+        summary = FinancialService.calculate_revenue_summary(db, **january)
+        assert summary['total_revenue'] == 2000.0
+        assert summary['total_bookings_confirmed'] == 1
+        assert summary == self.raw_summary(db, **january)
+
+        series = FinancialService.calculate_revenue_timeseries(db, "day", **january)
+        assert series['total_bookings_confirmed'] == 1
+        assert [b['period_start'] for b in series['series'] if b['bookings']] == ['2030-01-20']
+
+    def test_ensure_built_repairs_drift(self, setup_test_data):
+        db = setup_test_data
+        self.pending(db, 1, PaymentMethod.BANK_TRANSFER, PaymentStatus.AWAITING_CONFIRMATION)
+        assert revenue_rollup.verify(db)
+
+        # Written with the hooks off (offline script, other deploy)
+        revenue_rollup.uninstall()
+        payment = db.query(Payment).one()
+        payment.status = PaymentStatus.PAID
+        payment.confirmed_at = date(2030, 1, 10)
+        payment.booking.status = BookingStatus.CONFIRMED
+        db.commit()
+        revenue_rollup.install()
+        assert db.query(RevenueDaily).count() == 0
+        assert not revenue_rollup.verify(db)
+
+        revenue_rollup.ensure_built(db)
+        assert revenue_rollup.verify(db)
+        assert [(r.amount_cents, r.payments) for r in db.query(RevenueDaily).all()] == [(25000050, 1)]
+
+
+class TestRevenueTimeseries:
+    """Test day / week / month buckets against the summary"""
+
+    @pytest.fixture
+    def payments(self, setup_test_data):
+        db = setup_test_data
+        # 2030-01-28 is a Monday; one booking paid in two installments across months
+        days = [date(2030, 1, 28), date(2030, 1, 31), date(2030, 2, 3), date(2030, 2, 4), date(2030, 3, 15)]
+        for i, day in enumerate(days, start=1):
+            db.add(Booking(
+                id=i, property_id=1, check_in=day, check_out=day + timedelta(days=1),
+                status=BookingStatus.CONFIRMED, guest_count=2, policy_type=BookingPolicy.FAMILY_PLAN,
+                created_by_admin_id=1 if i % 2 else None
+            ))
+            db.add(Payment(
+                booking_id=i, provider=PaymentProvider.DUMMY, payment_method=PaymentMethod.BANK_TRANSFER,
+                amount=100000 * i + 0.5, status=PaymentStatus.PAID, confirmed_at=day
+            ))
+        db.add(Payment(
+            booking_id=1, provider=PaymentProvider.DUMMY, payment_method=PaymentMethod.ONLINE_GATEWAY,
+            amount=50000, status=PaymentStatus.PAID, confirmed_at=date(2030, 2, 4)
+        ))
+        db.commit()
+        return db
+
+    @pytest.mark.parametrize("use_rollup", [False, True])
+    def test_buckets_match_summary(self, payments, use_rollup):
+        db = payments
+        if use_rollup:
+            revenue_rollup.install()
+            revenue_rollup.rebuild(db)
+        try:
+            start, end = date(2030, 1, 15), date(2030, 3, 20)
+            summary = FinancialService.calculate_revenue_summary(db, start_date=start, end_date=end)
+
+            for bucket, count in (("day", 65), ("week", 10), ("month", 3)):
+                result = FinancialService.calculate_revenue_timeseries(db, bucket, start, end)
+                series = result['series']
+                assert len(series) == count == FinancialService.count_buckets(start, end, bucket)
+                assert series[0]['period_start'] == start.isoformat()
+                assert series[-1]['period_end'] == end.isoformat()
+                assert result['total_revenue'] == summary['total_revenue']
+                assert result['total_bookings_confirmed'] == summary['total_bookings_confirmed'] == 5
+                assert sum(money.to_cents(b['revenue']) for b in series) == money.to_cents(summary['total_revenue'])
+
+            months = FinancialService.calculate_revenue_timeseries(db, "month", start, end)['series']
+            assert [b['revenue'] for b in months] == [300001.0, 750001.0, 500000.5]
+            assert [b['bookings'] for b in months] == [2, 2, 1]  # Booking 1 counts in January only
+            assert [b['payments'] for b in months] == [2, 3, 1]
+            assert months[1]['revenue_by_payment_method'] == {'BANK_TRANSFER': 700001.0, 'ONLINE_GATEWAY': 50000.0}
+
+            weeks = FinancialService.calculate_revenue_timeseries(db, "week", start, end)['series']
+            assert weeks[2] == {
+                'period_start': '2030-01-28', 'period_end': '2030-02-03',
+                'revenue': 600001.5, 'payments': 3, 'bookings': 3,
+                'revenue_by_plan': {'family_plan': 600001.5},
+                'revenue_by_payment_method': {'BANK_TRANSFER': 600001.5},
+                'revenue_by_channel': {'online': 200000.5, 'admin': 400001.0}
+            }
+        finally:
+            revenue_rollup.uninstall()
@@ -0,0 +1,168 @@
+"""
+Tests for /payments/checkout: Idempotency-Key handling and the single unit of work
+
+Covers:
+- Replay returns the stored response without creating a second booking
+- Same key with a different body is rejected
+- In-flight key (no stored response yet) is rejected
+- Bulk purge of expired keys
+- Gateway failure compensated (hold cancelled, nights released)
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.core.database import Base, get_db
+from app.core.exceptions import IdempotencyError
+from app.db.models import Booking, Payment, Property, IdempotencyKey, BookingNight, BookingStatus, PaymentStatus
+from app.services.idempotency import IdempotencyService
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Fresh in-memory database, wired into the app"""
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add(Property(id=1, name="Test Villa", max_guests=20))
+    session.commit()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield session
+    app.dependency_overrides.pop(get_db, None)
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(db_session):
+    return TestClient(app)
+
+
+def checkout_body(days_ahead=30, guests=5):
+    check_in = date.today() + timedelta(days=days_ahead)
+    return {
+        "check_in": check_in.isoformat(),
+        "check_out": check_in.isoformat(),
+        "guest_count": guests,
+        "policy_type": "day_pass",
+        "guest_name": "Ana Test",
+        "guest_email": "ana@test.com",
+        "payment_method": "BANK_TRANSFER",
+        "payment_type": "FULL"
+    }
+
+
+class TestCheckoutIdempotency:
+    def test_replay_returns_stored_response(self, client, db_session):
+        headers = {"Idempotency-Key": "checkout-abc"}
+        first = client.post("/payments/checkout", json=checkout_body(), headers=headers)
+        second = client.post("/payments/checkout", json=checkout_body(), headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers.get("Idempotent-Replayed") == "true"
+        assert db_session.query(Booking).count() == 1
+        assert db_session.query(Payment).count() == 1
+
+    def test_without_key_second_request_conflicts(self, client, db_session):
+        assert client.post("/payments/checkout", json=checkout_body()).status_code == 200
+        assert client.post("/payments/checkout", json=checkout_body()).status_code == 409
+
+    def test_same_key_different_body_rejected(self, client, db_session):
+        headers = {"Idempotency-Key": "checkout-xyz"}
+        assert client.post("/payments/checkout", json=checkout_body(), headers=headers).status_code == 200
+
+        response = client.post("/payments/checkout", json=checkout_body(guests=3), headers=headers)
+        assert response.status_code == 422
+        assert db_session.query(Booking).count() == 1
+
+    def test_in_flight_key_rejected(self, db_session):
+        request_hash = IdempotencyService.request_hash({"a": 1})
+        assert IdempotencyService.begin(db_session, "k1", request_hash) is None
+
+        with pytest.raises(IdempotencyError) as exc:
+            IdempotencyService.begin(db_session, "k1", request_hash)
+        assert exc.value.status_code == 409
+
+        IdempotencyService.complete(db_session, "k1", 200, {"ok": True})
+        assert IdempotencyService.begin(db_session, "k1", request_hash) == (200, {"ok": True})
+
+    def test_purge_expired(self, db_session):
+        now = datetime.now()
+        db_session.add_all([
+            IdempotencyKey(key="old", request_hash="h", status_code=200, response="{}", expires_at=now - timedelta(hours=1)),
+            IdempotencyKey(key="new", request_hash="h", status_code=200, response="{}", expires_at=now + timedelta(hours=1)),
+        ])
+        db_session.commit()
+
+        assert IdempotencyService.purge_expired(db_session) == 1
+        assert [k.key for k in db_session.query(IdempotencyKey).all()] == ["new"]
+
+
+class TestCheckoutUnitOfWork:
+    def test_online_checkout_stores_transaction(self, client, db_session):
+        body = dict(checkout_body(), payment_method="ONLINE_GATEWAY")
+        response = client.post("/payments/checkout", json=body)
+
+        assert response.status_code == 200
+        payment = db_session.query(Payment).one()
+        assert payment.transaction_id == f"dummy_txn_{response.json()['booking_id']}"
+
+    def test_gateway_failure_cancels_hold(self, client, db_session, monkeypatch):
+        from app.core.payments.dummy import DummyPaymentAdapter
+
+        def failing_intent(self, **kwargs):
+            raise RuntimeError("gateway down")
+        monkeypatch.setattr(DummyPaymentAdapter, "create_payment_intent", failing_intent)
+
+        body = dict(checkout_body(), payment_method="ONLINE_GATEWAY")
+        assert client.post("/payments/checkout", json=body).status_code == 502
+
+        booking = db_session.query(Booking).one()
+        assert booking.status == BookingStatus.CANCELLED
+        assert db_session.query(Payment).one().status == PaymentStatus.FAILED
+        assert db_session.query(BookingNight).count() == 0
+
+    def test_booking_stores_priced_totals(self, client, db_session):
+        from app.services.pricing import PricingService
+
+        response = client.post("/payments/checkout", json=checkout_body(guests=4))
+        assert response.status_code == 200
+
+        booking = db_session.query(Booking).one()
+        assert booking.subtotal == 4 * PricingService.PASADIA_RATE
+        assert booking.cleaning_fee == 0
+        assert booking.total_amount == response.json()["total_amount"]
+        assert booking.pricing_version == PricingService.PRICING_VERSION
+
+    def test_rule_violation_persists_nothing(self, client, db_session):
+        body = dict(checkout_body(), policy_type="family_plan", guest_count=8)
+        response = client.post("/payments/checkout", json=body)
+        # Global RuleViolationError handler: the frontend translates error_code
+        assert response.status_code == 422
+        assert response.json()["error_code"] == response.json()["details"]["rule"]
+        assert response.json()["error_code"]
+        assert db_session.query(Booking).count() == 0
+
+    def test_rule_violation_with_key_is_not_stored(self, client, db_session):
+        body = dict(checkout_body(), policy_type="family_plan", guest_count=8)
+        headers = {"Idempotency-Key": "rule-1"}
+        assert client.post("/payments/checkout", json=body, headers=headers).status_code == 422
+        assert client.post("/payments/checkout", json=body, headers=headers).status_code == 422
@@ -0,0 +1,189 @@
+"""
+Tests for dated rates: rate_plans table + in-memory rate index (services/rate_index.py)
+
+Covers:
+- Overlapping plans flattened (later start wins), open-ended plans
+- Fallback to the PricingService constants outside any plan / before the first load
+- Hot reload after commit (rollback ignored)
+- Per-night pricing across a rate change
+- Price calendar (/pricing/calendar): matches calculate_total, memo keyed on rates, ETag
+"""
+
+import pytest
+from collections import namedtuple
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.db.models import RatePlan
+from app.domain.models import BookingPolicy
+from app.services.pricing import PricingService, AdminPricingService
+from app.services.rate_index import flatten, rate_index
+from app.services.holiday_cache import holiday_cache
+from app.services.price_calendar import PriceCalendarService
+from app.db.repository import BookingRepository
+
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Plan = namedtuple("Plan", ["id", "rate", "valid_from", "valid_to"])
+MONDAY = date(2030, 6, 3)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    rate_index.install()
+    rate_index.rebuild(db)
+    try:
+        yield db
+    finally:
+        db.close()
+        rate_index.uninstall()
+        rate_index.reset()
+        Base.metadata.drop_all(bind=engine)
+
+
+def add_plan(db, policy, rate, valid_from, valid_to=None):
+    db.add(RatePlan(policy_type=policy, rate=rate, valid_from=valid_from, valid_to=valid_to))
+    db.commit()
+
+
+class TestFlatten:
+    def test_later_start_wins_inside_longer_plan(self):
+        segments = flatten([
+            Plan(1, 100, date(2030, 1, 1), date(2030, 12, 31)),
+            Plan(2, 200, date(2030, 6, 1), date(2030, 6, 30)),
+        ])
+        assert [(s.start, s.end, s.rate) for s in segments] == [
+            (date(2030, 1, 1), date(2030, 6, 1), 100),
+            (date(2030, 6, 1), date(2030, 7, 1), 200),
+            (date(2030, 7, 1), date(2031, 1, 1), 100),
+        ]
+
+    def test_open_ended_and_gaps(self):
+        segments = flatten([
+            Plan(1, 100, date(2030, 1, 1), date(2030, 1, 31)),
+            Plan(2, 300, date(2030, 3, 1), None),
+        ])
+        assert [(s.start, s.rate) for s in segments] == [(date(2030, 1, 1), 100), (date(2030, 3, 1), 300)]
+        assert segments[-1].end == date.max
+
+
+class TestRateIndex:
+    def test_fallback_to_constants(self, db_session):
+        assert PricingService.nightly_rates(BookingPolicy.FULL_PROPERTY_WEEKDAY, MONDAY, 2) == [
+            PricingService.WEEKDAY_RATE, PricingService.WEEKDAY_RATE
+        ]
+
+    def test_hot_reload_on_commit(self, db_session):
+        version = rate_index.version
+        add_plan(db_session, BookingPolicy.FULL_PROPERTY_WEEKDAY, 65000, MONDAY + timedelta(days=1))
+
+        assert rate_index.version > version
+        assert PricingService.nightly_rates(BookingPolicy.FULL_PROPERTY_WEEKDAY, MONDAY, 3) == [
+            PricingService.WEEKDAY_RATE, 65000, 65000
+        ]
+        # Other policies untouched
+        assert rate_index.rate_for(BookingPolicy.DAY_PASS, MONDAY + timedelta(days=5), -1) == -1
+
+    def test_rollback_is_ignored(self, db_session):
+        version = rate_index.version
+        db_session.add(RatePlan(policy_type=BookingPolicy.DAY_PASS, rate=1, valid_from=MONDAY))
+        db_session.flush()
+        db_session.rollback()
+
+        assert rate_index.version == version
+        assert rate_index.rate_for(BookingPolicy.DAY_PASS, MONDAY, -1) == -1
+
+    def test_delete_restores_constant(self, db_session):
+        add_plan(db_session, BookingPolicy.DAY_PASS, 30000, MONDAY)
+        assert PricingService.nightly_rates(BookingPolicy.DAY_PASS, MONDAY, 1) == [30000]
+
+        db_session.delete(db_session.query(RatePlan).one())
+        db_session.commit()
+        assert PricingService.nightly_rates(BookingPolicy.DAY_PASS, MONDAY, 1) == [PricingService.PASADIA_RATE]
+
+
+class TestDatedPricing:
+    def test_total_split_across_rate_change(self, db_session):
+        add_plan(db_session, BookingPolicy.FULL_PROPERTY_WEEKDAY, 65000, MONDAY + timedelta(days=1), MONDAY + timedelta(days=1))
+
+        result = PricingService.calculate_total(MONDAY, MONDAY + timedelta(days=3), 10, BookingPolicy.FULL_PROPERTY_WEEKDAY)
+
+        assert result["subtotal"] == (55000 + 65000 + 55000) * 10
+        assert result["total_amount"] == result["subtotal"] + PricingService.CLEANING_FEE
+        assert result["breakdown"][:3] == [
+            "10 personas x 1 noche(s) x $55,000",
+            "10 personas x 1 noche(s) x $65,000",
+            "10 personas x 1 noche(s) x $55,000",
+        ]
+
+    def test_admin_high_water_mark_uses_dated_rates(self, db_session):
+        add_plan(db_session, BookingPolicy.FULL_PROPERTY_WEEKDAY, 58000, MONDAY + timedelta(days=1), MONDAY + timedelta(days=1))
+
+        result = AdminPricingService.calculate_manual_price(MONDAY, MONDAY + timedelta(days=2), 10, BookingPolicy.FULL_PROPERTY_WEEKDAY)
+
+        assert result["subtotal"] == 58000 * 10 * 2
+
+
+class TestPriceCalendar:
+    @pytest.fixture
+    def repo(self, db_session):
+        holiday_cache.invalidate()
+        PriceCalendarService.clear()
+        yield BookingRepository(db_session)
+        holiday_cache.invalidate()
+        PriceCalendarService.clear()
+
+    def test_days_match_calculate_total(self, repo):
+        start = date(2029, 12, 28)
+        calendar = PriceCalendarService.build(repo, start, start + timedelta(days=13), 12)
+
+        assert len(calendar["days"]) == 14
+        for day in calendar["days"]:
+            for policy in (BookingPolicy.FULL_PROPERTY_WEEKEND, BookingPolicy.FAMILY_PLAN, BookingPolicy.DAY_PASS):
+                check_out = day["date"] if policy == BookingPolicy.DAY_PASS else day["date"] + timedelta(days=1)
+                expected = PricingService.calculate_total(day["date"], check_out, 12, policy)
+                assert day["prices"][policy.value] == expected["subtotal"]
+
+        by_date = {d["date"]: d for d in calendar["days"]}
+        assert by_date[date(2030, 1, 1)]["is_holiday"] is True
+        assert by_date[date(2029, 12, 28)]["is_weekend"] is True  # Friday
+        assert by_date[date(2030, 1, 2)]["is_weekend"] is False
+
+    def test_memo_follows_rate_changes(self, db_session, repo):
+        first = PriceCalendarService.build(repo, MONDAY, MONDAY + timedelta(days=6), 10)
+        assert PriceCalendarService.build(repo, MONDAY, MONDAY + timedelta(days=6), 10) is first
+        etag = PriceCalendarService.etag(repo, MONDAY, MONDAY + timedelta(days=6), 10)
+
+        add_plan(db_session, BookingPolicy.FULL_PROPERTY_WEEKDAY, 61000, MONDAY)
+
+        second = PriceCalendarService.build(repo, MONDAY, MONDAY + timedelta(days=6), 10)
+        assert second["days"][0]["rates"][BookingPolicy.FULL_PROPERTY_WEEKDAY.value] == 61000
+        assert PriceCalendarService.etag(repo, MONDAY, MONDAY + timedelta(days=6), 10) != etag
+
+    def test_endpoint_etag(self, repo):
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.core.database import get_db
+
+        app.dependency_overrides[get_db] = lambda: repo.db
+        try:
+            client = TestClient(app)
+            params = {"from": "2030-06-01", "to": "2030-06-30", "guests": 10}
+            first = client.get("/pricing/calendar", params=params)
+            assert first.status_code == 200
+            assert len(first.json()["days"]) == 30
+
+            second = client.get("/pricing/calendar", params=params, headers={"If-None-Match": first.headers["ETag"]})
+            assert second.status_code == 304
+
+            too_long = client.get("/pricing/calendar", params={"from": "2030-01-01", "to": "2031-06-01", "guests": 10})
+            assert too_long.status_code == 400
+        finally:
+            app.dependency_overrides.pop(get_db, None)
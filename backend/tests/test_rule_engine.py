@@ -0,0 +1,62 @@
+"""
+Unit Tests for the compiled booking rule engine (domain/rule_engine.py)
+"""
+
+import pytest
+from datetime import date, timedelta
+
+from app.core.exceptions import RuleViolationError
+from app.domain import rule_engine, rules
+from app.domain.models import BookingRequest, BookingPolicy
+
+
+FRIDAY = date(2030, 3, 8)
+MONDAY = date(2030, 3, 11)
+NO_HOLIDAYS = {"holidays_in_range": [], "has_holiday_in_window": False}
+
+
+def request(check_in, nights, guests, policy):
+    return BookingRequest(
+        check_in=check_in, check_out=check_in + timedelta(days=nights),
+        guest_count=guests, policy_type=policy
+    )
+
+
+def names(violations):
+    return [v.rule_name for v in violations]
+
+
+class TestRuleEngine:
+    def test_valid_requests(self):
+        assert rule_engine.evaluate(request(MONDAY, 2, 12, BookingPolicy.FULL_PROPERTY_WEEKDAY), NO_HOLIDAYS) == []
+        assert rule_engine.evaluate(request(FRIDAY, 2, 12, BookingPolicy.FULL_PROPERTY_WEEKEND), NO_HOLIDAYS) == []
+        assert rule_engine.evaluate(request(FRIDAY, 0, 3, BookingPolicy.DAY_PASS), NO_HOLIDAYS) == []
+
+    def test_returns_every_violation(self):
+        violations = rule_engine.evaluate(
+            request(FRIDAY, 3, 4, BookingPolicy.FULL_PROPERTY_WEEKDAY),
+            {"holidays_in_range": [FRIDAY + timedelta(days=3)], "has_holiday_in_window": True}
+        )
+        assert names(violations) == ["MIN_PEOPLE_NOT_MET", "INVALID_WEEKDAY_DATES", "PLAN_NOT_ALLOWED_ON_HOLIDAY"]
+
+    def test_family_plan_violations(self):
+        violations = rule_engine.evaluate(request(MONDAY, 2, 8, BookingPolicy.FAMILY_PLAN), NO_HOLIDAYS)
+        assert names(violations) == ["FAMILY_PLAN_LIMIT_EXCEEDED", "FAMILY_PLAN_ONE_NIGHT"]
+
+    def test_common_rules_first(self):
+        past = date.today() - timedelta(days=3)
+        violations = rule_engine.evaluate(request(past, 0, 12, BookingPolicy.FULL_PROPERTY_HOLIDAY), NO_HOLIDAYS)
+        assert names(violations) == ["PAST_DATE_NOT_ALLOWED", "MIN_NIGHTS_REQUIRED", "HOLIDAY_REQUIRED"]
+
+    def test_legacy_validators_raise_first_violation(self):
+        with pytest.raises(RuleViolationError) as exc:
+            rules.validate_full_property_weekend(request(MONDAY, 2, 4, BookingPolicy.FULL_PROPERTY_WEEKEND), NO_HOLIDAYS)
+        assert exc.value.rule_name == "MIN_PEOPLE_NOT_MET"
+
+        with pytest.raises(RuleViolationError) as exc:
+            rules.validate_day_pass(request(FRIDAY, 1, 4, BookingPolicy.DAY_PASS))
+        assert exc.value.rule_name == "DAY_PASS_INVALID_RANGE"
+
+    def test_error_message_format_unchanged(self):
+        violation = rule_engine.evaluate(request(FRIDAY, 1, 4, BookingPolicy.DAY_PASS), NO_HOLIDAYS)[0]
+        assert str(violation.to_error()) == "Rule 'DAY_PASS_INVALID_RANGE' failed: El plan Pasadía es de un solo día (Llegada = Salida)."